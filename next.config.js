@@ -1,9 +1,77 @@
 require('dotenv').config();
+const fs = require('fs');
+const path = require('path');
+
+// Doc pages built with `scripts/build-docs.py --precompress` have .br/.gz siblings listed in
+// precompressed.json. Clients that accept an encoding get the sibling straight from the CDN,
+// so no page is compressed per request. Without the manifest nothing is rewritten.
+const PRECOMPRESSED_DIR = 'presentation-pdfs';
+const ENCODINGS = { br: '.br', gzip: '.gz' }; // preferred first
+const CONTENT_TYPES = {
+  '.html': 'text/html; charset=utf-8',
+  '.css': 'text/css; charset=utf-8',
+  '.js': 'text/javascript; charset=utf-8',
+  '.json': 'application/json',
+  '.svg': 'image/svg+xml',
+  '.txt': 'text/plain; charset=utf-8',
+  '.xml': 'application/xml',
+};
+
+function precompressedFiles() {
+  const dir = path.join(__dirname, 'public', PRECOMPRESSED_DIR);
+  let manifest;
+  try {
+    manifest = JSON.parse(fs.readFileSync(path.join(dir, 'precompressed.json'), 'utf8'));
+  } catch {
+    return [];
+  }
+  const files = [];
+  for (const [file, entry] of Object.entries(manifest.files || {})) {
+    // Route sources are patterns, so only plain file names are matched literally
+    if (!/^[\w./-]+$/.test(file) || !CONTENT_TYPES[path.extname(file)]) continue;
+    for (const [encoding, suffix] of Object.entries(ENCODINGS)) {
+      if (encoding in entry.encodings && fs.existsSync(path.join(dir, file + suffix))) {
+        files.push({ source: `/${PRECOMPRESSED_DIR}/${file}`, encoding, suffix, type: CONTENT_TYPES[path.extname(file)] });
+      }
+    }
+  }
+  return files;
+}
+
+const accepts = (encoding) => [{ type: 'header', key: 'accept-encoding', value: `.*\\b${encoding}\\b.*` }];
 
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   reactStrictMode: true,
   swcMinify: true,
+  async rewrites() {
+    // beforeFiles: the original file would otherwise win; the first matching encoding is used
+    return {
+      beforeFiles: precompressedFiles().map(({ source, encoding, suffix }) => ({
+        source,
+        has: accepts(encoding),
+        destination: source + suffix,
+      })),
+    };
+  },
+  async headers() {
+    const files = precompressedFiles();
+    const vary = [...new Set(files.map((f) => f.source))].map((source) => ({
+      source,
+      headers: [{ key: 'Vary', value: 'Accept-Encoding' }],
+    }));
+    // When several rules set a header the last one wins, so the preferred encoding goes last
+    const encoded = [...files].reverse().map(({ source, encoding, type }) => ({
+      source,
+      has: accepts(encoding),
+      headers: [
+        { key: 'Content-Encoding', value: encoding },
+        { key: 'Content-Type', value: type },
+        { key: 'Vary', value: 'Accept-Encoding' },
+      ],
+    }));
+    return [...vary, ...encoded];
+  },
 };
 
-module.exports = nextConfig;
\ No newline at end of file
+module.exports = nextConfig;
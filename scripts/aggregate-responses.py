@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Add new survey responses to the incremental team score store.
+
+Responses (responses_v3 CSV: employee_id, submitted_at, <domain>_5) are
+mapped to teams through the hierarchy CSV. They are then folded into a
+ScoreStore snapshot (see score_store.py), so each run only pays for the
+new responses. Files already in the store are skipped.
+
+Usage:
+  python3 scripts/aggregate-responses.py week-27.csv --hierarchy clients.csv --client-id <uuid> --store scores.store.npz
+  python3 scripts/aggregate-responses.py week-28.csv --hierarchy clients.csv --store scores.store.npz --scores scores.npz
+  python3 scripts/aggregate-responses.py week-28.csv --hierarchy clients.csv --store scores.store.npz --rollup rollup.npz
+  python3 scripts/beacon-insights.py scores.npz --reports reports/
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from build_cache import file_digest
+from hierarchy_loader import HierarchyError, HierarchyLoader
+from response_generator import Population
+from rollup_index import RollupIndex
+from score_store import DEFAULT_ANCHOR, DEFAULT_PERIOD_DAYS, DEFAULT_WINDOW, ScoreStore, StoreError, read_responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('responses', nargs='+', help="responses_v3 CSV file(s), e.g. from generate-survey-responses.py")
+    parser.add_argument('--hierarchy', required=True, help="hierarchy CSV the employees belong to")
+    parser.add_argument('--client-id', default=os.environ.get('NEXT_PUBLIC_DASHBOARD_CLIENT_ID'),
+                        help="client UUID (default: $NEXT_PUBLIC_DASHBOARD_CLIENT_ID)")
+    parser.add_argument('--store', required=True, metavar='NPZ', help="store snapshot to extend (created if missing)")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="periods in the rolling window (new store)")
+    parser.add_argument('--period-days', type=int, default=DEFAULT_PERIOD_DAYS, help="period length (new store)")
+    parser.add_argument('--anchor', default=DEFAULT_ANCHOR, help="date a period starts on (new store)")
+    parser.add_argument('--scores', metavar='PATH', help="write team × period domain scores (.csv or .npz)")
+    parser.add_argument('--rollup', metavar='NPZ', help="write the division/department rollup index (rollup-scores.py)")
+    parser.add_argument('--all-time', action='store_true', help="roll up all-time totals instead of the window")
+    args = parser.parse_args()
+
+    if not args.client_id:
+        print("❌ --client-id is required (or set NEXT_PUBLIC_DASHBOARD_CLIENT_ID)", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    try:
+        if os.path.exists(args.store):
+            store = ScoreStore.load(args.store)
+        else:
+            store = ScoreStore(args.window, args.period_days, args.anchor)
+        loader = HierarchyLoader(args.client_id)
+        population = Population()
+        with open(args.hierarchy, 'r', encoding='utf-8-sig', newline='') as f:
+            for _ in population.record(loader.batches(f)):
+                pass
+    except (HierarchyError, StoreError, OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    employees = {employee_id: i for i, employee_id in enumerate(population.employee_ids)}
+    # Employee index -> store team index
+    employee_teams = store.team_indices(population.team_paths)[np.asarray(population.employee_teams, dtype=np.intp)]
+    loaded = time.perf_counter()
+
+    added = unknown = 0
+    affected = set()
+    for path in args.responses:
+        try:
+            digest = file_digest(path)
+            if digest in store.sources:
+                print(f"⏭️  {path} is already in the store")
+                continue
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                for employee_ids, dates, answers in read_responses(f):
+                    rows = np.fromiter((employees.get(e, -1) for e in employee_ids), dtype=np.intp,
+                                       count=len(employee_ids))
+                    known = rows >= 0
+                    unknown += len(rows) - int(known.sum())
+                    teams = employee_teams[rows[known]]
+                    affected.update(store.add(teams, store.period_indices(dates[known]), answers[known]).tolist())
+                    added += int(known.sum())
+        except (StoreError, OSError) as e:
+            # Nothing is saved, so the store never holds part of a file
+            print(f"❌ {path}: {e}", file=sys.stderr)
+            return 2
+        store.sources.add(digest)
+    changed = store.save(args.store)
+    if args.scores:
+        store.score_matrix().save(args.scores)
+    if args.rollup:
+        RollupIndex.from_store(store, windowed=not args.all_time).save(args.rollup)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Added {added:,} response(s) to {len(affected):,} of {len(store.teams):,} team(s) "
+          f"({len(store.periods)} period(s)) in {elapsed:.2f}s (hierarchy {loaded - start:.2f}s)")
+    print(f"💾 {'Saved' if changed else 'Unchanged'}: {args.store}")
+    if args.scores:
+        print(f"📊 Wrote team scores to {args.scores}")
+    if args.rollup:
+        print(f"🌳 Wrote rollup index to {args.rollup}")
+    if unknown:
+        print(f"⚠️  Skipped {unknown:,} response(s) from employees not in {args.hierarchy}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of parsed markdown for the native renderer.
+
+A document is parsed into a BlockTable once per content change; the table
+(an array of kind bytes plus a tuple of texts) is stored with marshal under
+.build-cache/ast/ and reloaded by later runs, and by the search index, instead
+of being tokenized again. Pandoc-rendered outputs (library fragments, PDF
+.tex) have their own content-keyed caches in library_build and pdf_build.
+"""
+
+import hashlib
+import marshal
+import os
+from array import array
+
+import marketing_markdown
+from build_cache import CACHE_DIRNAME, file_digest, inputs_digest, write_if_changed
+from build_trace import span
+from marketing_markdown import BlockTable, parse_blocks
+
+AST_VERSION = 1
+AST_DIRNAME = 'ast'
+
+# Tokenizer changes must invalidate every cached table
+PARSER_DIGEST = file_digest(marketing_markdown.__file__)
+
+
+class ASTCache:
+    """Parsed BlockTables keyed by source name, validated by content digest"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_root(cls, root):
+        """Open the cache stored under <root>/.build-cache/ast/"""
+        return cls(os.path.join(root, CACHE_DIRNAME, AST_DIRNAME))
+
+    def _entry_path(self, key):
+        # One file per source keeps the cache bounded as documents are edited
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]
+        return os.path.join(self.directory, f"{name}.ast")
+
+    def _load(self, path, digest):
+        try:
+            with open(path, 'rb') as f:
+                # One read + loads is several times faster than marshal.load(f)
+                version, stored_digest, kinds, texts = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != AST_VERSION or stored_digest != digest:
+            return None
+        return BlockTable(array('B', kinds), texts)
+
+    def parse(self, key, text):
+        """Return the BlockTable for text, from disk when it was parsed before"""
+        with span('parse', doc=os.path.basename(key)) as sp:
+            digest = inputs_digest(PARSER_DIGEST, text)
+            path = self._entry_path(key)
+            table = self._load(path, digest)
+            sp.set(cached=table is not None)
+            if table is not None:
+                self.hits += 1
+                return table
+            self.misses += 1
+            table = parse_blocks(text)
+            write_if_changed(path, marshal.dumps((AST_VERSION, digest, table.kinds.tobytes(), table.texts)))
+            return table
+
+    def parse_file(self, md_file):
+        """Parse a markdown file through the cache (keyed by its absolute path)"""
+        with span('read', doc=os.path.basename(md_file)):
+            with open(md_file, 'r', encoding='utf-8') as f:
+                text = f.read()
+        return self.parse(os.path.abspath(md_file), text)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Score every team's Beacon Index history and write signals, bands and insight reports.
+
+Input is a long-form CSV (team, period, experience, workload, safety,
+leadership, clarity; scores 0-100, plus optional experience_answers ...
+clarity_answers counts) or an .npz saved with --save-npz. All
+rules run over the whole team × period matrix at once (see
+insight_engine.py).
+
+Usage:
+  python3 scripts/beacon-insights.py scores.csv
+  python3 scripts/beacon-insights.py scores.csv --csv signals.csv --all-periods
+  python3 scripts/beacon-insights.py scores.csv --html public/presentation-pdfs/Beacon-Portfolio-Insights.html
+  python3 scripts/beacon-insights.py scores.csv --reports reports/2025-Q3 -j 8
+
+An optional department column groups teams; --reports then also writes a
+report per department. Its scores are the mean of every answer in the
+department (each team weighted by its answer counts), or the plain mean of
+its teams' scores when the file has no *_answers columns.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+
+from build_cache import write_if_changed
+from insight_engine import BANDS, RULES, ScoreError, ScoreMatrix, evaluate, insight_markdown, portfolio_summary
+from marketing_markdown import parse_markdown_to_html
+from page_template import PageTemplate, read_template_source
+from parallel_build import default_jobs
+from team_reports import build_reports
+
+
+def _signal_rows(insights, all_periods):
+    for row in insights.rows(all_periods):
+        yield dict(row, signals=';'.join(row['signals']))
+
+
+def write_csv(path, insights, all_periods):
+    out = io.StringIO()
+    fields = ['team', 'period', 'composite', 'band', 'signals', 'pressure_source', 'propagation']
+    if insights.matrix.departments is not None:
+        fields.insert(0, 'department')
+    writer = csv.DictWriter(out, fields, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(_signal_rows(insights, all_periods))
+    return write_if_changed(path, out.getvalue())
+
+
+def write_html(path, markdown, title):
+    """Render the report with the marketing card layout used by generate-marketing-html.py"""
+    template = PageTemplate(read_template_source('marketing-page'), raw={'content', 'live_reload', 'search'})
+    page = template.render(title=title, hero_title=title,
+                           hero_subtitle="Signals, risk bands and leadership focus for every team",
+                           content=parse_markdown_to_html(markdown), live_reload='', search='')
+    return write_if_changed(path, page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('scores', help="long-form score CSV, or .npz from --save-npz")
+    parser.add_argument('--csv', metavar='PATH', help="write per-team signal codes and bands as CSV")
+    parser.add_argument('--json', metavar='PATH', help="write per-team results and the portfolio summary as JSON")
+    parser.add_argument('--all-periods', action='store_true',
+                        help="one CSV/JSON row per team and period (default: each team's latest period)")
+    parser.add_argument('--markdown', metavar='PATH', help="write the insight report as markdown")
+    parser.add_argument('--html', metavar='PATH', help="write the insight report as a marketing-style HTML page")
+    parser.add_argument('--top', type=int, default=25, help="teams given an insight section (lowest scores first)")
+    parser.add_argument('--title', default='Beacon Index Insights', help="report title")
+    parser.add_argument('--save-npz', metavar='PATH', help="save the parsed score matrix for faster reloads")
+    parser.add_argument('--reports', metavar='DIR', help="write an HTML leadership report per team and department")
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(), help="report worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        matrix = ScoreMatrix.load(args.scores)
+    except (OSError, ScoreError) as e:
+        print(f"❌ {e}")
+        return 2
+    loaded = time.perf_counter()
+    insights = evaluate(matrix)
+    evaluated = time.perf_counter()
+    teams, periods, _ = matrix.scores.shape
+    print(f"📊 {teams} team(s) × {periods} period(s): loaded in {loaded - start:.2f}s, "
+          f"evaluated in {evaluated - loaded:.2f}s")
+
+    if args.save_npz:
+        matrix.save(args.save_npz)
+        print(f"💾 Saved score matrix to {args.save_npz}")
+    if args.csv:
+        write_csv(args.csv, insights, args.all_periods)
+        print(f"✅ Wrote signals to {args.csv}")
+    summary = portfolio_summary(insights)
+    if args.json:
+        data = {'summary': summary, 'teams': list(insights.rows(args.all_periods))}
+        write_if_changed(args.json, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+        print(f"✅ Wrote signals to {args.json}")
+    if args.markdown or args.html:
+        markdown = insight_markdown(insights, top=args.top, title=args.title)
+        if args.markdown:
+            write_if_changed(args.markdown, markdown + '\n')
+            print(f"✅ Wrote report to {args.markdown}")
+        if args.html:
+            write_html(args.html, markdown, args.title)
+            print(f"✅ Wrote report to {args.html}")
+    if args.reports:
+        start = time.perf_counter()
+        written, unchanged, failures = build_reports(insights, args.reports, jobs=args.jobs)
+        elapsed = time.perf_counter() - start
+        total = written + unchanged
+        per_report = f", {elapsed * 1000 / total:.1f} ms/report" if total else ''
+        print(f"📄 {total} report(s) in {args.reports}: {written} written, {unchanged} unchanged "
+              f"({elapsed:.2f}s{per_report})")
+        for kind, error in failures:
+            print(f"❌ Error rendering {kind} reports: {(error.splitlines() or [''])[0]}")
+        if failures:
+            return 1
+
+    print(f"\n{'band':<18} {'teams':>7}")
+    for band in reversed(BANDS):
+        print(f"{band:<18} {summary['bands'][band]:>7}")
+    raised = [(rule.code, summary['signals'][rule.code]) for rule in RULES if summary['signals'][rule.code]]
+    if raised:
+        print('\n' + '  '.join(f"{code}: {count}" for code, count in raised))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
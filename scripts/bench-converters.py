@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark the markdown converters on synthetic and real corpora.
+
+Reports per-function and end-to-end throughput (lines/s, MB/s) and peak
+memory, can save the results as a JSON baseline, and exits non-zero when a
+later run regresses past the threshold. The inline lexer is also timed
+against a frozen copy of the original three-pass regex implementation.
+
+Usage:
+  python3 scripts/bench-converters.py --save-baseline bench.json
+  python3 scripts/bench-converters.py --baseline bench.json --threshold 0.15
+  python3 scripts/bench-converters.py --sizes 1m --corpus mixed --case end_to_end
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+
+from bench_corpus import PROFILES, REPO_ROOT, SIZES, corpus_text, replay_lines, synthetic_lines
+from build_cache import CACHE_DIRNAME
+from css_assets import externalize_styles
+from marketing_markdown import (
+    H2, format_inline_markdown, get_icon_for_section, iter_html, parse_blocks, parse_markdown_to_html, render_table,
+)
+from page_template import PageTemplate, read_template_source
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, CACHE_DIRNAME, 'bench-baseline.json')
+CORPORA = list(PROFILES) + ['replay']
+LEGACY_INLINE_CASE = 'format_inline_markdown_legacy'
+
+
+def legacy_format_inline_markdown(text):
+    """The original implementation, frozen here as the comparison baseline for the lexer"""
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
+    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+    return text
+
+
+def _page_template():
+    source, _ = externalize_styles(read_template_source('marketing-page'), 'marketing')
+    return PageTemplate(source, raw={'content', 'live_reload', 'search'})
+
+
+def _chunks(template, content):
+    return template.iter_chunks(
+        title='Benchmark', hero_title='Benchmark', hero_subtitle='Synthetic corpus',
+        content=content, live_reload='', search='',
+    )
+
+
+def _fill(template, content):
+    return b''.join(_chunks(template, content))
+
+
+def _drain(chunks):
+    """Consume a chunk stream the way a file write would, without keeping it"""
+    for _ in chunks:
+        pass
+
+
+def prepare_cases(lines, template):
+    """Return {case: (func, units, bytes)}; each func does one full pass"""
+    text = corpus_text(lines)
+    text_bytes = len(text.encode('utf-8'))
+    table = parse_blocks(text)
+    stripped = [line.strip() for line in lines if line.strip()]
+    headings = [t for kind, t in table if kind == H2]
+    html = render_table(table)
+
+    def inline():
+        for line in stripped:
+            format_inline_markdown(line)
+
+    def legacy_inline():
+        for line in stripped:
+            legacy_format_inline_markdown(line)
+
+    def icons():
+        for heading in headings:
+            get_icon_for_section(heading)
+
+    return {
+        'parse_blocks': (lambda: parse_blocks(text), len(lines), text_bytes),
+        'render_table': (lambda: render_table(table), len(lines), text_bytes),
+        'format_inline_markdown': (inline, len(stripped), sum(len(s.encode('utf-8')) for s in stripped)),
+        LEGACY_INLINE_CASE: (legacy_inline, len(stripped), sum(len(s.encode('utf-8')) for s in stripped)),
+        'get_icon_for_section': (icons, len(headings), sum(len(h.encode('utf-8')) for h in headings)),
+        'template_fill': (lambda: _fill(template, html), len(lines), len(html.encode('utf-8'))),
+        'end_to_end': (lambda: _fill(template, parse_markdown_to_html(text)), len(lines), text_bytes),
+        # Peak memory here should stay flat as the corpus grows (build-docs.py --stream)
+        'stream_end_to_end': (lambda: _drain(_chunks(template, iter_html(lines))), len(lines), text_bytes),
+    }
+
+
+def measure(func, repeat):
+    """Best wall time over repeat runs, then peak traced memory of one more run"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Return human-readable regressions against a baseline"""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base or not base['lines_per_s']:
+            continue
+        speed = result['lines_per_s'] / base['lines_per_s']
+        if speed < 1 - threshold:
+            regressions.append(f"{key}: {speed:.0%} of baseline throughput "
+                               f"({result['lines_per_s']:,.0f} vs {base['lines_per_s']:,.0f} lines/s)")
+        if base['peak_bytes'] and result['peak_bytes'] > base['peak_bytes'] * (1 + memory_threshold):
+            regressions.append(f"{key}: peak memory {result['peak_bytes'] / 1e6:.1f} MB "
+                               f"vs {base['peak_bytes'] / 1e6:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1k,10k',
+                        help=f"comma-separated corpus sizes in lines ({', '.join(SIZES)})")
+    parser.add_argument('--corpus', choices=CORPORA, action='append', help="corpus to run (repeatable, default: all)")
+    parser.add_argument('--case', action='append', help="benchmark case to run (repeatable, default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="timing runs per case (best is reported)")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic corpus seed")
+    parser.add_argument('--docs-dir', default=REPO_ROOT, help="directory scanned for the replay corpus")
+    parser.add_argument('--save-baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                        help="write results as a JSON baseline")
+    parser.add_argument('--baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                        help="compare against a saved baseline and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed throughput drop as a fraction (default 0.10)")
+    parser.add_argument('--memory-threshold', type=float, default=0.10,
+                        help="allowed peak memory growth as a fraction (default 0.10)")
+    args = parser.parse_args()
+
+    try:
+        sizes = [SIZES[s.strip().lower()] for s in args.sizes.split(',')]
+    except KeyError as e:
+        parser.error(f"unknown size {e}; choose from {', '.join(SIZES)}")
+    template = _page_template()
+
+    results = {}
+    print(f"{'case':<30} {'corpus':<16} {'lines':>8} {'lines/s':>12} {'MB/s':>8} {'peak MB':>8}")
+    for corpus in args.corpus or CORPORA:
+        for size in sizes:
+            if corpus == 'replay':
+                lines = replay_lines(size, args.docs_dir)
+            else:
+                lines = synthetic_lines(corpus, size, args.seed)
+            for case, (func, units, nbytes) in prepare_cases(lines, template).items():
+                if args.case and case not in args.case or not units:
+                    continue
+                seconds, peak = measure(func, args.repeat)
+                seconds = max(seconds, 1e-9)
+                result = {
+                    'seconds': seconds,
+                    'lines_per_s': units / seconds,
+                    'mb_per_s': nbytes / seconds / 1e6,
+                    'peak_bytes': peak,
+                }
+                results[f"{case}|{corpus}|{size}"] = result
+                print(f"{case:<30} {corpus:<16} {size:>8} {result['lines_per_s']:>12,.0f} "
+                      f"{result['mb_per_s']:>8.1f} {peak / 1e6:>8.1f}")
+
+    speedups = []
+    for key, legacy in results.items():
+        case, run = key.split('|', 1)
+        lexer = results.get(f"format_inline_markdown|{run}")
+        if case == LEGACY_INLINE_CASE and lexer:
+            speedups.append((run.replace('|', ' '), legacy['seconds'] / lexer['seconds']))
+    if speedups:
+        print("\nInline lexer vs the original three-pass regex version:")
+        for run, speedup in speedups:
+            print(f"  {run:<24} {speedup:>6.2f}x")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': BASELINE_VERSION,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BASELINE_VERSION:
+            print(f"❌ {args.baseline} is not a version {BASELINE_VERSION} baseline")
+            return 2
+        regressions = compare(results, baseline['results'], args.threshold, args.memory_threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) past the threshold:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
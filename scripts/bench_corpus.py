@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Deterministic markdown corpora for the converter benchmarks.
+
+Synthetic corpora are generated from a seeded RNG, so the same profile and
+size always give the same text. The replay corpus is the repo's own
+markdown, repeated until it reaches the requested size.
+"""
+
+import glob
+import os
+import random
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+_WORDS = (
+    'wellbeing team survey pulse workload psychological safety leadership clarity '
+    'connection energy engagement insight dashboard trend cycle risk manager '
+    'employee response baseline score division department hazard control '
+    'privacy compliance report action pathway signal early detection'
+).split()
+_HEADINGS = ['Overview', 'Key Metrics', 'Insights', 'Features', 'Implementation Timeline',
+             'Compliance & Privacy', 'Support', 'Contact', 'FAQ', 'Pricing']
+_LINKS = ['https://beaconeffect.com.au', 'https://calendly.com/beacon/demo', '/dashboard']
+
+
+def _sentence(rng, words, markup):
+    out = []
+    for _ in range(words):
+        word = rng.choice(_WORDS)
+        roll = rng.random() if markup else 1.0
+        if roll < 0.08:
+            word = f"**{word}**"
+        elif roll < 0.14:
+            word = f"*{word}*"
+        elif roll < 0.18:
+            word = f"`{word}_id`"
+        elif roll < 0.21:
+            word = f"[{word}]({rng.choice(_LINKS)})"
+        elif roll < 0.22:
+            word = f"***{word}***"
+        out.append(word)
+    return ' '.join(out).capitalize() + '.'
+
+
+def _mixed(rng):
+    roll = rng.random()
+    if roll < 0.05:
+        return [f"## {rng.choice(_HEADINGS)}", '']
+    if roll < 0.10:
+        return [f"### {_sentence(rng, 4, False)[:-1]}", '']
+    if roll < 0.35:
+        return [f"- {_sentence(rng, rng.randint(4, 14), True)}" for _ in range(rng.randint(2, 6))] + ['']
+    if roll < 0.40:
+        return [f"{n}. {_sentence(rng, rng.randint(4, 10), True)}" for n in range(1, rng.randint(3, 6))] + ['']
+    if roll < 0.42:
+        return ['---', '']
+    return [_sentence(rng, rng.randint(8, 40), True), '']
+
+
+def _deep_lists(rng):
+    lines = []
+    depth = 0
+    for _ in range(rng.randint(5, 30)):
+        depth = max(0, min(6, depth + rng.choice((-1, 0, 1))))
+        marker = rng.choice('-*') if rng.random() < 0.7 else f"{rng.randint(1, 9)}."
+        lines.append(f"{'  ' * depth}{marker} {_sentence(rng, rng.randint(3, 10), True)}")
+    return lines + ['']
+
+
+def _long_paragraphs(rng):
+    return [_sentence(rng, rng.randint(200, 600), rng.random() < 0.5), '']
+
+
+def _heavy_inline(rng):
+    return [_sentence(rng, rng.randint(10, 30), True).replace(' ', ' **x** *y* `z` ', 3), '']
+
+
+PROFILES = {
+    'mixed': _mixed,
+    'deep-lists': _deep_lists,
+    'long-paragraphs': _long_paragraphs,
+    'heavy-inline': _heavy_inline,
+}
+
+
+def synthetic_lines(profile, lines, seed=0):
+    """Exactly `lines` lines of generated markdown for a profile"""
+    rng = random.Random(f"{profile}:{seed}")
+    block = PROFILES[profile]
+    out = [f"# Synthetic {profile} corpus", '']
+    while len(out) < lines:
+        out.extend(block(rng))
+    return out[:lines]
+
+
+def replay_lines(lines, docs_dir=REPO_ROOT):
+    """The repo's markdown docs, cycled to exactly `lines` lines"""
+    source = []
+    for path in sorted(glob.glob(os.path.join(docs_dir, '**', '*.md'), recursive=True)):
+        if 'node_modules' in path.split(os.sep):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            source.extend(f.read().splitlines())
+    if not source:
+        raise ValueError(f"no markdown found under {docs_dir}")
+    return [source[i % len(source)] for i in range(lines)]
+
+
+def corpus_text(lines):
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Build the Beacon presentation pages listed in scripts/doc_pages.json.
+
+Every page is rendered by exactly one renderer (pandoc or native card
+layout), each source is converted once per run, and unchanged pages are
+skipped via the build cache. Run with --help for options.
+"""
+
+import sys
+
+from doc_engine import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Incremental build cache shared by the doc converters.
+
+Keeps a JSON manifest of input hashes per generated page so unchanged pages
+are skipped, and only rewrites output files whose bytes actually differ.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+MANIFEST_VERSION = 1
+CACHE_DIRNAME = ".build-cache"
+# Streamed outputs are written and hashed in blocks of this many bytes
+STREAM_BLOCK_SIZE = 1 << 16
+
+# mkstemp creates 0600 files; published pages need the usual umask mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a file's bytes"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def inputs_digest(*parts):
+    """Combine source/template/settings parts into one digest"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, dict):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False)
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        h.update(len(part).to_bytes(8, 'big'))
+        h.update(part)
+    return h.hexdigest()
+
+
+def code_digest(*paths):
+    """Digest of the generator's own source files, so code changes invalidate pages"""
+    return inputs_digest(*(file_digest(path) for path in paths))
+
+
+def _as_chunks(data):
+    if isinstance(data, str):
+        return [data.encode('utf-8')]
+    if isinstance(data, (bytes, bytearray)):
+        return [bytes(data)]
+    return [c.encode('utf-8') if isinstance(c, str) else c for c in data]
+
+
+def _same_bytes(path, chunks, size):
+    try:
+        if os.path.getsize(path) != size:
+            return False
+        with open(path, 'rb') as f:
+            for chunk in chunks:
+                if f.read(len(chunk)) != chunk:
+                    return False
+        return True
+    except OSError:
+        return False
+
+
+def write_if_changed(path, data):
+    """Write data (str, bytes or an iterable of chunks) only if it differs.
+
+    Returns True when the file was (re)written. Writes go through a temp file
+    and an atomic rename so watchers never see a half-written page.
+    """
+    chunks = _as_chunks(data)
+    size = sum(len(c) for c in chunks)
+    if _same_bytes(path, chunks, size):
+        return False
+
+    fd, tmp_path = _temp_beside(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.writelines(chunks)
+        _replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+
+def write_stream_if_changed(path, chunks):
+    """write_if_changed for outputs too large to hold in memory.
+
+    Chunks (str or bytes) go straight to a temp file while being hashed; the
+    existing file is replaced only if its size or digest differs.
+    """
+    fd, tmp_path = _temp_beside(path)
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for block in _blocks(chunks):
+                f.write(block)
+                h.update(block)
+                size += len(block)
+        try:
+            same = os.path.getsize(path) == size and file_digest(path) == h.hexdigest()
+        except OSError:
+            same = False
+        if same:
+            os.unlink(tmp_path)
+            return False
+        _replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+
+def _blocks(chunks, size=STREAM_BLOCK_SIZE):
+    """Regroup small str/bytes chunks into blocks of about `size` bytes"""
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield b''.join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield b''.join(pending)
+
+
+def _temp_beside(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.mkstemp(dir=directory, prefix='.tmp-')
+
+
+def _replace(tmp_path, path):
+    """Atomically move tmp_path over path, keeping path's mode if it exists"""
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = DEFAULT_FILE_MODE
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+
+class BuildManifest:
+    """Persistent record of which inputs produced each output file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            # Missing or corrupt manifest just means a full rebuild
+            self.entries = {}
+
+    @classmethod
+    def for_root(cls, root):
+        """Open the manifest stored under <root>/.build-cache/"""
+        return cls(os.path.join(root, CACHE_DIRNAME, 'manifest.json'))
+
+    def is_fresh(self, key, digest, output_path):
+        """True if output_path was built from exactly these inputs and is untouched"""
+        entry = self.entries.get(key)
+        if not entry or entry.get('inputs') != digest:
+            return False
+        try:
+            st = os.stat(output_path)
+        except OSError:
+            return False
+        return entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns
+
+    def record(self, key, digest, output_path):
+        """Remember that output_path is now up to date for these inputs"""
+        st = os.stat(output_path)
+        self.entries[key] = {
+            'inputs': digest,
+            'output': os.path.basename(output_path),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        payload = json.dumps(
+            {'version': MANIFEST_VERSION, 'entries': self.entries},
+            indent=2, sort_keys=True,
+        )
+        write_if_changed(self.path, payload + '\n')
+        self._dirty = False
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Stage tracing for the doc build (--profile).
+
+Code wraps each stage in `with span('name', doc=...)`. With tracing off,
+span() returns one shared no-op object, so a hook costs a function call
+and nothing else. With tracing on, spans become Chrome trace events
+("X" complete events, viewable in chrome://tracing or ui.perfetto.dev).
+Worker processes ship their events back with call_traced().
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+_tracer = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'lane', 'tid', 'start')
+
+    def __init__(self, tracer, name, cat, lane, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.lane = lane
+        self.args = args
+
+    def __enter__(self):
+        self.tid = self.tracer.acquire_lane() if self.lane else threading.get_native_id()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        if exc[0] is not None:
+            self.args['error'] = exc[0].__name__
+        self.tracer.events.append({
+            'name': self.name, 'cat': self.cat, 'ph': 'X',
+            'ts': self.start / 1000, 'dur': (end - self.start) / 1000,
+            'pid': self.tracer.pid, 'tid': self.tid, 'args': self.args,
+        })
+        if self.lane:
+            self.tracer.release_lane(self.tid)
+        return False
+
+    def set(self, **args):
+        """Attach results known only at the end of the span (cache hit, sizes, ...)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects trace events for one process"""
+
+    # Overlapping async work (pandoc, xelatex) gets its own rows above this id
+    LANE_BASE = 1000
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+        self._lanes = set()
+        self._lock = threading.Lock()
+
+    def acquire_lane(self):
+        with self._lock:
+            lane = self.LANE_BASE
+            while lane in self._lanes:
+                lane += 1
+            self._lanes.add(lane)
+            return lane
+
+    def release_lane(self, lane):
+        with self._lock:
+            self._lanes.discard(lane)
+
+
+def enable():
+    """Start tracing in this process; returns the Tracer"""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def enabled():
+    return _tracer is not None
+
+
+def span(name, cat='build', lane=False, **args):
+    """Context manager timing one stage; lane=True for work that overlaps on one thread"""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, cat, lane, args)
+
+
+def merge(events):
+    """Add events recorded in another process"""
+    if _tracer is not None and events:
+        _tracer.events.extend(events)
+
+
+def call_traced(func, *args):
+    """Run func(*args) with tracing on; returns (result, events) for merge().
+
+    Meant for pool workers. When the caller's process is already tracing
+    (jobs=1 runs tasks inline), events land in its tracer directly; a
+    forked worker's inherited copy of that tracer is replaced.
+    """
+    if _tracer is not None and _tracer.pid == os.getpid():
+        return func(*args), []
+    tracer = enable()
+    try:
+        return func(*args), tracer.events
+    finally:
+        disable()
+
+
+def write_trace(tracer, path):
+    """Write Chrome trace-event JSON with timestamps relative to the first event"""
+    origin = min((e['ts'] for e in tracer.events), default=0)
+    events = [dict(e, ts=round(e['ts'] - origin, 1), dur=round(e['dur'], 1)) for e in tracer.events]
+    for pid in sorted({e['pid'] for e in events}):
+        name = 'build-docs' if pid == tracer.pid else f'worker {pid}'
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': name}})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def print_summary(tracer, top=10):
+    """Print the slowest stages and documents"""
+    stages = defaultdict(lambda: [0.0, 0, 0.0])
+    documents = defaultdict(float)
+    for e in tracer.events:
+        stage = stages[e['name']]
+        stage[0] += e['dur']
+        stage[1] += 1
+        stage[2] = max(stage[2], e['dur'])
+        if 'doc' in e['args']:
+            documents[e['args']['doc']] += e['dur']
+
+    print(f"\n⏱️  {'stage':<22} {'total ms':>10} {'calls':>6} {'max ms':>9}")
+    for name, (total, count, longest) in sorted(stages.items(), key=lambda kv: -kv[1][0])[:top]:
+        print(f"   {name:<22} {total / 1000:>10.1f} {count:>6} {longest / 1000:>9.1f}")
+    if documents:
+        print(f"\n🐢 {'slowest documents':<40} {'ms':>9}")
+        for doc, total in sorted(documents.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"   {doc:<40} {total / 1000:>9.1f}")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Compare the native 'markdown' renderer with pandoc across the docs corpus.
+
+Every document is converted by pandoc (with the pandoc renderer's
+arguments) and by our own parser. Both outputs are reduced to an outline of
+tags, the attributes that matter (id, href, src, start, alignment) and
+whitespace-collapsed text, then diffed. A page can move from 'pandoc' to
+'markdown' in doc_pages.json once its source passes.
+
+Heading ids are also checked without pandoc against a table of headings
+and the ids pandoc's auto_identifiers gives them, since search results and
+cross-renderer links depend on the two agreeing.
+
+Usage:
+  python3 scripts/check-pandoc-parity.py
+  python3 scripts/check-pandoc-parity.py --manifest
+  python3 scripts/check-pandoc-parity.py --slugs
+  python3 scripts/check-pandoc-parity.py SURVEY_QUESTIONS.md --diff 40
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+from doc_engine import DEFAULT_MANIFEST, ManifestError, PageManifest, PandocRenderer
+from marketing_markdown import HeadingSlugs, parse_markdown_to_html
+from pandoc_runner import DEFAULT_BATCH_SIZE, DEFAULT_TIMEOUT, PandocJob, run_pandoc_jobs
+from parallel_build import default_jobs
+
+# Wrappers pandoc adds for syntax highlighting and column widths
+IGNORED_TAGS = frozenset(['div', 'span', 'colgroup', 'col'])
+KEPT_ATTRS = ('id', 'href', 'src', 'start')
+_SPACE = re.compile(r'\s+')
+# pandoc's smart extension; folded back unless --strict
+_TYPOGRAPHY = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"', '–': '--', '—': '---', '…': '...'})
+# (heading markdown, id pandoc gives it): the examples from pandoc's manual plus cases from our docs
+SLUG_CASES = (
+    ('Heading identifiers in HTML', 'heading-identifiers-in-html'),
+    ("Maître d'hôtel", 'maître-dhôtel'),
+    ('*Dogs*?--in *my* house?', 'dogs--in-my-house'),
+    ('[HTML], [S5], or [RTF]?', 'html-s5-or-rtf'),
+    ('3. Applications', 'applications'),
+    ('33', 'section'),
+    ('New Fields in `responses_v3` table:', 'new-fields-in-responses_v3-table'),
+    ('New Table: `support_requests`', 'new-table-support_requests'),
+    ('Dashboard Shows "Set NEXT_PUBLIC_DASHBOARD_CLIENT_ID"', 'dashboard-shows-set-next_public_dashboard_client_id'),
+    ('_Emphasis_ and __strong__', 'emphasis-and-strong'),
+    ('The `_id` field', 'the-_id-field'),
+    (r'Escaped \_underscore', 'escaped-_underscore'),
+    ('[Linked](https://example.com/a_b) text', 'linked-text'),
+    ('1. **Experience / Overall Sentiment**', 'experience-overall-sentiment'),
+)
+
+
+class Outline(HTMLParser):
+    """One line per kept tag or text run of an HTML fragment"""
+
+    def __init__(self, strict=False):
+        super().__init__(convert_charrefs=True)
+        self.strict = strict
+        self.lines = []
+        self._text = []
+        self._links = []  # per open <a>: whether it was kept
+
+    def _flush(self):
+        text = _SPACE.sub(' ', ''.join(self._text)).strip()
+        self._text = []
+        if text:
+            self.lines.append(text if self.strict else text.translate(_TYPOGRAPHY))
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'a':
+            # Line anchors in highlighted code carry aria-hidden
+            kept = 'aria-hidden' not in attrs
+            self._links.append(kept)
+            if not kept:
+                return
+        if tag in IGNORED_TAGS:
+            return
+        self._flush()
+        parts = [tag] + [f'{name}="{attrs[name]}"' for name in KEPT_ATTRS if attrs.get(name)]
+        align = re.search(r'text-align:\s*(\w+)', attrs.get('style') or '')
+        if align:
+            parts.append(f'align={align.group(1)}')
+        self.lines.append(f"<{' '.join(parts)}>")
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._links and not self._links.pop():
+            return
+        if tag in IGNORED_TAGS:
+            return
+        self._flush()
+        self.lines.append(f'</{tag}>')
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+        return self.lines
+
+
+def outline(html, strict=False):
+    parser = Outline(strict)
+    parser.feed(html)
+    return parser.close()
+
+
+def check_slugs():
+    """[(heading, expected id, our id)] for every SLUG_CASES heading we slug differently"""
+    return [(text, expected, HeadingSlugs()(text)) for text, expected in SLUG_CASES
+            if HeadingSlugs()(text) != expected]
+
+
+def corpus(root):
+    """Every markdown file under root, skipping dependencies and build output"""
+    paths = []
+    for path in sorted(glob.glob(os.path.join(root, '**', '*.md'), recursive=True)):
+        parts = os.path.relpath(path, root).split(os.sep)
+        if 'node_modules' in parts or any(p.startswith('.') for p in parts):
+            continue
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help="markdown files to check (default: every .md under the docs root)")
+    parser.add_argument('--manifest', nargs='?', const=DEFAULT_MANIFEST, metavar='PATH',
+                        help="only check the sources of document pages in the page manifest")
+    parser.add_argument('--docs-dir', default=None, help="docs root (default: from the page manifest)")
+    parser.add_argument('--diff', type=int, default=12, metavar='LINES',
+                        help="outline diff lines to show per differing document (default 12)")
+    parser.add_argument('--strict', action='store_true', help="don't fold pandoc's smart quotes and dashes")
+    parser.add_argument('--slugs', action='store_true', help="only check heading ids (no pandoc needed)")
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(), help="concurrent pandoc processes")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="per-document pandoc timeout")
+    args = parser.parse_args()
+
+    mismatched = check_slugs()
+    for text, expected, actual in mismatched:
+        print(f"❌ Heading id for {text!r}: pandoc {expected!r}, ours {actual!r}")
+    print(f"🔗 {len(SLUG_CASES) - len(mismatched)}/{len(SLUG_CASES)} heading id(s) match pandoc\n")
+    if args.slugs:
+        return 1 if mismatched else 0
+
+    try:
+        manifest = PageManifest.load(args.manifest or DEFAULT_MANIFEST, root=args.docs_dir)
+    except ManifestError as e:
+        print(f"❌ {e}")
+        return 2
+    if args.paths:
+        paths = [os.path.abspath(p) for p in args.paths]
+    elif args.manifest:
+        paths = sorted({manifest.source_path(p) for p in manifest.pages if p.renderer in ('pandoc', 'markdown')})
+    else:
+        paths = corpus(manifest.root)
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        print("⚠️  No markdown files to check")
+        return 0
+
+    print(f"🔬 Comparing {len(paths)} document(s) with pandoc...\n")
+    results = run_pandoc_jobs([PandocJob(path, path) for path in paths], args=PandocRenderer.args,
+                              concurrency=args.jobs, timeout=args.timeout, batch_size=DEFAULT_BATCH_SIZE)
+    matched = 0
+    errors = 0
+    for path in paths:
+        name = os.path.relpath(path, manifest.root)
+        result = results[path]
+        if not result.ok:
+            errors += 1
+            print(f"❌ {name}: pandoc failed: {(result.error.splitlines() or [''])[0]}")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            native = parse_markdown_to_html(f.read(), cards=False)
+        expected = outline(result.html, args.strict)
+        actual = outline(native, args.strict)
+        if expected == actual:
+            matched += 1
+            print(f"✅ {name}")
+            continue
+        diff = list(difflib.unified_diff(expected, actual, 'pandoc', 'native', n=1, lineterm=''))
+        changed = sum(1 for line in diff if line[:1] in '+-' and line[:3] not in ('+++', '---'))
+        print(f"❌ {name} ({changed} outline line(s) differ)")
+        for line in diff[2:2 + args.diff]:
+            print(f"    {line}")
+
+    print(f"\n📊 {matched}/{len(paths)} document(s) match pandoc")
+    if errors:
+        return 2
+    return 0 if matched == len(paths) and not mismatched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Shared stylesheet pipeline for the generated pages.
+
+Pulls the inline <style> block out of a page template, minifies it into one
+content-hashed stylesheet (so browsers cache it across pages), and bakes only
+the above-the-fold rules back into the template as critical CSS. The full
+sheet is loaded without blocking render.
+"""
+
+import glob
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+
+from build_cache import write_if_changed
+
+# Rules needed to paint the header, title section and first content block.
+# Matched against whole selectors, so ':hover' and print-only rules stay out.
+CRITICAL_SELECTORS = frozenset([
+    '*', 'body', '.material-symbols-outlined', '.container',
+    '.header', '.logo', '.logo-icon', '.logo-text h1', '.logo-text p', '.print-btn',
+    ':root',
+    '.title-section', '.title-section h2', '.title-section p',
+    '.content', '.content>h1:first-child', '.content h2', '.content p',
+    '.content ul', '.content li', '.content li:before', '.content strong',
+    'h2', 'p', 'ul', 'li', 'li:before', 'strong',
+])
+# At-rules that contain rules rather than declarations
+_NESTING_AT_RULES = ('@media', '@supports')
+# Media blocks whose critical rules are also inlined (mobile header layout)
+CRITICAL_MEDIA = ('@media (max-width:768px)',)
+
+_STYLE_BLOCK = re.compile(r'\n?[ \t]*<style>(.*?)</style>', re.DOTALL)
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_SPACE = re.compile(r'\s+')
+_SELECTOR_PUNCT = re.compile(r'\s*([>+~,])\s*')
+_VALUE_PUNCT = re.compile(r'\s*([,])\s*')
+
+
+@dataclass
+class Stylesheet:
+    name: str
+    css: str
+    critical_css: str
+    digest: str
+
+    @property
+    def filename(self):
+        return f"beacon-{self.name}.{self.digest}.css"
+
+    def write(self, output_dir):
+        """Write the hashed sheet and prune older builds of it; True if written"""
+        path = os.path.join(output_dir, self.filename)
+        changed = write_if_changed(path, self.css)
+        for stale in glob.glob(os.path.join(output_dir, f"beacon-{self.name}.*.css")):
+            if os.path.basename(stale) != self.filename:
+                os.unlink(stale)
+        return changed
+
+
+def parse_css(css):
+    """Parse CSS into [(prelude, body)] where body is a declaration string or nested rule list"""
+    css = _COMMENT.sub('', css)
+    rules, _ = _parse_block(css, 0)
+    return rules
+
+
+def _parse_block(css, pos):
+    rules = []
+    start = pos
+    while pos < len(css):
+        ch = css[pos]
+        if ch in '"\'':
+            pos = css.index(ch, pos + 1) + 1
+            continue
+        if ch == '{':
+            prelude = _SPACE.sub(' ', css[start:pos]).strip()
+            if prelude.startswith(_NESTING_AT_RULES):
+                body, pos = _parse_block(css, pos + 1)
+            else:
+                end = pos + 1
+                while css[end] != '}':
+                    if css[end] in '"\'':
+                        end = css.index(css[end], end + 1)
+                    end += 1
+                body = css[pos + 1:end]
+                pos = end
+            rules.append((prelude, body))
+            pos += 1
+            start = pos
+            continue
+        if ch == '}':
+            return rules, pos
+        pos += 1
+    return rules, pos
+
+
+def _minify_prelude(prelude):
+    if prelude.startswith('@'):
+        return re.sub(r'\s*:\s*', ':', prelude)
+    return _SELECTOR_PUNCT.sub(r'\1', prelude)
+
+
+def _minify_declarations(body):
+    decls = []
+    for decl in body.split(';'):
+        if ':' not in decl:
+            continue
+        prop, value = decl.split(':', 1)
+        value = _VALUE_PUNCT.sub(r'\1', _SPACE.sub(' ', value).strip())
+        decls.append(f"{prop.strip()}:{value}")
+    return ';'.join(decls)
+
+
+def minify_rules(rules):
+    out = []
+    for prelude, body in rules:
+        inner = minify_rules(body) if isinstance(body, list) else _minify_declarations(body)
+        if inner:
+            out.append(f"{_minify_prelude(prelude)}{{{inner}}}")
+    return ''.join(out)
+
+
+def _is_critical(prelude):
+    selectors = _minify_prelude(prelude).split(',')
+    return all(sel in CRITICAL_SELECTORS for sel in selectors)
+
+
+def critical_rules(rules):
+    """Subset of rules needed above the fold"""
+    picked = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            if _minify_prelude(prelude) in CRITICAL_MEDIA:
+                inner = critical_rules(body)
+                if inner:
+                    picked.append((prelude, inner))
+        elif _is_critical(prelude):
+            picked.append((prelude, body))
+    return picked
+
+
+def externalize_styles(template_source, name):
+    """Move a template's <style> block into a shared stylesheet.
+
+    Returns (new_template_source, Stylesheet). The template keeps the critical
+    rules inline and preloads the hashed sheet; template braces stay doubled
+    so the result is still valid str.format / PageTemplate syntax.
+    """
+    match = _STYLE_BLOCK.search(template_source)
+    if match is None:
+        raise ValueError(f"template {name!r} has no <style> block")
+    css = match.group(1).replace('{{', '{').replace('}}', '}')
+    rules = parse_css(css)
+    full = minify_rules(rules)
+    critical = minify_rules(critical_rules(rules))
+    sheet = Stylesheet(name, full + '\n', critical, hashlib.sha256(full.encode('utf-8')).hexdigest()[:10])
+
+    href = sheet.filename
+    head = (
+        f'\n  <style>{critical}</style>'
+        f'\n  <link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        f'\n  <noscript><link rel="stylesheet" href="{href}"></noscript>'
+    ).replace('{', '{{').replace('}', '}}')
+    source = template_source[:match.start()] + head + template_source[match.end():]
+    return source, sheet
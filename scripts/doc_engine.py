@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Single build engine for the Beacon doc pages.
+
+Pages are declared once in scripts/doc_pages.json, each with the renderer
+that owns it: 'pandoc' (pandoc HTML in the document template), 'markdown'
+(our own parser writing pandoc-shaped HTML into the same template, no
+pandoc process) or 'native' (our parser's card layout in the marketing
+template). The engine
+checks the manifest for output collisions before doing any work, converts
+each (renderer, source) pair at most once per run, and shares the build
+cache, stylesheet pipeline, worker pool and watch mode across renderers.
+"""
+
+import argparse
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import ast_cache
+import build_cache
+import build_trace
+import css_assets
+import image_assets
+import marketing_markdown
+import library_build
+import page_template
+import pandoc_runner
+import parallel_build
+import pdf_build
+import post_render
+import search_index
+from ast_cache import ASTCache
+from build_cache import (
+    CACHE_DIRNAME, BuildManifest, code_digest, file_digest, inputs_digest, write_if_changed, write_stream_if_changed,
+)
+from build_trace import span
+from css_assets import externalize_styles
+from image_assets import ImagePipeline, ImageSpec
+from library_build import LibraryBuilder, LibrarySpec
+from marketing_markdown import iter_html, render_table, tokenize_blocks
+from page_template import read_template_source, register_template
+from pandoc_runner import DEFAULT_BATCH_SIZE, DEFAULT_TIMEOUT, PandocJob, run_pandoc_jobs
+from parallel_build import default_jobs, report_errors, run_parallel
+from pdf_build import PdfBuilder, PdfSpec
+from post_render import minify_html, precompress
+from search_index import SearchIndex, search_box
+from watch_build import DEFAULT_PORT, LiveReloadServer, live_reload_snippet, watch_files
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(SCRIPTS_DIR, 'doc_pages.json')
+# Native sources at least this large are converted and written in a stream
+# instead of through the worker pool and AST cache (see --stream)
+STREAM_THRESHOLD = 4 * 1024 * 1024
+
+ENGINE_DIGEST = code_digest(
+    __file__, ast_cache.__file__, build_cache.__file__, build_trace.__file__, css_assets.__file__, marketing_markdown.__file__,
+    page_template.__file__, pandoc_runner.__file__, parallel_build.__file__, search_index.__file__,
+    pdf_build.__file__, library_build.__file__, image_assets.__file__, post_render.__file__,
+    search_index.CLIENT_STYLE,
+)
+
+
+class ManifestError(ValueError):
+    """The page manifest is invalid (unknown renderer, colliding outputs, ...)"""
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    source: str
+    output: str
+    renderer: str
+    title: str
+    hero_title: str
+    hero_subtitle: str
+
+
+class PageManifest:
+    """The list of pages to build, loaded from doc_pages.json"""
+
+    def __init__(self, root, output_dir, pages, pdf_output_dir=None, pdfs=(), libraries=(), images=None):
+        self.root = root
+        self.output_dir = output_dir
+        self.pages = pages
+        self.pdf_output_dir = pdf_output_dir or output_dir
+        self.pdfs = list(pdfs)
+        self.libraries = list(libraries)
+        self.images = images
+
+    @classmethod
+    def load(cls, path=DEFAULT_MANIFEST, root=None):
+        """Load a manifest; root overrides the manifest's own (relative) root"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if root is None:
+            root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(path)), data.get('root', '.')))
+        output_dir = os.path.join(root, data.get('output_dir', 'public/presentation-pdfs'))
+        pages = []
+        for entry in data['pages']:
+            try:
+                pages.append(PageSpec(
+                    source=entry['source'],
+                    output=entry['output'],
+                    renderer=entry['renderer'],
+                    title=entry.get('title', entry['hero_title']),
+                    hero_title=entry['hero_title'],
+                    hero_subtitle=entry['hero_subtitle'],
+                ))
+            except KeyError as e:
+                raise ManifestError(f"page entry {entry!r} is missing {e}") from None
+        pdfs = []
+        for entry in data.get('pdfs', []):
+            try:
+                pdfs.append(PdfSpec(**entry))
+            except TypeError as e:
+                raise ManifestError(f"pdf entry {entry!r}: {e}") from None
+        libraries = []
+        for entry in data.get('libraries', []):
+            try:
+                libraries.append(LibrarySpec(**entry))
+            except TypeError as e:
+                raise ManifestError(f"library entry {entry.get('name')!r}: {e}") from None
+        images = None
+        if 'images' in data:
+            try:
+                images = ImageSpec(**data['images'])
+            except TypeError as e:
+                raise ManifestError(f"images entry: {e}") from None
+        pdf_output_dir = os.path.join(root, data.get('pdf_output_dir', 'presentation-pdfs'))
+        manifest = cls(root, output_dir, pages, pdf_output_dir, pdfs, libraries, images)
+        manifest.validate()
+        return manifest
+
+    def validate(self):
+        """Fail fast on unknown renderers and on outputs that would overwrite each other"""
+        seen = {}
+        problems = []
+        for page in self.pages:
+            if page.renderer not in RENDERERS:
+                problems.append(f"{page.output}: unknown renderer {page.renderer!r}")
+            # Compare case-insensitively: macOS and Windows checkouts would collide
+            key = os.path.normcase(page.output).lower()
+            if key in seen:
+                problems.append(f"{page.output}: written by both {seen[key].source} ({seen[key].renderer}) "
+                                f"and {page.source} ({page.renderer})")
+            else:
+                seen[key] = page
+        seen_pdfs = set()
+        for spec in self.pdfs:
+            key = os.path.normcase(spec.output).lower()
+            if key in seen_pdfs:
+                problems.append(f"{spec.output}: listed twice in pdfs")
+            seen_pdfs.add(key)
+        names = [library.name for library in self.libraries]
+        for name in sorted({n for n in names if names.count(n) > 1}):
+            problems.append(f"library {name!r} is defined twice")
+        for library in self.libraries:
+            for section in library.sections:
+                if len(section.keys() & {'source', 'include'}) != 1:
+                    problems.append(f"library {library.name!r}: section {section!r} needs exactly one of source/include")
+        if problems:
+            raise ManifestError("page manifest has conflicts:\n  " + "\n  ".join(problems))
+
+    def source_path(self, page):
+        return os.path.join(self.root, page.source)
+
+    def output_path(self, page):
+        return os.path.join(self.output_dir, page.output)
+
+
+def _convert_native(md_file, ast_dir, cards):
+    table = ASTCache(ast_dir).parse_file(md_file)
+    with span('render', doc=os.path.basename(md_file)):
+        return render_table(table, cards)
+
+
+def _read_lines(md_file):
+    with open(md_file, 'r', encoding='utf-8') as f:
+        yield from f
+
+
+class Renderer(ABC):
+    """Turns markdown sources into HTML bodies and owns a page template.
+
+    Renderers that set can_stream also provide stream(md_file), which
+    yields the HTML body piece by piece; the engine only streams pages
+    whose renderer sets it.
+    """
+
+    name = None
+    template_name = None
+    stylesheet_name = None
+    can_stream = False
+
+    def __init__(self, ast_dir):
+        self.ast_dir = ast_dir
+        self.template_source = read_template_source(self.template_name)
+        page_source, self.stylesheet = externalize_styles(self.template_source, self.stylesheet_name)
+        self.template = register_template(self.template_name, page_source, raw={'content', 'live_reload', 'search'})
+
+    def settings(self):
+        """Options that change the output, folded into every page digest"""
+        return {}
+
+    @abstractmethod
+    def convert(self, md_files, jobs, options):
+        """Return {md_file: (html, error)} for every file"""
+
+
+class PandocRenderer(Renderer):
+    name = 'pandoc'
+    template_name = 'pandoc-page'
+    stylesheet_name = 'pandoc'
+    args = pandoc_runner.DEFAULT_ARGS
+
+    def settings(self):
+        return {'pandoc_args': self.args}
+
+    def convert(self, md_files, jobs, options):
+        jobs_list = [PandocJob(path, path) for path in md_files]
+        results = run_pandoc_jobs(jobs_list, args=self.args, concurrency=jobs, **options)
+        return {path: (results[path].html, results[path].error) for path in md_files}
+
+
+class NativeRenderer(Renderer):
+    name = 'native'
+    template_name = 'marketing-page'
+    stylesheet_name = 'marketing'
+    can_stream = True
+    cards = True
+
+    def stream(self, md_file):
+        return iter_html(_read_lines(md_file), self.cards)
+
+    def convert(self, md_files, jobs, options):
+        tasks = [(path, self.ast_dir, self.cards) for path in md_files]
+        if not build_trace.enabled():
+            outcomes = run_parallel(_convert_native, tasks, jobs)
+            return {outcome.task[0]: (outcome.result, outcome.error) for outcome in outcomes}
+        # Profiling: workers trace themselves and send their events back
+        results = {}
+        for outcome in run_parallel(build_trace.call_traced, [(_convert_native,) + task for task in tasks], jobs):
+            html, events = outcome.result if outcome.ok else (None, ())
+            build_trace.merge(events)
+            results[outcome.task[1]] = (html, outcome.error)
+        return results
+
+
+class MarkdownRenderer(NativeRenderer):
+    """The native parser writing plain document HTML for the pandoc template"""
+
+    name = 'markdown'
+    template_name = 'pandoc-page'
+    stylesheet_name = 'pandoc'
+    cards = False
+
+
+RENDERERS = {cls.name: cls for cls in (PandocRenderer, MarkdownRenderer, NativeRenderer)}
+
+
+class BuildEngine:
+    """Builds manifest pages incrementally with the shared cache and worker pool"""
+
+    def __init__(self, manifest, jobs=None, pandoc_options=None, live_reload='', stream=False,
+                 minify=False, precompress=False):
+        self.manifest = manifest
+        self.jobs = jobs or default_jobs()
+        self.pandoc_options = pandoc_options or {}
+        self.live_reload = live_reload
+        self.stream = stream
+        self.minify = minify
+        self.precompress = precompress
+        self.cache = BuildManifest.for_root(manifest.root)
+        self.ast_dir = ASTCache.for_root(manifest.root).directory  # native-parsed markdown, also read by the search index
+        self.images = ImagePipeline(manifest.root, manifest.images, self.jobs) if manifest.images else None
+        self.search_box = search_box()
+        self._renderers = {}
+
+    def renderer(self, name):
+        if name not in self._renderers:
+            self._renderers[name] = RENDERERS[name](self.ast_dir)
+        return self._renderers[name]
+
+    def streams(self, page):
+        """Whether page is converted line by line instead of in one piece"""
+        if not self.renderer(page.renderer).can_stream:
+            return False
+        return self.stream or os.path.getsize(self.manifest.source_path(page)) >= STREAM_THRESHOLD
+
+    def page_digest(self, page, renderer, images=''):
+        return inputs_digest(
+            file_digest(self.manifest.source_path(page)),
+            renderer.template_source,
+            {
+                'renderer': renderer.name,
+                'settings': renderer.settings(),
+                'title': page.title,
+                'hero': [page.hero_title, page.hero_subtitle],
+                'live_reload': self.live_reload,
+                'engine': ENGINE_DIGEST,
+                'images': images,
+                'minify': self.minify,
+            },
+        )
+
+    def build(self, pages=None, force=False):
+        """Build pages (default: all); returns [(output, error)] for failures"""
+        pages = self.manifest.pages if pages is None else pages
+        os.makedirs(self.manifest.output_dir, exist_ok=True)
+        # Pages embed image variant names, so they rebuild when the images change
+        images = self.images.digest() if self.images else ''
+
+        stale = []
+        for page in pages:
+            source_path = self.manifest.source_path(page)
+            if not os.path.exists(source_path):
+                print(f"⚠️  Skipping {page.source} (not found)")
+                continue
+            renderer = self.renderer(page.renderer)
+            with span('stylesheet'):
+                if renderer.stylesheet.write(self.manifest.output_dir):
+                    print(f"🎨 Wrote {renderer.stylesheet.filename}")
+            key = f"{renderer.name}:{page.output}"
+            with span('cache check', doc=page.source) as sp:
+                digest = self.page_digest(page, renderer, images)
+                fresh = not force and self.cache.is_fresh(key, digest, self.manifest.output_path(page))
+                sp.set(fresh=fresh)
+            if fresh:
+                print(f"⏭️  {page.output} is up to date")
+                continue
+            print(f"Building {page.output} from {page.source} ({renderer.name})...")
+            stale.append((page, key, digest))
+
+        # Convert each (renderer, source) pair once, however many pages use it
+        converted = {}
+        for name in RENDERERS:
+            sources = sorted({self.manifest.source_path(p) for p, _, _ in stale
+                              if p.renderer == name and not self.streams(p)})
+            if sources:
+                options = self.pandoc_options if name == 'pandoc' else {}
+                with span(f'convert ({name})', cat='stage', documents=len(sources)):
+                    results = self.renderer(name).convert(sources, self.jobs, options)
+                for path, result in results.items():
+                    converted[name, path] = result
+
+        failures = []
+        for page, key, digest in stale:
+            output_path = self.manifest.output_path(page)
+            if self.streams(page):
+                try:
+                    with span('stream', doc=page.source):
+                        changed = self._write_streamed(page, output_path)
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"❌ Error converting {page.source}: {e}")
+                    failures.append((page.output, str(e)))
+                    continue
+                self.cache.record(key, digest, output_path)
+                print(f"✅ Created {page.output} (streamed)" if changed else f"✅ {page.output} unchanged")
+                continue
+            html, error = converted[page.renderer, self.manifest.source_path(page)]
+            if error is not None:
+                print(f"❌ Error converting {page.source}: {(error.splitlines() or [''])[0]}")
+                failures.append((page.output, error))
+                continue
+            if self.images:
+                html = self.images.rewrite(html, self.manifest.output_dir, os.path.dirname(self.manifest.source_path(page)))
+            with span('template fill', doc=page.source):
+                chunks = list(self.renderer(page.renderer).template.iter_chunks(
+                    title=page.title,
+                    hero_title=page.hero_title,
+                    hero_subtitle=page.hero_subtitle,
+                    content=html,
+                    live_reload=self.live_reload,
+                    search=self.search_box,
+                ))
+            if self.minify:
+                with span('minify', doc=page.source):
+                    chunks = [minify_html(b''.join(chunks).decode('utf-8')).encode('utf-8')]
+            with span('write', doc=page.source):
+                changed = write_if_changed(output_path, chunks)
+            self.cache.record(key, digest, output_path)
+            print(f"✅ Created {page.output}" if changed else f"✅ {page.output} unchanged")
+
+        self.cache.save()
+        with span('search index', cat='stage'):
+            self.update_search_index()
+        if self.precompress:
+            with span('precompress', cat='stage'):
+                compressed = precompress(self.manifest.output_dir)
+            if compressed:
+                print(f"🗜️  Precompressed {compressed} file(s) (.gz{'/.br' if post_render.brotli else ''})")
+        return failures
+
+    def _write_streamed(self, page, output_path):
+        """Convert, fill and write one page without holding it in memory"""
+        renderer = self.renderer(page.renderer)
+        content = renderer.stream(self.manifest.source_path(page))
+        if self.images:
+            source_dir = os.path.dirname(self.manifest.source_path(page))
+            content = (self.images.rewrite(fragment, self.manifest.output_dir, source_dir) for fragment in content)
+        chunks = renderer.template.iter_chunks(
+            title=page.title,
+            hero_title=page.hero_title,
+            hero_subtitle=page.hero_subtitle,
+            content=content,
+            live_reload=self.live_reload,
+            search=self.search_box,
+        )
+        return write_stream_if_changed(output_path, chunks)
+
+    def update_search_index(self):
+        """Re-index every manifest page from the parsed-markdown cache, and the built libraries with search"""
+        index = SearchIndex()
+        ast = ASTCache(self.ast_dir)
+        for page in self.manifest.pages:
+            source_path = self.manifest.source_path(page)
+            if not os.path.exists(source_path):
+                continue
+            if self.streams(page):
+                # Index block by block rather than caching a table of the whole file
+                index.add_page(page.output, page.title, tokenize_blocks(_read_lines(source_path)))
+            else:
+                index.add_page(page.output, page.title, ast.parse_file(source_path))
+        libraries = LibraryBuilder(self.manifest.root)
+        for spec in self.manifest.libraries:
+            if spec.search:
+                url = os.path.relpath(os.path.join(self.manifest.root, spec.output), self.manifest.output_dir)
+                libraries.index(spec, index, url.replace(os.sep, '/'))
+        if index.write(self.manifest.output_dir):
+            print(f"🔎 Search index: {len(index.sections)} sections, {len(index.postings)} terms")
+
+    def watch(self, pages, port):
+        """Rebuild only the pages whose sources change, live-reloading browsers"""
+        server = LiveReloadServer(port)
+        server.start()
+        self.live_reload = live_reload_snippet(port)
+        print(f"\n🔌 Live reload on http://localhost:{port}/events")
+
+        def rebuild(changed):
+            affected = [p for p in pages if self.manifest.source_path(p) in changed]
+            self.build(affected)
+            server.notify([p.output for p in affected])
+
+        try:
+            watch_files(sorted({self.manifest.source_path(p) for p in pages}), rebuild)
+        finally:
+            server.close()
+            print("ℹ️  Pages still contain the live-reload script; run once without --watch before publishing")
+
+
+def build_arg_parser(description=None):
+    parser = argparse.ArgumentParser(description=description or "Build the Beacon presentation pages listed in doc_pages.json")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="page manifest (JSON)")
+    parser.add_argument('--docs-dir', default=None,
+                        help="repository root containing the markdown sources (default: from the manifest)")
+    parser.add_argument('--renderer', choices=sorted(RENDERERS), action='append',
+                        help="only build pages owned by this renderer (repeatable)")
+    parser.add_argument('--stage', choices=['html', 'images', 'pdf', 'library'], action='append',
+                        help="what to build: html pages (with their images), image variants only, pdf documents, "
+                             "reference libraries (repeatable, default: html)")
+    parser.add_argument('--library', action='append',
+                        help="with --stage library, only build this library (repeatable)")
+    parser.add_argument('--force', action='store_true', help="ignore the build cache and rebuild every page")
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(),
+                        help="worker processes / pandoc processes (default: CPU count)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help="per-document pandoc timeout in seconds")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="documents per pandoc invocation (1 disables batching)")
+    parser.add_argument('--watch', action='store_true',
+                        help="rebuild pages when their markdown changes and live-reload open browsers")
+    parser.add_argument('--live-reload-port', type=int, default=DEFAULT_PORT,
+                        help="port for the live-reload event stream in --watch mode")
+    parser.add_argument('--stream', action='store_true',
+                        help=f"convert native pages line by line with flat memory use "
+                             f"(automatic for sources over {STREAM_THRESHOLD // (1024 * 1024)} MB)")
+    parser.add_argument('--minify', action='store_true',
+                        help="minify generated HTML (comments, whitespace, attribute quotes; streamed pages excluded)")
+    parser.add_argument('--precompress', action='store_true',
+                        help=f"write .gz/.br siblings and {post_render.MANIFEST_NAME} for the generated pages and assets")
+    parser.add_argument('--profile', metavar='TRACE', nargs='?', const='',
+                        help="write a Chrome trace of the build (default: .build-cache/trace.json) "
+                             "and print the slowest stages and documents")
+    return parser
+
+
+def main(argv=None, renderers=None, description=None, stages=('html',)):
+    """Command-line entry point shared by build-docs.py and the legacy script names"""
+    args = build_arg_parser(description).parse_args(argv)
+    renderers = args.renderer or renderers
+    stages = args.stage or stages
+
+    try:
+        manifest = PageManifest.load(args.manifest, root=args.docs_dir)
+    except ManifestError as e:
+        print(f"❌ {e}")
+        return 2
+    pages = [p for p in manifest.pages if not renderers or p.renderer in renderers]
+
+    engine = BuildEngine(
+        manifest,
+        jobs=args.jobs,
+        pandoc_options={'timeout': args.timeout, 'batch_size': args.batch_size},
+        live_reload=live_reload_snippet(args.live_reload_port) if args.watch else '',
+        stream=args.stream,
+        minify=args.minify,
+        precompress=args.precompress,
+    )
+
+    tracer = build_trace.enable() if args.profile is not None else None
+    failures = []
+    if engine.images and ('html' in stages or 'images' in stages):
+        print("🖼️  Optimizing presentation images...\n")
+        with span('images', cat='stage'):
+            failures += engine.images.build(force=args.force)
+
+    if 'html' in stages:
+        print("🎨 Building Beacon presentation pages...\n")
+        with span('html', cat='stage'):
+            failures += engine.build(pages, force=args.force)
+
+        print("\n✅ Build complete!")
+        print(f"📍 Location: {manifest.output_dir}")
+        print("\nView at:")
+        for page in pages:
+            print(f"  http://localhost:3002/presentation-pdfs/{page.output}")
+
+    if 'pdf' in stages:
+        print("\n📚 Building Beacon PDFs...\n")
+        builder = PdfBuilder(manifest.root, manifest.pdf_output_dir, jobs=args.jobs, timeout=args.timeout)
+        with span('pdf', cat='stage'):
+            failures += builder.build(manifest.pdfs, force=args.force)
+        print(f"\n📦 PDFs are in: {manifest.pdf_output_dir}")
+
+    if 'library' in stages:
+        libraries = [lib for lib in manifest.libraries if not args.library or lib.name in args.library]
+        unknown = set(args.library or ()) - {lib.name for lib in manifest.libraries}
+        if unknown:
+            print(f"❌ Unknown library: {', '.join(sorted(unknown))}")
+            return 2
+        print("\n📚 Assembling reference libraries...\n")
+        builder = LibraryBuilder(manifest.root, jobs=args.jobs,
+                                 pandoc_options={'timeout': args.timeout, 'batch_size': args.batch_size})
+        with span('library', cat='stage'):
+            failures += builder.build(libraries, force=args.force)
+        with span('search index', cat='stage'):
+            engine.update_search_index()
+
+    if tracer is not None:
+        build_trace.disable()
+        trace_path = args.profile or os.path.join(manifest.root, CACHE_DIRNAME, 'trace.json')
+        build_trace.write_trace(tracer, trace_path)
+        build_trace.print_summary(tracer)
+        print(f"\n🧭 Trace written to {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    if args.watch:
+        engine.watch(pages, args.live_reload_port)
+    return report_errors(failures)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic survey responses (tokens + responses_v3) for load testing.
+
+Employees come from a hierarchy CSV, or from a generated hierarchy with
+--teams. Responses are drawn with NumPy a block of employees at a time and
+streamed out in batches as CSV, multi-row INSERTs or psql COPY blocks. The
+same --seed and --end always give the same rows (see response_generator.py).
+
+Usage:
+  python3 scripts/generate-survey-responses.py --client-id <uuid> --teams 20000 --with-hierarchy -o load.sql
+  python3 scripts/generate-survey-responses.py public/templates/hierarchy-template.csv --client-id <uuid> --format csv
+  python3 scripts/generate-survey-responses.py --client-id <uuid> --teams 500 --trends trends.json --scores scores.csv
+
+--trends is a JSON object of per-period slopes (0-100 scale), e.g.
+  {"Team 3": {"workload": -2.5}, "Division 1/Department 2/Team 9": {"*": 1.5}}
+and --scores writes each team's domain scores for beacon-insights.py.
+
+Then: psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f load.sql
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import sys
+import time
+
+from build_cache import write_stream_if_changed
+from hierarchy_loader import HierarchyError, HierarchyLoader
+from hierarchy_loader import copy_chunks as hierarchy_copy_chunks
+from hierarchy_loader import sql_chunks as hierarchy_sql_chunks
+from response_generator import (DEFAULT_BATCH_SIZE, Model, Population, ResponseGenerator, SyntheticDataError,
+                                copy_chunks, csv_chunks, period_starts, sql_chunks, synthetic_hierarchy)
+from score_store import DEFAULT_ANCHOR, DEFAULT_PERIOD_DAYS
+
+WRITERS = {'csv': (csv_chunks, None), 'sql': (sql_chunks, hierarchy_sql_chunks),
+           'copy': (copy_chunks, hierarchy_copy_chunks)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('hierarchy', nargs='?', help="hierarchy CSV (columns as in public/templates/hierarchy-template.csv)")
+    parser.add_argument('--teams', type=int, help="generate a hierarchy of this many teams instead")
+    parser.add_argument('--team-size', type=float, default=10, help="mean employees per generated team")
+    parser.add_argument('--save-hierarchy', metavar='PATH', help="also write the generated hierarchy CSV")
+    parser.add_argument('--client-id', default=os.environ.get('NEXT_PUBLIC_DASHBOARD_CLIENT_ID'),
+                        help="client UUID (default: $NEXT_PUBLIC_DASHBOARD_CLIENT_ID)")
+    parser.add_argument('--periods', type=int, default=12, help="survey periods per employee")
+    parser.add_argument('--period-days', type=int, default=DEFAULT_PERIOD_DAYS, help="length of a period in days")
+    parser.add_argument('--anchor', default=DEFAULT_ANCHOR,
+                        help="date a period starts on, as for aggregate-responses.py (default: %(default)s)")
+    parser.add_argument('--end', default=datetime.date.today().isoformat(),
+                        help="date the last period ends, snapped back to a period start (default: the last one "
+                             "before today; set it for reproducible output)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--participation', type=float, default=Model.participation,
+                        help="share of employees answering each period")
+    parser.add_argument('--drift', type=float, default=Model.drift_sd,
+                        help="spread of each team's random per-period trend")
+    parser.add_argument('--trends', metavar='JSON', help="file of per-team trends that replace the random drift")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='sql',
+                        help="csv: responses_v3 rows only; sql: INSERT ... ON CONFLICT DO NOTHING; "
+                             "copy: COPY FROM stdin (fastest)")
+    parser.add_argument('--with-hierarchy', action='store_true',
+                        help="emit the divisions, departments, teams and employees first (sql/copy)")
+    parser.add_argument('-o', '--output', help="write here instead of stdout")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per INSERT/COPY batch")
+    parser.add_argument('--scores', metavar='PATH', help="write team × period domain scores (.csv or .npz)")
+    args = parser.parse_args()
+
+    if (args.hierarchy is None) == (args.teams is None):
+        parser.error("give a hierarchy CSV or --teams")
+    if args.with_hierarchy and args.format == 'csv':
+        parser.error("--with-hierarchy needs --format sql or copy")
+    if not args.client_id:
+        print("❌ --client-id is required (or set NEXT_PUBLIC_DASHBOARD_CLIENT_ID)", file=sys.stderr)
+        return 2
+    try:
+        loader = HierarchyLoader(args.client_id, args.batch_size)
+        end = datetime.date.fromisoformat(args.end)
+        anchor = datetime.date.fromisoformat(args.anchor)
+        trends = None
+        if args.trends:
+            with open(args.trends, 'r', encoding='utf-8') as f:
+                trends = json.load(f)
+            if not isinstance(trends, dict):
+                raise SyntheticDataError(f"{args.trends}: expected a JSON object of team trends")
+    except (HierarchyError, OSError, SyntheticDataError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    model = Model(drift_sd=args.drift, participation=args.participation)
+    population = Population()
+    periods = period_starts(args.periods, end, args.period_days, anchor)
+    generator = ResponseGenerator(population, loader.client_id, periods,
+                                  seed=args.seed, model=model, trends=trends, period_days=args.period_days)
+    write_responses, write_hierarchy = WRITERS[args.format]
+
+    start = time.perf_counter()
+    try:
+        if args.teams is not None:
+            if args.save_hierarchy:
+                write_stream_if_changed(args.save_hierarchy, synthetic_hierarchy(args.teams, args.team_size, args.seed))
+            f = None
+            lines = synthetic_hierarchy(args.teams, args.team_size, args.seed)
+        else:
+            f = lines = open(args.hierarchy, 'r', encoding='utf-8-sig', newline='')
+        try:
+            batches = population.record(loader.batches(lines))
+            if args.with_hierarchy:
+                # Written as it is read; the responses follow once every employee is known
+                chunks = itertools.chain(write_hierarchy(batches), write_responses(generator.batches(args.batch_size)))
+            else:
+                for _ in batches:
+                    pass
+                chunks = write_responses(generator.batches(args.batch_size))
+            if args.output:
+                write_stream_if_changed(args.output, chunks)
+            else:
+                sys.stdout.writelines(chunks)
+        finally:
+            if f is not None:
+                f.close()
+        if args.scores:
+            generator.score_matrix().save(args.scores)
+    except (HierarchyError, OSError, SyntheticDataError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    stats = loader.stats
+    for line, message in stats.errors:
+        print(f"❌ Line {line}: {message}", file=sys.stderr)
+    rate = f", {generator.responses / elapsed:,.0f} responses/s" if elapsed else ''
+    print(f"✅ {generator.responses:,} response(s) from {stats.employees:,} employee(s) in {stats.teams:,} team(s) "
+          f"over {args.periods} period(s) → {args.output or 'stdout'} ({elapsed:.2f}s{rate})", file=sys.stderr)
+    if args.scores:
+        print(f"📊 Wrote team scores to {args.scores}", file=sys.stderr)
+    if stats.error_count:
+        print(f"⚠️  Skipped {stats.error_count} invalid hierarchy row(s) of {stats.rows}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
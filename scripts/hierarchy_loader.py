@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Streaming loader for the client hierarchy CSV (public/templates/hierarchy-template.csv).
+
+Rows are read one at a time and validated as they go past. Divisions,
+departments and teams are interned in dictionaries keyed by their path, so
+each one is emitted exactly once however many employees sit under it. IDs
+are derived from the client id and the row's names (uuid5), so no row
+needs a database round trip to learn its parent's id, and re-importing the
+same file produces the same ids. An employee's id comes from their external
+id alone, so when a re-import moves someone to another team or changes
+their name or email, the existing row is updated in place.
+
+Rows come out as (table, columns, rows) batches. Parents are always
+flushed before the employees that reference them, so every output
+(multi-row INSERTs, COPY blocks, SQLite) can be replayed in order without
+breaking a foreign key.
+"""
+
+import csv
+import hashlib
+import re
+import sqlite3
+import uuid
+from dataclasses import dataclass, field
+
+DEFAULT_BATCH_SIZE = 1000
+# Stop collecting (but keep counting) errors past this many
+MAX_REPORTED_ERRORS = 200
+
+REQUIRED_COLUMNS = ('division', 'department', 'team', 'employee_external_id')
+OPTIONAL_COLUMNS = ('first_name', 'last_name', 'email')
+
+# Column lists match database-schema-divisions-departments-teams-FIXED.sql
+TABLE_COLUMNS = {
+    'public.divisions': ('division_id', 'client_id', 'division_name', 'active'),
+    'public.departments': ('department_id', 'division_id', 'department_name', 'active'),
+    'public.teams': ('team_id', 'department_id', 'team_name', 'active'),
+    'public.employees': ('id', 'employee_id', 'client_id', 'external_ref', 'division_id', 'department_id',
+                         'team_id', 'active', 'first_name', 'last_name', 'email'),
+}
+PRIMARY_KEYS = {
+    'public.divisions': 'division_id',
+    'public.departments': 'department_id',
+    'public.teams': 'team_id',
+    'public.employees': 'id',
+}
+# Columns a re-import overwrites on an existing row; the other tables' ids come from their names
+UPSERT_COLUMNS = {
+    'public.employees': ('division_id', 'department_id', 'team_id', 'active', 'first_name', 'last_name', 'email'),
+}
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_SPACE = re.compile(r'\s+')
+MAX_NAME_LENGTH = 200
+
+
+class HierarchyError(Exception):
+    """The CSV can't be loaded at all (missing columns, bad client id)"""
+
+
+@dataclass
+class LoadStats:
+    rows: int = 0
+    employees: int = 0
+    divisions: int = 0
+    departments: int = 0
+    teams: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)  # (line number, message)
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _clean(value):
+    return _SPACE.sub(' ', value).strip()
+
+
+def uuid5(namespace, name):
+    """str(uuid.uuid5(namespace, name)) without building UUID objects (namespace as bytes)"""
+    digest = bytearray(hashlib.sha1(namespace + name.encode('utf-8')).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50
+    digest[8] = (digest[8] & 0x3F) | 0x80
+    h = digest.hex()
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+class HierarchyLoader:
+    """Turns hierarchy CSV lines into FK-ordered insert batches for one client"""
+
+    def __init__(self, client_id, batch_size=DEFAULT_BATCH_SIZE):
+        try:
+            self.client_id = str(uuid.UUID(client_id))
+        except (TypeError, ValueError):
+            raise HierarchyError(f"Client id is not a UUID: {client_id!r}")
+        self.batch_size = max(1, batch_size)
+        self.namespace = uuid.UUID(self.client_id).bytes
+        self.stats = LoadStats()
+        # path tuple -> id; a path is only ever added once
+        self.divisions = {}
+        self.departments = {}
+        self.teams = {}
+        self._employees = set()
+        self._names = {}  # raw cell -> cleaned name; hierarchy names repeat on every row
+        self._pending = {table: [] for table in TABLE_COLUMNS}
+
+    def _id(self, *parts):
+        return uuid5(self.namespace, '\x1f'.join(parts))
+
+    def _name(self, value):
+        name = self._names.get(value)
+        if name is None:
+            name = self._names[value] = _clean(value)
+        return name
+
+    def _columns(self, header):
+        index = {_clean(name).lower(): i for i, name in enumerate(header)}
+        missing = [name for name in REQUIRED_COLUMNS if name not in index]
+        if missing:
+            raise HierarchyError(f"CSV header is missing column(s): {', '.join(missing)}")
+        return [index.get(name) for name in REQUIRED_COLUMNS + OPTIONAL_COLUMNS]
+
+    def _validate(self, line, values):
+        """Row values, or None after recording why the row is rejected"""
+        division, department, team, external_id, first, last, email = values
+        for name, value in zip(REQUIRED_COLUMNS, (division, department, team, external_id)):
+            if not value:
+                self.stats.error(line, f"{name} is empty")
+                return None
+            if len(value) > MAX_NAME_LENGTH:
+                self.stats.error(line, f"{name} is longer than {MAX_NAME_LENGTH} characters")
+                return None
+        if email and not _EMAIL.match(email):
+            self.stats.error(line, f"email is not valid: {email!r}")
+            return None
+        if external_id in self._employees:
+            self.stats.error(line, f"duplicate employee_external_id {external_id!r}")
+            return None
+        return values
+
+    def _node(self, table, nodes, key, parent_id, name):
+        node_id = nodes.get(key)
+        if node_id is None:
+            node_id = nodes[key] = self._id(table, *key)
+            self._pending[table].append((node_id, parent_id, name, True))
+        return node_id
+
+    def _flush(self, final=False):
+        # Parents first: an employee batch never references an unwritten team
+        for table, rows in self._pending.items():
+            if rows and (final or table != 'public.employees' or len(rows) >= self.batch_size):
+                self._pending[table] = []
+                yield table, TABLE_COLUMNS[table], rows
+
+    def batches(self, lines):
+        """Yield (table, columns, rows) for every valid row of CSV text lines"""
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            raise HierarchyError("CSV is empty")
+        columns = self._columns(header)
+        stats = self.stats
+        employees = self._pending['public.employees']
+
+        for row in reader:
+            if not any(row):
+                continue
+            stats.rows += 1
+            line = reader.line_num
+            values = [row[i].strip() if i is not None and i < len(row) else '' for i in columns]
+            values[0:3] = map(self._name, values[0:3])
+            values = self._validate(line, values)
+            if values is None:
+                continue
+            division, department, team, external_id, first, last, email = values
+
+            division_id = self._node('public.divisions', self.divisions, (division,), self.client_id, division)
+            department_id = self._node('public.departments', self.departments, (division, department),
+                                       division_id, department)
+            team_id = self._node('public.teams', self.teams, (division, department, team), department_id, team)
+
+            self._employees.add(external_id)
+            employee_id = self._id('public.employees', external_id)
+            employees.append((employee_id, employee_id, self.client_id, external_id, division_id, department_id,
+                              team_id, True, first or None, last or None, email.lower() or None))
+            if len(employees) >= self.batch_size:
+                yield from self._flush()
+                employees = self._pending['public.employees']
+
+        yield from self._flush(final=True)
+        stats.employees = len(self._employees)
+        stats.divisions = len(self.divisions)
+        stats.departments = len(self.departments)
+        stats.teams = len(self.teams)
+
+
+def _sql_literal(value):
+    if value.__class__ is str:
+        return "'" + value.replace("'", "''") + "'" if "'" in value else "'" + value + "'"
+    if value is None:
+        return 'NULL'
+    if value is True or value is False:
+        return 'TRUE' if value else 'FALSE'
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _on_conflict(table, excluded='EXCLUDED'):
+    """ON CONFLICT clause: update UPSERT_COLUMNS from the new row, or keep the existing row"""
+    updates = ', '.join(f"{column}={excluded}.{column}" for column in UPSERT_COLUMNS.get(table, ()))
+    return f"ON CONFLICT ({PRIMARY_KEYS[table]}) " + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING")
+
+
+def sql_chunks(batches):
+    """Multi-row INSERT statements in one transaction; re-runs skip existing nodes and update employees"""
+    yield 'BEGIN;\n'
+    for table, columns, rows in batches:
+        values = ',\n'.join('(' + ', '.join(map(_sql_literal, row)) + ')' for row in rows)
+        yield f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n{values}\n{_on_conflict(table)};\n"
+    yield 'COMMIT;\n'
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_field(value):
+    if value.__class__ is str:
+        return value.translate(_COPY_ESCAPES) if '\\' in value or '\t' in value or '\n' in value or '\r' in value else value
+    if value is None:
+        return '\\N'
+    if value is True or value is False:
+        return 't' if value else 'f'
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_chunks(batches):
+    """psql COPY ... FROM stdin blocks (fastest, but only for a client's first import)"""
+    yield 'BEGIN;\n'
+    for table, columns, rows in batches:
+        lines = ''.join('\t'.join(map(_copy_field, row)) + '\n' for row in rows)
+        yield f"COPY {table} ({', '.join(columns)}) FROM stdin;\n{lines}\\.\n"
+    yield 'COMMIT;\n'
+
+
+# Stand-in for the Supabase tables when testing imports locally
+SQLITE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS divisions (
+  division_id TEXT PRIMARY KEY, client_id TEXT NOT NULL, division_name TEXT NOT NULL,
+  active BOOLEAN DEFAULT 1, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS departments (
+  department_id TEXT PRIMARY KEY, division_id TEXT NOT NULL REFERENCES divisions(division_id),
+  department_name TEXT NOT NULL, active BOOLEAN DEFAULT 1, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS teams (
+  team_id TEXT PRIMARY KEY, department_id TEXT NOT NULL REFERENCES departments(department_id),
+  team_name TEXT NOT NULL, active BOOLEAN DEFAULT 1, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS employees (
+  id TEXT PRIMARY KEY, employee_id TEXT, client_id TEXT NOT NULL, external_ref TEXT,
+  division_id TEXT REFERENCES divisions(division_id), department_id TEXT REFERENCES departments(department_id),
+  team_id TEXT REFERENCES teams(team_id), active BOOLEAN DEFAULT 1,
+  first_name TEXT, last_name TEXT, email TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE INDEX IF NOT EXISTS idx_employees_team_id ON employees(team_id);
+'''
+
+
+def load_sqlite(path, batches):
+    """Upsert batches into a SQLite database in one transaction, as sql_chunks does; returns rows written"""
+    connection = sqlite3.connect(path)
+    written = 0
+    try:
+        connection.executescript(SQLITE_SCHEMA)
+        connection.execute('PRAGMA foreign_keys = ON')
+        with connection:
+            for table, columns, rows in batches:
+                name = table.split('.')[-1]
+                placeholders = ', '.join('?' * len(columns))
+                cursor = connection.executemany(
+                    f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({placeholders}) "
+                    + _on_conflict(table, 'excluded'), rows)
+                written += cursor.rowcount
+    finally:
+        connection.close()
+    return written
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Responsive image variants for the presentation pages.
+
+Each source image is resized to a few widths and encoded as WebP plus an
+optimized PNG (or JPEG). Variant names carry the source's content hash and
+the encoded files live in .build-cache/images/, so an image is only
+re-encoded when its bytes change. Every local <img> in a rendered page
+becomes a <picture> with srcset, sizes, intrinsic width/height and lazy
+loading.
+
+Encoding needs Pillow (pip install pillow). Without it no variants are
+made, but pages still get width/height (read from the file header) and
+loading="lazy".
+"""
+
+import glob
+import io
+import json
+import os
+import re
+import struct
+from dataclasses import dataclass, field
+from urllib.parse import quote, unquote
+
+from build_cache import CACHE_DIRNAME, file_digest, inputs_digest, write_if_changed
+from parallel_build import run_parallel
+
+try:
+    from PIL import Image
+except ImportError:  # optional: only needed to encode variants
+    Image = None
+
+IMAGE_DIRNAME = 'images'
+VARIANT_VERSION = 1
+DEFAULT_WIDTHS = (480, 960, 1600)
+# Rendered width of content images: full width up to the 1200px container
+DEFAULT_SIZES = '(max-width: 1200px) 100vw, 1200px'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+# Cache entries kept across runs (oldest are pruned first)
+MAX_CACHED = 256
+
+_IMG_TAG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_ATTR = re.compile(r'([\w-]+)\s*=\s*"([^"]*)"')
+_REMOTE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//)', re.IGNORECASE)
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+@dataclass(frozen=True)
+class ImageSpec:
+    sources: list
+    output_dir: str = 'public/presentation-pdfs/img'
+    widths: list = field(default_factory=lambda: list(DEFAULT_WIDTHS))
+    sizes: str = DEFAULT_SIZES
+
+
+def image_size(path):
+    """(width, height) from a PNG, GIF or JPEG header, or None"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(26)
+            if head[:8] == b'\x89PNG\r\n\x1a\n':
+                return struct.unpack('>II', head[16:24])
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                return struct.unpack('<HH', head[6:10])
+            if head[:2] != b'\xff\xd8':
+                return None
+            # JPEG: walk the segments to the first start-of-frame marker
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                length = struct.unpack('>H', f.read(2))[0]
+                if marker[1] in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+
+
+def _encode(image, fmt):
+    out = io.BytesIO()
+    if fmt == 'webp':
+        image.save(out, 'WEBP', quality=WEBP_QUALITY, method=6)
+    elif fmt == 'jpeg':
+        image.convert('RGB').save(out, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(out, 'PNG', optimize=True)
+    return out.getvalue()
+
+
+def encode_variants(source, files_dir, prefix, widths):
+    """Encode every variant of one image into files_dir; returns its cache entry"""
+    with Image.open(source) as original:
+        fallback = 'jpeg' if original.format == 'JPEG' else 'png'
+        image = original.convert('RGBA') if original.mode not in ('RGB', 'RGBA', 'L', 'LA') else original.copy()
+    width, height = image.size
+    # Never upscale: widths past the original collapse into the original size
+    targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+    variants = []
+    for target in targets:
+        scaled_height = max(1, round(height * target / width))
+        resized = image if target == width else image.resize((target, scaled_height), Image.LANCZOS)
+        for fmt in ('webp', fallback):
+            data = _encode(resized, fmt)
+            if target == width and fmt == fallback and len(data) >= os.path.getsize(source):
+                # Re-encoding didn't help; ship the original bytes
+                with open(source, 'rb') as f:
+                    data = f.read()
+            name = f"{prefix}-{target}.{'jpg' if fmt == 'jpeg' else fmt}"
+            write_if_changed(os.path.join(files_dir, name), data)
+            variants.append([name, target, scaled_height, fmt])
+    return {'version': VARIANT_VERSION, 'width': width, 'height': height, 'variants': variants}
+
+
+class ImagePipeline:
+    """Encodes an ImageSpec's images and rewrites <img> tags to use them"""
+
+    def __init__(self, root, spec, jobs=None):
+        self.root = root
+        self.spec = spec
+        self.jobs = jobs
+        self.output_dir = os.path.join(root, spec.output_dir)
+        self.cache_dir = os.path.join(root, CACHE_DIRNAME, IMAGE_DIRNAME)
+        self.files_dir = os.path.join(self.cache_dir, 'files')
+        self._entries = {}
+        self._keys = {}
+
+    def sources(self):
+        """Absolute paths of the spec's images"""
+        paths = set()
+        for pattern in self.spec.sources:
+            for path in glob.glob(os.path.join(self.root, pattern)):
+                if path.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(path):
+                    paths.add(os.path.abspath(path))
+        return sorted(paths)
+
+    def _key(self, path):
+        if path not in self._keys:
+            settings = {'widths': list(self.spec.widths), 'quality': [WEBP_QUALITY, JPEG_QUALITY],
+                        'version': VARIANT_VERSION}
+            self._keys[path] = inputs_digest(file_digest(path), settings)
+        return self._keys[path]
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def entry(self, path):
+        """Cached variants of an image, or None if it hasn't been encoded"""
+        if path not in self._entries:
+            entry = None
+            try:
+                with open(self._entry_path(self._key(path)), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if entry is not None and entry.get('version') != VARIANT_VERSION:
+                entry = None
+            self._entries[path] = entry
+        return self._entries[path]
+
+    def digest(self):
+        """Changes whenever a spec image or its encoded variants change"""
+        state = [[os.path.relpath(path, self.root), self._key(path), self.entry(path) is not None]
+                 for path in self.sources()]
+        return inputs_digest({'spec': [self.spec.sources, self.spec.output_dir, self.spec.sizes], 'images': state})
+
+    def build(self, force=False):
+        """Encode images whose variants aren't cached, then publish; returns [(image, error)]"""
+        sources = self.sources()
+        pending = []
+        for path in sources:
+            if Image is None:
+                # Already-encoded variants are still published
+                print("⚠️  Pillow isn't installed; only cached image variants are used (pip install pillow)")
+                break
+            if force or self.entry(path) is None:
+                key = self._key(path)
+                prefix = f"{_SLUG.sub('-', os.path.splitext(os.path.basename(path))[0].lower()).strip('-')}-{key[:10]}"
+                pending.append((path, key, prefix))
+
+        failures = []
+        if pending:
+            print(f"🖼️  Encoding {len(pending)} image(s)...")
+            os.makedirs(self.files_dir, exist_ok=True)
+            tasks = [(path, self.files_dir, prefix, tuple(self.spec.widths)) for path, _, prefix in pending]
+            for (path, key, _), outcome in zip(pending, run_parallel(encode_variants, tasks, self.jobs)):
+                if outcome.ok:
+                    write_if_changed(self._entry_path(key), json.dumps(outcome.result))
+                    self._entries[path] = outcome.result
+                else:
+                    failures.append((os.path.relpath(path, self.root), outcome.error))
+
+        written = self._publish(sources)
+        if written:
+            print(f"🖼️  Wrote {written} image variant(s) to {os.path.relpath(self.output_dir, self.root)}")
+        self._prune()
+        for name, error in failures:
+            print(f"❌ Error encoding {name}: {(error.splitlines() or [''])[0]}")
+        return failures
+
+    def _publish(self, sources):
+        """Copy current variants into the output directory and drop stale ones"""
+        current = set()
+        written = 0
+        for path in sources:
+            entry = self.entry(path)
+            for name, *_ in (entry or {}).get('variants', ()):
+                current.add(name)
+                with open(os.path.join(self.files_dir, name), 'rb') as f:
+                    written += write_if_changed(os.path.join(self.output_dir, name), f.read())
+        if os.path.isdir(self.output_dir):
+            for name in os.listdir(self.output_dir):
+                if name not in current:
+                    os.unlink(os.path.join(self.output_dir, name))
+        return written
+
+    def _prune(self, limit=MAX_CACHED):
+        entries = glob.glob(os.path.join(self.cache_dir, '*.json'))
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[limit:]:
+            os.unlink(path)
+        referenced = set()
+        for path in entries[:limit]:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    referenced.update(v[0] for v in json.load(f)['variants'])
+            except (OSError, ValueError, KeyError):
+                continue
+        if os.path.isdir(self.files_dir):
+            for name in os.listdir(self.files_dir):
+                if name not in referenced:
+                    os.unlink(os.path.join(self.files_dir, name))
+
+    def _resolve(self, src, page_dir, source_dir):
+        """Local file an <img src> points at, or None"""
+        src = unquote(src.split('#')[0].split('?')[0])
+        if src.startswith('/'):
+            # Site-absolute: served from the Next.js public/ directory
+            candidates = [os.path.join(self.root, 'public', src.lstrip('/'))]
+        else:
+            candidates = [os.path.join(d, src) for d in (source_dir, page_dir, self.root)]
+        for path in candidates:
+            if os.path.isfile(path):
+                return os.path.abspath(path)
+        return None
+
+    def _url(self, name, page_dir):
+        return quote(os.path.relpath(os.path.join(self.output_dir, name), page_dir).replace(os.sep, '/'))
+
+    def _markup(self, tag, page_dir, source_dir):
+        attrs = dict(_ATTR.findall(tag))
+        src = attrs.get('src')
+        if not src or 'srcset' in attrs or _REMOTE.match(src):
+            return tag
+        attrs.setdefault('loading', 'lazy')
+        attrs.setdefault('decoding', 'async')
+        path = self._resolve(src, page_dir, source_dir)
+        entry = self.entry(path) if path else None
+        if entry is None:
+            if path is None:
+                return _img(attrs)
+            if not src.startswith('/'):
+                # Sources may reference images relative to the markdown file
+                attrs['src'] = quote(os.path.relpath(path, page_dir).replace(os.sep, '/'))
+            size = image_size(path)
+            if size and 'width' not in attrs:
+                attrs['width'], attrs['height'] = size
+            return _img(attrs)
+
+        by_format = {}
+        for name, width, _, fmt in entry['variants']:
+            by_format.setdefault(fmt, []).append((width, name))
+        fallback = [fmt for fmt in by_format if fmt != 'webp'][0]
+        attrs.update(
+            src=self._url(max(by_format[fallback])[1], page_dir),
+            srcset=', '.join(f"{self._url(name, page_dir)} {width}w" for width, name in by_format[fallback]),
+            sizes=self.spec.sizes,
+            width=entry['width'],
+            height=entry['height'],
+        )
+        sources = ''
+        if 'webp' in by_format:
+            srcset = ', '.join(f"{self._url(name, page_dir)} {width}w" for width, name in by_format['webp'])
+            sources = f'<source type="image/webp" srcset="{srcset}" sizes="{self.spec.sizes}" />'
+        return f'<picture>{sources}{_img(attrs)}</picture>'
+
+    def rewrite(self, html, page_dir, source_dir):
+        """Responsive markup for every local <img> in an HTML fragment"""
+        if '<img' not in html:
+            return html
+        return _IMG_TAG.sub(lambda m: self._markup(m.group(), page_dir, source_dir), html)
+
+
+def _img(attrs):
+    order = ['src', 'srcset', 'sizes', 'alt', 'title', 'width', 'height', 'loading', 'decoding']
+    names = [n for n in order if n in attrs] + [n for n in attrs if n not in order]
+    return '<img ' + ' '.join(f'{name}="{attrs[name]}"' for name in names) + ' />'
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Vectorized Beacon Index insight engine (BEACON_INDEX_INSIGHT_ENGINE_SPEC.md).
+
+Domain scores for every team and reporting period are held in one
+(teams, periods, domains) float array. Each rule is one comparison over the
+whole array: domain thresholds (E1, E2, W1, P1, L1, C1), propagation
+pathways (PW1-PW4), trend escalation (TR1, three or more consecutive
+declines) and the primary pressure source. So a portfolio with years of
+history is scored in a single pass, with no per-team Python loop. Missing
+cells are NaN; NaN fails every comparison, so gaps never raise a signal.
+
+The results become per-team signal codes and composite bands, and
+insight_markdown() turns them into the sections the marketing card
+renderer (generate-marketing-html.py) displays.
+
+Needs NumPy (pip install numpy).
+"""
+
+import csv
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+DOMAINS = ('experience', 'workload', 'safety', 'leadership', 'clarity')
+DOMAIN_LABELS = ('Experience', 'Workload & Resourcing', 'Psychological Safety', 'Leadership & Support',
+                 'Clarity & Direction')
+# Other names the same columns go by in exports and survey payloads
+DOMAIN_ALIASES = {'sentiment': 'experience', 'psychological_safety': 'safety', 'resourcing': 'workload'}
+E, W, P, L, C = range(len(DOMAINS))
+# Composite weights, as in calculateWellbeingPercent (src/components/dashboard/scoreTheme.ts)
+DOMAIN_WEIGHTS = (0.25, 0.25, 0.2, 0.2, 0.1)
+
+# Composite bands, lowest first; a score belongs to the last band whose floor it reaches
+BAND_FLOORS = (0, 40, 60, 70, 80)
+BANDS = ('Critical Risk', 'Elevated Risk', 'Emerging Strain', 'Within Tolerance', 'Low Exposure')
+NO_BAND = -1
+
+# Consecutive period-over-period declines that count as escalation (riskConfig.ts)
+CONSECUTIVE_DECLINES = 3
+PRESSURE_THRESHOLD = 60
+
+
+@dataclass(frozen=True)
+class Rule:
+    code: str
+    signal: str
+    implication: str
+    focus: str
+
+
+# Bit order of Insights.signals; the first domain rule a team raises is its primary signal
+RULES = (
+    Rule('E1', "Workforce strain is critically elevated.",
+         "Sustained strain is associated with burnout risk, withdrawal behaviours, and declining psychological safety.",
+         "Identify the most significant operational pressure points affecting teams and reduce structural workload "
+         "or coordination pressure."),
+    Rule('E2', "System strain is emerging.",
+         "Sustained pressure may begin to reduce psychological safety and discretionary effort.",
+         "Identify early operational pressures and intervene before escalation."),
+    Rule('W1', "Operational demand may be exceeding available capacity.",
+         "Demand-capacity imbalance typically leads to fatigue accumulation, error risk and declining experience "
+         "scores.",
+         "Rebalance workload and available resources by removing non-essential tasks or adjusting timelines."),
+    Rule('P1', "Interpersonal risk climate is deteriorating.",
+         "Low psychological safety reduces early problem detection and increases escalation risk.",
+         "Reinforce open communication signals and reward early issue escalation."),
+    Rule('L1', "Leadership support capacity may be insufficient for current operating pressure.",
+         "Low support amplifies workload stress and reduces psychological safety.",
+         "Increase leadership visibility, decision clarity and support availability."),
+    Rule('C1', "Role clarity or organisational alignment may be weakening.",
+         "Low clarity creates duplicated work, decision delays and hidden workload pressure.",
+         "Clarify priorities, decision ownership and organisational direction."),
+    Rule('PW1', "Operational demand may be exceeding workforce capacity and driving declining experience.",
+         "Operational overload reduces workforce recovery capacity.", ""),
+    Rule('PW2', "Coordination misalignment may be generating unnecessary workload pressure.",
+         "Poor organisational clarity creates hidden workload pressure.", ""),
+    Rule('PW3', "Leadership support conditions may be affecting the interpersonal safety climate.",
+         "Leadership conditions strongly influence interpersonal safety.", ""),
+    Rule('PW4', "Workforce pressure may be suppressing open communication.",
+         "Sustained pressure suppresses open communication.", ""),
+    Rule('TR1', "Structural pressure is intensifying and may escalate if not addressed.",
+         f"A domain has declined for {CONSECUTIVE_DECLINES} or more consecutive reporting cycles.", ""),
+)
+RULE_BITS = {rule.code: 1 << i for i, rule in enumerate(RULES)}
+DOMAIN_RULES = ('E1', 'E2', 'W1', 'P1', 'L1', 'C1')
+PATHWAYS = ('PW1', 'PW2', 'PW3', 'PW4')
+
+# Primary pressure source: (source domain, propagation risk) in the spec's order of precedence
+PROPAGATIONS = (
+    (C, 'Workload & Resourcing → Experience'),
+    (W, 'Experience → Psychological Safety'),
+    (L, 'Leadership & Support → Psychological Safety'),
+    (E, 'Experience → Psychological Safety'),
+)
+NO_SOURCE = -1
+
+
+_KEY_SEP = '\x1f'
+
+
+class ScoreError(ValueError):
+    """A score file can't be read as team × period domain scores"""
+
+
+@dataclass
+class ScoreMatrix:
+    teams: list
+    periods: list  # sorted; ISO dates, 2025-Q1 and 2025-W05 all sort correctly
+    scores: np.ndarray  # float32 (teams, periods, domains), NaN where a team has no data
+    departments: list = None  # department of each team, when the scores say
+    answers: np.ndarray = None  # int32 (teams, periods, domains) answers behind each score, when known
+
+    @classmethod
+    def from_columns(cls, teams, periods, values, departments=None, answers=None):
+        """Build from parallel team and period columns and an (n, domains) score array.
+
+        With a departments column a team is identified by department and
+        name, so 'Team A' in two departments stays two teams. answers is
+        an optional (n, domains) array of answer counts.
+        """
+        keys = teams if departments is None else [f"{d}{_KEY_SEP}{t}" for d, t in zip(departments, teams)]
+        key_names, team_ids = np.unique(np.asarray(keys, dtype=str), return_inverse=True)
+        period_names, period_ids = np.unique(np.asarray(periods, dtype=str), return_inverse=True)
+        scores = np.full((len(key_names), len(period_names), len(DOMAINS)), np.nan, dtype=np.float32)
+        if len(team_ids):
+            scores[team_ids, period_ids] = np.asarray(values, dtype=np.float32).reshape(-1, len(DOMAINS))
+        if answers is not None:
+            counts = np.zeros(scores.shape, dtype=np.int32)
+            if len(team_ids):
+                counts[team_ids, period_ids] = np.asarray(answers, dtype=np.int32).reshape(-1, len(DOMAINS))
+            answers = counts
+        if departments is None:
+            return cls(key_names.tolist(), period_names.tolist(), scores, answers=answers)
+        pairs = [key.split(_KEY_SEP, 1) for key in key_names.tolist()]
+        return cls([t for _, t in pairs], period_names.tolist(), scores, [d for d, _ in pairs], answers)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (team, period, [score per DOMAINS]) rows"""
+        columns = list(zip(*rows)) or [(), (), ()]
+        return cls.from_columns(columns[0], columns[1], columns[2])
+
+    @classmethod
+    def from_csv(cls, path):
+        """Long-form CSV: team, period and one column per domain (blank for missing).
+
+        Optional <domain>_answers columns give the answer count behind each score.
+        """
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = [DOMAIN_ALIASES.get(name.strip().lower(), name.strip().lower()) for name in next(reader, [])]
+            missing = [name for name in ('team', 'period') + DOMAINS if name not in header]
+            if missing:
+                raise ScoreError(f"{path}: missing column(s): {', '.join(missing)}")
+            rows = [row for row in reader if row]
+        try:
+            values = np.empty((len(rows), len(DOMAINS)), dtype=np.float32)
+            for d, name in enumerate(DOMAINS):
+                i = header.index(name)
+                column = [row[i] for row in rows]
+                try:
+                    values[:, d] = np.array(column, dtype=np.float32)
+                except ValueError:
+                    # Blank cells are missing scores
+                    values[:, d] = np.array([v or 'nan' for v in column], dtype=np.float32)
+            team_col, period_col = header.index('team'), header.index('period')
+            departments = None
+            if 'department' in header:
+                department_col = header.index('department')
+                departments = [row[department_col] for row in rows]
+            answers = None
+            if all(f"{name}_answers" in header for name in DOMAINS):
+                answer_cols = [header.index(f"{name}_answers") for name in DOMAINS]
+                answers = np.array([[row[i] or 0 for i in answer_cols] for row in rows], dtype=np.int32)
+            return cls.from_columns([row[team_col] for row in rows], [row[period_col] for row in rows], values,
+                                    departments, answers)
+        except (IndexError, ValueError) as e:
+            raise ScoreError(f"{path}: {e}") from None
+
+    @classmethod
+    def load(cls, path):
+        """Read a .csv score file or an .npz written by save()"""
+        if not path.endswith('.npz'):
+            return cls.from_csv(path)
+        with np.load(path, allow_pickle=False) as data:
+            departments = data['departments'].tolist() if 'departments' in data else None
+            answers = data['answers'] if 'answers' in data else None
+            return cls(data['teams'].tolist(), data['periods'].tolist(), data['scores'], departments, answers)
+
+    def save(self, path):
+        """Write an .npz that load() reads back without parsing, or a long-form .csv"""
+        if not path.endswith('.npz'):
+            return self.to_csv(path)
+        extra = {} if self.departments is None else {'departments': np.asarray(self.departments)}
+        if self.answers is not None:
+            extra['answers'] = self.answers
+        np.savez(path, teams=np.asarray(self.teams), periods=np.asarray(self.periods), scores=self.scores, **extra)
+
+    def to_csv(self, path):
+        """Long-form CSV as read by from_csv; team-periods with no scores are left out"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            prefix = () if self.departments is None else ('department',)
+            suffix = () if self.answers is None else tuple(f"{name}_answers" for name in DOMAINS)
+            writer.writerow(prefix + ('team', 'period') + DOMAINS + suffix)
+            present = ~np.isnan(self.scores).all(axis=2)
+            for t, p in zip(*np.nonzero(present)):
+                names = (self.teams[t],) if self.departments is None else (self.departments[t], self.teams[t])
+                counts = () if self.answers is None else tuple(self.answers[t, p].tolist())
+                writer.writerow(names + (self.periods[p],)
+                                + tuple('' if s != s else f"{s:.2f}" for s in self.scores[t, p].tolist()) + counts)
+
+    def subset(self, teams):
+        """The rows of the given team indices"""
+        departments = None if self.departments is None else [self.departments[t] for t in teams]
+        answers = None if self.answers is None else self.answers[teams]
+        return ScoreMatrix([self.teams[t] for t in teams], self.periods, self.scores[teams], departments, answers)
+
+    def rollup(self):
+        """Department × period matrix: per period, each department's answer-weighted mean score.
+
+        This is the mean of every answer in the department, as RollupIndex
+        and the dashboard compute it. Without answer counts each team's
+        score counts once.
+        """
+        if self.departments is None:
+            raise ScoreError("scores have no department column to roll up")
+        names, group = np.unique(np.asarray(self.departments, dtype=str), return_inverse=True)
+        present = ~np.isnan(self.scores)
+        weights = present.astype(np.int32) if self.answers is None else np.where(present, self.answers, 0)
+        sums = np.zeros((len(names),) + self.scores.shape[1:], dtype=np.float64)
+        counts = np.zeros(sums.shape, dtype=np.int32)
+        np.add.at(sums, group, np.where(present, self.scores, 0) * weights)
+        np.add.at(counts, group, weights)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = (sums / counts).astype(np.float32)
+        return ScoreMatrix(names.tolist(), self.periods, scores, answers=None if self.answers is None else counts)
+
+
+def display_score(score):
+    """Score to one decimal, truncated so it never reads as the next band up (59.96 is not 60.0)"""
+    return math.floor(float(score) * 10) / 10
+
+
+def band_index(scores):
+    """Index into BANDS for each score (NO_BAND where the score is NaN)"""
+    bands = np.searchsorted(np.asarray(BAND_FLOORS[1:]), scores, side='right').astype(np.int8)
+    bands[np.isnan(scores)] = NO_BAND
+    return bands
+
+
+def _decline_streaks(scores):
+    """Consecutive period-over-period declines ending at each period, per domain"""
+    teams, periods, domains = scores.shape
+    declined = np.zeros(scores.shape, dtype=bool)
+    np.less(scores[:, 1:], scores[:, :-1], out=declined[:, 1:])
+    # Position of the latest period that *didn't* decline; the streak is the distance to it
+    position = np.arange(periods, dtype=np.int32)[None, :, None]
+    reset = np.where(declined, 0, position)
+    np.maximum.accumulate(reset, axis=1, out=reset)
+    return position - reset
+
+
+@dataclass
+class Insights:
+    matrix: ScoreMatrix
+    composite: np.ndarray    # (teams, periods) weighted mean of the domains present
+    bands: np.ndarray        # (teams, periods) index into BANDS or NO_BAND
+    signals: np.ndarray      # (teams, periods) RULE_BITS mask
+    source: np.ndarray       # (teams, periods) DOMAINS index of the primary pressure source, or NO_SOURCE
+    propagation: np.ndarray  # (teams, periods) PROPAGATIONS index, or NO_SOURCE
+    streaks: np.ndarray      # (teams, periods, domains) consecutive declines
+
+    def codes(self, team, period):
+        """Signal codes raised for one team and period, in RULES order"""
+        mask = int(self.signals[team, period])
+        return [rule.code for rule in RULES if mask & RULE_BITS[rule.code]]
+
+    def latest_periods(self):
+        """Index of each team's most recent period with data (-1 if it has none)"""
+        present = ~np.isnan(self.composite)
+        last = self.composite.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+        return np.where(present.any(axis=1), last, -1)
+
+    def subset(self, teams):
+        """Insights for the given team indices only (what a report worker needs)"""
+        return Insights(self.matrix.subset(teams), self.composite[teams], self.bands[teams], self.signals[teams],
+                        self.source[teams], self.propagation[teams], self.streaks[teams])
+
+    def rows(self, all_periods=False):
+        """One dict per team (its latest period) or per team and period with data"""
+        teams, periods, departments = self.matrix.teams, self.matrix.periods, self.matrix.departments
+        if all_periods:
+            cells = zip(*np.nonzero(~np.isnan(self.composite)))
+        else:
+            latest = self.latest_periods()
+            cells = ((t, p) for t, p in enumerate(latest) if p >= 0)
+        for t, p in cells:
+            source = int(self.source[t, p])
+            propagation = int(self.propagation[t, p])
+            row = {
+                'team': teams[t],
+                'period': periods[p],
+                'composite': display_score(self.composite[t, p]),
+                'band': BANDS[self.bands[t, p]],
+                'signals': self.codes(t, p),
+                'pressure_source': DOMAIN_LABELS[source] if source != NO_SOURCE else '',
+                'propagation': PROPAGATIONS[propagation][1] if propagation != NO_SOURCE else '',
+            }
+            if departments is not None:
+                row = {'department': departments[t], **row}
+            yield row
+
+
+def evaluate(matrix):
+    """Evaluate every rule, pathway and band over the whole score matrix"""
+    scores = matrix.scores
+    e, w, p, l, c = (scores[..., i] for i in range(len(DOMAINS)))
+    with np.errstate(invalid='ignore'):
+        # Weighted mean of the domains present, so one skipped question doesn't drop the cell
+        weights = np.asarray(DOMAIN_WEIGHTS, dtype=np.float32)
+        composite = np.nansum(scores * weights, axis=-1) / ((~np.isnan(scores)) * weights).sum(axis=-1)
+        streaks = _decline_streaks(scores)
+        masks = {
+            'E1': e < 40,
+            'E2': (e >= 40) & (e < 60),
+            'W1': w < 50,
+            'P1': p < 60,
+            'L1': l < 60,
+            'C1': c < 60,
+            'PW1': (w < 55) & (e < 50),
+            'PW2': (c < 60) & (w < 60),
+            'PW3': (l < 60) & (p < 65),
+            'PW4': (e < 50) & (p < 60),
+            'TR1': (streaks >= CONSECUTIVE_DECLINES).any(axis=-1),
+        }
+        signals = np.zeros(composite.shape, dtype=np.uint16)
+        for code, mask in masks.items():
+            signals[mask] |= RULE_BITS[code]
+
+        # Primary pressure source: only where some domain is below 60, upstream domain first
+        lowest = np.where(np.isnan(scores), np.inf, scores).argmin(axis=-1).astype(np.int8)
+        pressured = (scores < PRESSURE_THRESHOLD).any(axis=-1)
+        conditions = [(c < w) & (w < e), (w < e) & (e < p), l < p, e < p]
+        propagation = np.select(conditions, list(range(len(PROPAGATIONS))), NO_SOURCE).astype(np.int8)
+        source_of = np.asarray([domain for domain, _ in PROPAGATIONS], dtype=np.int8)
+        source = np.where(propagation != NO_SOURCE, source_of[propagation], lowest)
+        source = np.where(pressured, source, NO_SOURCE).astype(np.int8)
+        propagation = np.where(pressured, propagation, NO_SOURCE).astype(np.int8)
+
+    return Insights(matrix, composite, band_index(composite), signals, source, propagation, streaks)
+
+
+def portfolio_summary(insights, periods=None):
+    """Band counts and per-code team counts at each team's latest period"""
+    latest = insights.latest_periods() if periods is None else periods
+    teams = np.nonzero(latest >= 0)[0]
+    bands = insights.bands[teams, latest[teams]]
+    signals = insights.signals[teams, latest[teams]]
+    return {
+        'teams': int(len(teams)),
+        'bands': {band: int(np.count_nonzero(bands == i)) for i, band in enumerate(BANDS)},
+        'signals': {rule.code: int(np.count_nonzero(signals & RULE_BITS[rule.code])) for rule in RULES},
+    }
+
+
+def team_markdown(insights, t, p, heading=True):
+    """Markdown lines of one team's insight section for period p"""
+    matrix = insights.matrix
+    codes = insights.codes(t, p)
+    lines = []
+    if heading:
+        scores = matrix.scores[t, p]
+        composite = display_score(insights.composite[t, p])
+        lines += [f"### {matrix.teams[t]}: {composite:.1f} ({BANDS[insights.bands[t, p]]})", '']
+        lines.append(' | '.join(f"{label} {score:.0f}" for label, score in zip(DOMAIN_LABELS, scores)
+                                if not np.isnan(score)) + f" ({matrix.periods[p]})")
+        lines.append('')
+
+    domain_rules = [r for r in RULES if r.code in codes and r.code in DOMAIN_RULES]
+    if domain_rules:
+        lines += [f"**Primary Signal**: {domain_rules[0].signal}", '',
+                  f"**Structural Implication**: {domain_rules[0].implication}", '']
+    elif 'TR1' in codes:
+        lines += [f"**Primary Signal**: {RULES[-1].signal}", '']
+    else:
+        lines += ["**Primary Signal**: No domain is below its intervention threshold.", '']
+
+    source = int(insights.source[t, p])
+    if source != NO_SOURCE:
+        propagation = int(insights.propagation[t, p])
+        risk = f" Propagation risk: {PROPAGATIONS[propagation][1]}." if propagation != NO_SOURCE else ''
+        lines += [f"**Pressure Source**: {DOMAIN_LABELS[source]}.{risk}", '']
+    pathways = [r.signal for r in RULES if r.code in codes and r.code in PATHWAYS]
+    if pathways:
+        lines += [f"**System Propagation**: {' '.join(pathways)}", '']
+    if 'TR1' in codes:
+        streaks = insights.streaks[t, p]
+        declining = [f"{DOMAIN_LABELS[d]} ({streaks[d]} cycles)" for d in np.nonzero(streaks >= CONSECUTIVE_DECLINES)[0]]
+        lines += [f"**Trend Escalation**: Consecutive declines in {', '.join(declining)}.", '']
+    if domain_rules:
+        lines.append('**Leadership Focus**:')
+        lines += [f"- {rule.focus}" for rule in domain_rules]
+        lines.append('')
+    return lines
+
+
+def insight_markdown(insights, top=25, title='Beacon Index Insights'):
+    """Markdown report: portfolio overview plus insight sections for the lowest-scoring teams"""
+    latest = insights.latest_periods()
+    summary = portfolio_summary(insights, latest)
+    lines = [f"# {title}", '', '## Portfolio Overview', '',
+             f"{summary['teams']} team(s) scored at their most recent reporting period.", '',
+             '| Band | Teams |', '|------|------:|']
+    lines += [f"| {band} | {count} |" for band, count in reversed(summary['bands'].items())]
+    lines += ['', '| Signal | Teams | Meaning |', '|--------|------:|---------|']
+    lines += [f"| {rule.code} | {summary['signals'][rule.code]} | {rule.signal} |"
+              for rule in RULES if summary['signals'][rule.code]]
+    lines.append('')
+
+    teams = np.nonzero(latest >= 0)[0]
+    composite = insights.composite[teams, latest[teams]]
+    attention = teams[np.argsort(composite, kind='stable')]
+    attention = [t for t in attention if insights.signals[t, latest[t]]][:top]
+    lines += ['## Teams Requiring Attention', '']
+    if not attention:
+        lines += ['No team has an active signal.', '']
+    for t in attention:
+        lines += team_markdown(insights, t, latest[t])
+    return '\n'.join(lines)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Reference library assembler.
+
+Each document in a library is rendered by pandoc to an HTML fragment once
+per content change and kept in .build-cache/library/. The page shell, TOC
+and fragments are then streamed into the library file. Ids that clash
+between fragments get pandoc's -1, -2 suffixes at assembly time, so
+fragments stay independent and fixing a typo re-renders just one document.
+
+Libraries with search get the doc pages' search box with an index of their
+own documents inline, since a library is opened from disk and can't fetch
+the doc pages' shards. Their documents are also indexed into those shards.
+Both indexes are read from the assembled page, so results link to the ids
+the library actually uses.
+"""
+
+import html
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from build_cache import CACHE_DIRNAME, inputs_digest, write_if_changed
+from build_trace import span
+from marketing_markdown import H1, H2, H3, H4, H5, H6, ITEM, PARA, TABLE_ROW
+from page_template import TEMPLATE_DIR
+from pandoc_runner import DEFAULT_ARGS, PandocJob, run_pandoc_jobs
+from search_index import CLIENT_SCRIPT, SEARCH_BOX, SearchIndex, search_style
+
+LIBRARY_DIRNAME = 'library'
+INCLUDE_DIR = os.path.join(TEMPLATE_DIR, LIBRARY_DIRNAME)
+FRAGMENT_VERSION = 1
+# Cached fragments and shells kept across runs (oldest are pruned first)
+MAX_CACHED = 256
+
+BODY_MARKER = '<!-- beacon-library-body -->'
+_ID_ATTR = re.compile(r'(\bid="|\bhref="#)([^"]+)"')
+_ID_ONLY = re.compile(r'\bid="([^"]+)"')
+_HEADING = re.compile(r'<h([1-6]) id="([^"]+)"[^>]*>(.*?)</h\1>', re.DOTALL)
+_LINK_TAG = re.compile(r'</?a\b[^>]*>')
+_SPACE = re.compile(r'\s+')
+# Blocks the search index reads back from an assembled library
+_SEARCH_BLOCK = re.compile(r'<(h[1-6]|p|li|t[hd])\b([^>]*)>(.*?)</\1>', re.DOTALL)
+_SEARCH_KINDS = {'h1': H1, 'h2': H2, 'h3': H3, 'h4': H4, 'h5': H5, 'h6': H6,
+                 'p': PARA, 'li': ITEM, 'th': TABLE_ROW, 'td': TABLE_ROW}
+_SEARCH_SKIP = re.compile(
+    r'<nav id="TOC".*?</nav>|<header id="title-block-header">.*?</header>|<(script|style)\b.*?</\1>', re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_BODY_OPEN = re.compile(r'<body\b[^>]*>\n?')
+
+@dataclass(frozen=True)
+class LibrarySpec:
+    name: str
+    output: str
+    title: str
+    sections: list
+    metadata: dict = field(default_factory=dict)
+    stylesheets: list = field(default_factory=list)
+    header_include: str = None
+    toc_depth: int = 2
+    search: bool = True
+
+    def section_paths(self, root):
+        """Absolute paths of the library's sections, in order"""
+        paths = []
+        for section in self.sections:
+            if 'include' in section:
+                paths.append(os.path.join(INCLUDE_DIR, section['include']))
+            else:
+                paths.append(os.path.join(root, section['source']))
+        return paths
+
+    def shell_args(self):
+        args = DEFAULT_ARGS + ['--standalone', '--metadata', f'title={self.title}']
+        for name, value in self.metadata.items():
+            args += ['--metadata', f'{name}={value}']
+        for href in self.stylesheets:
+            args.append(f'--css={href}')
+        if self.header_include:
+            args.append(f'--include-in-header={os.path.join(INCLUDE_DIR, self.header_include)}')
+        return args
+
+
+class FragmentCache:
+    """Rendered HTML fragments (and page shells) keyed by content digest"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(self._path(key))
+        return entry
+
+    def put(self, key, entry):
+        write_if_changed(self._path(key), json.dumps(entry, ensure_ascii=False))
+
+    def prune(self, limit=MAX_CACHED):
+        try:
+            entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+        except OSError:
+            return
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[limit:]:
+            os.unlink(path)
+
+
+def fragment_entry(html):
+    """Cacheable fragment: its HTML plus the ids and headings assembly needs"""
+    return {
+        'version': FRAGMENT_VERSION,
+        'html': html,
+        'ids': _ID_ONLY.findall(html),
+        'headings': [
+            [int(level), anchor, _SPACE.sub(' ', _LINK_TAG.sub('', text)).strip()]
+            for level, anchor, text in _HEADING.findall(html)
+        ],
+    }
+
+
+def with_search(head):
+    """A page shell's head with the search box at the top of the body"""
+    return _BODY_OPEN.sub(lambda m: m.group(0) + search_style() + SEARCH_BOX, head, count=1)
+
+
+def search_tail(spec, page):
+    """Inline index of an assembled library page and the client script, to go before the shell's tail"""
+    index = SearchIndex()
+    for title, anchor, blocks, ids in search_documents(page):
+        index.add_page('', title or spec.title, blocks, anchor, ids)
+    with open(CLIENT_SCRIPT, 'r', encoding='utf-8') as f:
+        script = f.read()
+    return index.inline_script() + f'<script>\n{script}</script>\n'
+
+
+def search_documents(page):
+    """Yield (title, anchor, [(kind, text)], heading ids) per document of an assembled library.
+
+    A document starts at each top-level heading; anything before the first
+    one (the cover) has no title or anchor.
+    """
+    title, anchor, blocks, ids = None, '', [], []
+    for tag, attrs, inner in _SEARCH_BLOCK.findall(_SEARCH_SKIP.sub('', page)):
+        text = _SPACE.sub(' ', html.unescape(_TAG.sub('', inner))).strip()
+        found = _ID_ONLY.search(attrs)
+        if tag == 'h1' and found:
+            if blocks or title is not None:
+                yield title, anchor, blocks, ids
+            title, anchor, blocks, ids = text, found.group(1), [], []
+            continue
+        if tag[0] == 'h':
+            # Every heading is kept, empty or not, so the ids stay in step
+            ids.append(found.group(1) if found else '')
+            blocks.append((_SEARCH_KINDS[tag], text))
+        elif text:
+            blocks.append((_SEARCH_KINDS[tag], text))
+    if blocks or title is not None:
+        yield title, anchor, blocks, ids
+
+
+def _unique(anchor, used):
+    candidate, n = anchor, 0
+    while candidate in used:
+        n += 1
+        candidate = f"{anchor}-{n}"
+    return candidate
+
+
+def render_toc(headings):
+    """Pandoc-style nested TOC for [(level, id, text)]"""
+    out = ['<nav id="TOC" role="doc-toc">']
+    levels = []
+    for level, anchor, text in headings:
+        if not levels or level > levels[-1]:
+            out.append('<ul>')
+            levels.append(level)
+        else:
+            out.append('</li>')
+            while len(levels) > 1 and level < levels[-1]:
+                levels.pop()
+                out.append('</ul></li>')
+        out.append(f'<li><a href="#{anchor}" id="toc-{anchor}">{text}</a>')
+    if levels:
+        out.append('</li>')
+        while levels:
+            levels.pop()
+            out.append('</ul></li>' if levels else '</ul>')
+    out.append('</nav>')
+    return '\n'.join(out) + '\n'
+
+
+def assemble(shell, fragments, toc_depth):
+    """Yield the library page: shell head, TOC, fragments with ids deduplicated, shell tail"""
+    head, tail = shell
+    used = set()
+    bodies = []
+    headings = []
+    for entry in fragments:
+        html = entry['html']
+        renames = {}
+        for anchor in entry['ids']:
+            unique = _unique(anchor, used)
+            used.add(unique)
+            if unique != anchor:
+                renames[anchor] = unique
+        if renames:
+            # Only fragments that clash with an earlier one are rewritten
+            html = _ID_ATTR.sub(lambda m: f'{m.group(1)}{renames.get(m.group(2), m.group(2))}"', html)
+        bodies.append(html)
+        headings.extend(
+            (level, renames.get(anchor, anchor), text)
+            for level, anchor, text in entry['headings'] if level <= toc_depth
+        )
+    yield head
+    if headings:
+        yield render_toc(headings)
+    for html in bodies:
+        yield html
+    yield tail
+
+
+class LibraryBuilder:
+    """Builds LibrarySpecs, rendering only fragments whose sources changed"""
+
+    def __init__(self, root, jobs=None, pandoc_options=None):
+        self.root = root
+        self.jobs = jobs
+        self.pandoc_options = pandoc_options or {}
+        self.cache = FragmentCache(os.path.join(root, CACHE_DIRNAME, LIBRARY_DIRNAME))
+
+    def _shell(self, spec):
+        """(head, tail) of the standalone page, from pandoc's own template"""
+        args = spec.shell_args()
+        include = ''
+        if spec.header_include:
+            with open(os.path.join(INCLUDE_DIR, spec.header_include), 'r', encoding='utf-8') as f:
+                include = f.read()
+        key = inputs_digest('shell', {'args': args}, include)
+        entry = self.cache.get(key)
+        if entry is None:
+            options = dict(self.pandoc_options, batch_size=1)
+            result = run_pandoc_jobs([PandocJob('shell', None, BODY_MARKER + '\n')], args=args, **options)['shell']
+            if not result.ok:
+                raise RuntimeError(f"pandoc failed on the page shell: {result.error}")
+            head, marker, tail = result.html.partition(BODY_MARKER)
+            if not marker:
+                raise RuntimeError("pandoc dropped the body marker from the page shell")
+            entry = {'head': head, 'tail': tail.lstrip('\n')}
+            self.cache.put(key, entry)
+        return entry['head'], entry['tail']
+
+    def _fragments(self, paths, force):
+        """Return ({path: entry}, failures), calling pandoc only for cache misses"""
+        entries = {}
+        keys = {}
+        misses = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            keys[path] = key = inputs_digest('fragment', {'args': DEFAULT_ARGS, 'version': FRAGMENT_VERSION}, text)
+            entry = None if force else self.cache.get(key)
+            if entry is None:
+                misses.append(PandocJob(path, path, text))
+            else:
+                entries[path] = entry
+
+        failures = []
+        if misses:
+            print(f"  Rendering {len(misses)} of {len(paths)} section(s)...")
+            results = run_pandoc_jobs(misses, args=DEFAULT_ARGS, concurrency=self.jobs, **self.pandoc_options)
+            for job in misses:
+                result = results[job.key]
+                if result.ok:
+                    entries[job.path] = fragment_entry(result.html)
+                    self.cache.put(keys[job.path], entries[job.path])
+                else:
+                    failures.append((os.path.relpath(job.path, self.root), result.error))
+        return entries, failures
+
+    def build(self, specs, force=False):
+        """Build every library; returns [(output, error)] for failures"""
+        all_paths = {}
+        for spec in specs:
+            for path in spec.section_paths(self.root):
+                if os.path.exists(path):
+                    all_paths[path] = True
+                else:
+                    print(f"⚠️  {spec.name}: skipping {os.path.relpath(path, self.root)} (not found)")
+
+        # Fragments are shared, so a document in several libraries renders once
+        entries, failures = self._fragments(list(all_paths), force)
+        for spec in specs:
+            output_path = os.path.join(self.root, spec.output)
+            paths = [p for p in spec.section_paths(self.root) if p in all_paths]
+            missing = [os.path.relpath(p, self.root) for p in paths if p not in entries]
+            if missing:
+                failures.append((spec.output, f"{len(missing)} section(s) failed to render"))
+                continue
+            try:
+                shell = self._shell(spec)
+            except RuntimeError as e:
+                failures.append((spec.output, str(e)))
+                continue
+            with span('assemble', doc=spec.output):
+                if spec.search:
+                    head, tail = shell
+                    page = ''.join(assemble((with_search(head), ''), (entries[p] for p in paths), spec.toc_depth))
+                    chunks = [page, search_tail(spec, page), tail]
+                else:
+                    chunks = assemble(shell, (entries[p] for p in paths), spec.toc_depth)
+                changed = write_if_changed(output_path, chunks)
+            print(f"✅ Created {spec.output}" if changed else f"✅ {spec.output} unchanged")
+
+        self.cache.prune()
+        return failures
+
+    def index(self, spec, search, url):
+        """Add the built library's documents to a SearchIndex as pages at url; False if it isn't built"""
+        try:
+            with open(os.path.join(self.root, spec.output), 'r', encoding='utf-8') as f:
+                page = f.read()
+        except OSError:
+            return False
+        for title, anchor, blocks, ids in search_documents(page):
+            search.add_page(url, title or spec.title, blocks, anchor, ids)
+        return True
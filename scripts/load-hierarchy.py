@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Bulk-load a client's hierarchy CSV (divisions, departments, teams, employees).
+
+The file is streamed and validated in one pass. It comes out as batched
+multi-row INSERTs, psql COPY blocks, or rows in a local SQLite database.
+Invalid rows are reported with their line numbers and left out. Re-running
+an updated file adds new nodes and moves or renames existing employees;
+nothing is deleted.
+
+Usage:
+  python3 scripts/load-hierarchy.py clients.csv --client-id <uuid> > load.sql
+  python3 scripts/load-hierarchy.py clients.csv --client-id <uuid> --format copy -o load.sql
+  python3 scripts/load-hierarchy.py clients.csv --client-id <uuid> --sqlite /tmp/hierarchy.db
+
+Then: psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f load.sql
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from build_cache import write_stream_if_changed
+from hierarchy_loader import (DEFAULT_BATCH_SIZE, HierarchyError, HierarchyLoader, copy_chunks, load_sqlite,
+                              sql_chunks)
+
+
+def _encoded(chunks):
+    for chunk in chunks:
+        yield chunk.encode('utf-8')
+
+
+def _print_errors(stats):
+    for line, message in stats.errors:
+        print(f"❌ Line {line}: {message}", file=sys.stderr)
+    if stats.error_count > len(stats.errors):
+        print(f"   ... and {stats.error_count - len(stats.errors)} more", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv', help="hierarchy CSV (columns as in public/templates/hierarchy-template.csv)")
+    parser.add_argument('--client-id', default=os.environ.get('NEXT_PUBLIC_DASHBOARD_CLIENT_ID'),
+                        help="client UUID (default: $NEXT_PUBLIC_DASHBOARD_CLIENT_ID)")
+    parser.add_argument('--format', choices=['sql', 'copy'], default='sql',
+                        help="sql: upserts, safe to re-run (employees who moved or changed are updated); "
+                             "copy: COPY FROM stdin (fastest, first import only)")
+    parser.add_argument('-o', '--output', help="write SQL here instead of stdout")
+    parser.add_argument('--sqlite', metavar='DB', help="load into a SQLite database instead of writing SQL")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per INSERT/COPY batch")
+    parser.add_argument('--strict', action='store_true', help="write nothing if any row is invalid")
+    args = parser.parse_args()
+
+    if not args.client_id:
+        print("❌ --client-id is required (or set NEXT_PUBLIC_DASHBOARD_CLIENT_ID)", file=sys.stderr)
+        return 2
+    try:
+        loader = HierarchyLoader(args.client_id, args.batch_size)
+    except HierarchyError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        with open(args.csv, 'r', encoding='utf-8-sig', newline='') as f:
+            if args.strict:
+                # Validate the whole file before the first row is written
+                check = HierarchyLoader(args.client_id, args.batch_size)
+                for _ in check.batches(f):
+                    pass
+                if check.stats.error_count:
+                    _print_errors(check.stats)
+                    print(f"❌ {check.stats.error_count} invalid row(s); nothing written", file=sys.stderr)
+                    return 1
+                f.seek(0)
+            batches = loader.batches(f)
+            if args.sqlite:
+                load_sqlite(args.sqlite, batches)
+            else:
+                chunks = (sql_chunks if args.format == 'sql' else copy_chunks)(batches)
+                if args.output:
+                    write_stream_if_changed(args.output, _encoded(chunks))
+                else:
+                    sys.stdout.writelines(chunks)
+    except (HierarchyError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    stats = loader.stats
+    _print_errors(stats)
+    target = args.sqlite or args.output or 'stdout'
+    print(f"✅ {stats.employees} employee(s) in {stats.divisions} division(s), {stats.departments} department(s), "
+          f"{stats.teams} team(s) → {target} ({elapsed:.2f}s)", file=sys.stderr)
+    if stats.error_count:
+        print(f"⚠️  Skipped {stats.error_count} invalid row(s) of {stats.rows}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Native markdown to HTML for the doc pages.
+
+Covers the GFM subset our docs use: headings, nested bullet and numbered
+lists, GFM tables, fenced code, blockquotes, rules, links and emphasis.
+Output is either the marketing card layout or plain document HTML shaped
+like pandoc's (check-pandoc-parity.py compares the two).
+
+The block tokenizer classifies every source line exactly once and yields
+block tokens lazily; the HTML writer consumes that stream directly, so a
+document is never held as a list of its lines.
+"""
+
+import io
+import re
+from array import array
+
+# Block token kinds
+H1, H2, H3, H4, LIST_START, ITEM, LIST_END, PARA = range(8)
+(H5, H6, ORDERED_START, RULE, CODE_START, CODE_LINE, CODE_END,
+ QUOTE_START, QUOTE_END, TABLE_START, TABLE_HEAD, TABLE_ROW, TABLE_END) = range(8, 21)
+
+# One anchored match per (stripped) line decides its block kind:
+# group 1 = heading hashes, group 2 = bullet marker, group 3 = ordered number
+_BLOCK_PREFIX = re.compile(r'(#{1,6})(?:[ \t]|$)|([-*+])[ \t]|(\d+)\.')
+_HEADINGS = (None, H1, H2, H3, H4, H5, H6)
+_PREFIX_CHARS = frozenset('#-*+0123456789')
+# First characters of every line that may start or shape a block
+_BLOCK_CHARS = _PREFIX_CHARS | frozenset('_`~>|:')
+_CLOSING_HASHES = re.compile(r'(?:^|[ \t]+)#+[ \t]*$')
+_RULE = re.compile(r'(?:(?:-[ \t]*){3,}|(?:\*[ \t]*){3,}|(?:_[ \t]*){3,})$')
+_FENCE = re.compile(r'(`{3,}|~{3,})[ \t]*([^`]*)$')
+_TABLE_DELIMITER = re.compile(r'\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?$')
+_CELL_SPLIT = re.compile(r'(?<!\\)\|')
+_ALIGN_STYLES = {'-': '', 'l': ' style="text-align: left;"',
+                 'c': ' style="text-align: center;"', 'r': ' style="text-align: right;"'}
+
+# Heading identifiers follow pandoc's auto_identifiers so anchors match across renderers.
+# Code spans and escaped characters are kept as written; of the rest, link targets,
+# brackets and emphasis delimiters go, but an underscore inside a word stays.
+_SLUG_LITERAL = re.compile(r'(`+)(.+?)(?<!`)\1(?!`)|\\([!-/:-@\[-`{-~])')
+_SLUG_MARKUP = re.compile(r'\]\([^)]*\)|[*\[\]]|(?<![^\W_])_+|_+(?![^\W_])')
+_SLUG_DROP = re.compile(r'[^\w\s.-]')
+_SLUG_SPACE = re.compile(r'\s+')
+_SLUG_LEAD = re.compile(r'^[\W\d_]+')
+
+# Characters that make a line need the full inline lexer
+_INLINE_SPECIAL = re.compile(r'[`*\\\[&<>]')
+# Alternatives are tried left to right at each position, so a code span
+# always wins over emphasis inside it. Group names double as token kinds;
+# the leading lookahead lets the scanner skip prose without trying them all.
+_INLINE_TOKEN = re.compile(
+    r'(?=[`\\\[*!])(?:'
+    r'(?P<codespan>(?P<ticks>`+)(?P<code>.+?)(?<!`)(?P=ticks)(?!`))'
+    r'|\\(?P<esc>[!-/:-@\[-`{-~])'
+    r'|(?P<image>!\[(?P<alt>(?:[^\[\]\\]|\\.)*)\]\((?P<src>[^()\s]*)(?:\s+"(?P<img_title>[^"]*)")?\))'
+    r'|(?P<link>\[(?P<text>(?:[^\[\]\\]|\\.)*)\]\((?P<href>[^()\s]*)(?:\s+"(?P<title>[^"]*)")?\))'
+    r'|(?P<stars>\*+)'
+    r'|(?P<other>`+|\[|!))'
+)
+
+# Alt text is plain text, so emphasis and code markers are dropped from it
+_IMAGE_ALT_MARKUP = re.compile(r'[*`]|\\(?=[!-/:-@\[-`{-~])')
+
+
+def iter_lines(md_content):
+    """Lazily yield the lines of a markdown string"""
+    return io.StringIO(md_content)
+
+
+def _indent(raw):
+    """Leading whitespace width of a raw line (tabs count as 4)"""
+    if raw[:1] != ' ' and raw[:1] != '\t':
+        return 0
+    n = len(raw) - len(raw.lstrip(' \t'))
+    return len(raw[:n].expandtabs(4))
+
+
+def _unquote(raw):
+    """A blockquote line without its '>' and the optional space after it"""
+    line = raw.lstrip()[1:]
+    return line[1:] if line[:1] == ' ' else line
+
+
+def split_table_row(row):
+    """Cells of a GFM table row ('|' escaped as '\\|' stays in the cell)"""
+    row = row.strip()
+    if row.startswith('|'):
+        row = row[1:]
+    if row.endswith('|') and not row.endswith('\\|'):
+        row = row[:-1]
+    return [cell.strip() for cell in _CELL_SPLIT.split(row)]
+
+
+def _alignments(delimiter):
+    """'l', 'c', 'r' or '-' (default) for each column of a delimiter row"""
+    aligns = []
+    for cell in split_table_row(delimiter):
+        left, right = cell.startswith(':'), cell.endswith(':')
+        aligns.append('c' if left and right else 'r' if right else 'l' if left else '-')
+    return ''.join(aligns)
+
+
+class _BlockLexer:
+    """Line-at-a-time block state machine behind tokenize_blocks.
+
+    feed() appends finished tokens to self.tokens. Only the block in progress
+    is buffered (a paragraph, a list item, a blockquote), never the document.
+    """
+
+    def __init__(self):
+        self.tokens = []
+        self.para = []      # lines of the paragraph in progress
+        self.item = None    # lines of the list item in progress
+        self.lists = []     # open lists, innermost last: [marker indent, ordered]
+        self.blank = False  # the previous line was blank
+        self.fence = None   # (fence, indent) while inside a fenced code block
+        self.quote = None   # lines of the blockquote in progress
+        self.columns = 0    # columns of the open table, 0 outside tables
+
+    def feed(self, raw):
+        if self.fence is not None or self.quote is not None or self.columns:
+            if self._continue_block(raw):
+                return
+        line = raw.strip()
+        if not line:
+            self._flush_para()
+            # Lists stay open across blank lines; the next line decides
+            self.blank = True
+            return
+        # Most lines are prose and skip every block check below
+        if line[0] in _BLOCK_CHARS:
+            self._block_line(raw, line)
+        elif self.lists:
+            self._list_text(raw, line)
+        else:
+            self.para.append(line)
+        self.blank = False
+
+    def _continue_block(self, raw):
+        """Feed raw to the open code block, blockquote or table; False once it has ended"""
+        if self.fence is not None:
+            self._code_line(raw)
+            return True
+        line = raw.strip()
+        if self.quote is not None:
+            if line[:1] == '>':
+                self.quote.append(_unquote(raw))
+                return True
+            self._close_quote()
+        if self.columns:
+            if line and '|' in line:
+                self.tokens.append((TABLE_ROW, line))
+                return True
+            self.columns = 0
+            self.tokens.append((TABLE_END, None))
+        return False
+
+    def _block_line(self, raw, line):
+        """A line whose first character can start a block"""
+        emit = self.tokens.append
+        first = line[0]
+        m = _BLOCK_PREFIX.match(line) if first in _PREFIX_CHARS else None
+        fence = _FENCE.match(line) if first in '`~' else None
+        # A rule ends with its own character; list items almost never do
+        if first in '-*_' and line[-1] == first and _RULE.match(line):
+            self._close_blocks()
+            emit((RULE, None))
+        elif m is not None and m.group(1) is None:
+            # Bullet or numbered list item
+            rest = line[m.end():]
+            if m.group(3) is not None and not rest[:1].isspace():
+                # "1.foo" still counts as an item but keeps its number
+                rest = line
+            self._flush_para()
+            self._open_item(_indent(raw), m.group(3))
+            self.item = [rest.lstrip()]
+        elif m is not None:
+            self._close_blocks()
+            level = len(m.group(1))
+            emit((_HEADINGS[level], _CLOSING_HASHES.sub('', line[level:]).strip()))
+        elif fence is not None:
+            self._close_blocks()
+            info = fence.group(2).split()
+            emit((CODE_START, info[0].strip('{}').lstrip('.') if info else ''))
+            self.fence = (fence.group(1), _indent(raw))
+        elif first == '>':
+            self._close_blocks()
+            self.quote = [_unquote(raw)]
+        elif self.lists:
+            self._list_text(raw, line)
+        elif self.para and '|' in self.para[-1] and '-' in line and _TABLE_DELIMITER.match(line):
+            header = self.para.pop()
+            aligns = _alignments(line)
+            if len(aligns) == len(split_table_row(header)):
+                self._flush_para()
+                emit((TABLE_START, aligns))
+                emit((TABLE_HEAD, header))
+                self.columns = len(aligns)
+            else:
+                self.para += [header, line]
+        else:
+            self.para.append(line)
+
+    def _list_text(self, raw, line):
+        """A non-item line while lists are open: item continuation or the end of the lists"""
+        if self.item is not None and (not self.blank or _indent(raw) >= self.lists[-1][0] + 2):
+            self.item.append(line)
+        else:
+            self._close_blocks()
+            self.para.append(line)
+
+    def close(self):
+        """Finish every open block at the end of the input"""
+        if self.fence is not None:
+            self.fence = None
+            self.tokens.append((CODE_END, None))
+        if self.quote is not None:
+            self._close_quote()
+        if self.columns:
+            self.columns = 0
+            self.tokens.append((TABLE_END, None))
+        self._close_blocks()
+
+    def _code_line(self, raw):
+        fence, indent = self.fence
+        line = raw.rstrip('\r\n')
+        stripped = line.strip()
+        if stripped.startswith(fence) and not stripped.lstrip(fence[0]):
+            self.fence = None
+            self.tokens.append((CODE_END, None))
+            return
+        # Drop up to the fence's own indentation from each code line
+        self.tokens.append((CODE_LINE, line[min(indent, len(line) - len(line.lstrip(' '))):]))
+
+    def _close_quote(self):
+        lines, self.quote = self.quote, None
+        self.tokens.append((QUOTE_START, None))
+        self.tokens.extend(tokenize_blocks(lines))
+        self.tokens.append((QUOTE_END, None))
+
+    def _flush_para(self):
+        if self.para:
+            self.tokens.append((PARA, '\n'.join(self.para)))
+            self.para = []
+
+    def _flush_item(self):
+        if self.item is not None:
+            self.tokens.append((ITEM, '\n'.join(self.item)))
+            self.item = None
+
+    def _open_item(self, indent, number):
+        """Close, nest or continue lists so the next item sits at indent"""
+        emit = self.tokens.append
+        ordered = number is not None
+        self._flush_item()
+        lists = self.lists
+        while lists and indent < lists[-1][0]:
+            lists.pop()
+            emit((LIST_END, None))
+        if lists and indent < lists[-1][0] + 2:
+            if lists[-1][1] == ordered:
+                return
+            # Switching between bullets and numbers starts a new list
+            lists.pop()
+            emit((LIST_END, None))
+        lists.append([indent, ordered])
+        emit((ORDERED_START, number) if ordered else (LIST_START, None))
+
+    def _close_blocks(self):
+        """End the paragraph and every open list"""
+        self._flush_para()
+        self._flush_item()
+        while self.lists:
+            self.lists.pop()
+            self.tokens.append((LIST_END, None))
+
+
+def tokenize_blocks(lines):
+    """Yield (kind, text) block tokens from an iterable of markdown lines"""
+    lexer = _BlockLexer()
+    tokens = lexer.tokens
+    feed = lexer.feed
+    for raw in lines:
+        feed(raw)
+        if tokens:
+            yield from tokens
+            tokens.clear()
+    lexer.close()
+    yield from tokens
+
+
+def _slug_text(text):
+    """Heading markdown reduced to the plain text pandoc builds its id from"""
+    out, pos = [], 0
+    for m in _SLUG_LITERAL.finditer(text):
+        out.append(_SLUG_MARKUP.sub('', text[pos:m.start()]))
+        out.append(m.group(2) if m.group(3) is None else m.group(3))
+        pos = m.end()
+    out.append(_SLUG_MARKUP.sub('', text[pos:]))
+    return ''.join(out)
+
+
+class HeadingSlugs:
+    """Assigns unique pandoc-style ids to a document's headings, in order"""
+
+    def __init__(self):
+        self._seen = set()
+
+    def __call__(self, text):
+        slug = _SLUG_SPACE.sub('-', _SLUG_DROP.sub('', _slug_text(text).lower()).strip())
+        slug = _SLUG_LEAD.sub('', slug) or 'section'
+        unique, n = slug, 0
+        while unique in self._seen:
+            n += 1
+            unique = f"{slug}-{n}"
+        self._seen.add(unique)
+        return unique
+
+
+def _table_row(row, aligns, tag):
+    cells = split_table_row(row)[:len(aligns)]
+    cells += [''] * (len(aligns) - len(cells))
+    out = ['<tr>']
+    for cell, align in zip(cells, aligns):
+        # GFM unescapes '\|' before inline parsing, so it works inside code spans too
+        cell = format_inline_markdown(cell.replace('\\|', '|'))
+        out.append(f'<{tag}{_ALIGN_STYLES[align]}>{cell}</{tag}>')
+    out.append('</tr>')
+    return '\n'.join(out)
+
+
+def render_blocks(tokens, cards=True):
+    """Yield HTML fragments for a stream of block tokens.
+
+    cards=True is the marketing card layout: H1 is left to the title
+    section, H2 gets a section icon, rules are dropped and every list is a
+    bulleted <ul>. cards=False writes plain document HTML in pandoc's shape.
+    """
+    slugs = HeadingSlugs()
+    closers = []       # end tags of the open lists, innermost last
+    item = None        # list item waiting to learn whether a sublist follows
+    aligns = ''        # column alignments of the open table
+    in_body = False    # the open table has started its <tbody>
+    code = None        # current code line, written once the next one arrives
+    for kind, text in tokens:
+        if item is not None:
+            nested = kind == LIST_START or kind == ORDERED_START
+            yield f'<li>{format_inline_markdown(item)}' + ('' if nested else '</li>')
+            item = None
+        else:
+            nested = False
+
+        if kind == ITEM:
+            item = text
+        elif kind == PARA:
+            yield f'<p>{format_inline_markdown(text)}</p>'
+        elif kind == LIST_START or kind == ORDERED_START:
+            if kind == LIST_START or cards:
+                tag, open_tag = 'ul', '<ul>'
+            else:
+                tag, open_tag = 'ol', '<ol>' if text in (None, '', '1') else f'<ol start="{int(text)}">'
+            closers.append(f'</{tag}></li>' if nested else f'</{tag}>')
+            yield open_tag
+        elif kind == LIST_END:
+            yield closers.pop()
+        elif kind == H2:
+            if cards:
+                # H2 - Major section
+                icon = get_icon_for_section(text)
+                yield f'<h2 id="{slugs(text)}"><span class="material-symbols-outlined" style="font-size: 28px; color: #2B4162;">{icon}</span> {format_inline_markdown(text)}</h2>'
+            else:
+                yield f'<h2 id="{slugs(text)}">{format_inline_markdown(text)}</h2>'
+        elif kind == H3 or kind == H4 or kind == H5 or kind == H6:
+            level = _HEADINGS.index(kind)
+            yield f'<h{level} id="{slugs(text)}">{format_inline_markdown(text)}</h{level}>'
+        elif kind == H1:
+            if cards:
+                # H1 is skipped (it is already shown in the title section) but
+                # still claims its id, as pandoc does
+                slugs(text)
+            else:
+                yield f'<h1 id="{slugs(text)}">{format_inline_markdown(text)}</h1>'
+        elif kind == CODE_START:
+            language = escape_html(text or '').replace('"', '&quot;')
+            code = f'<pre><code class="language-{language}">' if language else '<pre><code>'
+            first_line = True
+        elif kind == CODE_LINE:
+            if first_line:
+                code += escape_html(text)
+                first_line = False
+            else:
+                yield code
+                code = escape_html(text)
+        elif kind == CODE_END:
+            yield code + '</code></pre>'
+            code = None
+        elif kind == TABLE_START:
+            aligns = text
+            in_body = False
+            yield '<table>'
+        elif kind == TABLE_HEAD:
+            yield '<thead>\n' + _table_row(text, aligns, 'th') + '\n</thead>'
+        elif kind == TABLE_ROW:
+            if not in_body:
+                in_body = True
+                yield '<tbody>'
+            yield _table_row(text, aligns, 'td')
+        elif kind == TABLE_END:
+            yield '</tbody>\n</table>' if in_body else '</table>'
+        elif kind == QUOTE_START:
+            yield '<blockquote>'
+        elif kind == QUOTE_END:
+            yield '</blockquote>'
+        elif kind == RULE and not cards:
+            yield '<hr />'
+
+
+class BlockTable:
+    """Compact parsed document: one byte of kind and one text slot per block"""
+
+    __slots__ = ('kinds', 'texts')
+
+    def __init__(self, kinds, texts):
+        self.kinds = kinds  # array('B') of block kinds
+        self.texts = texts  # tuple of str ('' for LIST_START / LIST_END)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.kinds, self.texts)
+
+
+def parse_blocks(lines):
+    """Parse markdown (a string or an iterable of lines) into a BlockTable"""
+    if isinstance(lines, str):
+        lines = iter_lines(lines)
+    kinds = array('B')
+    texts = []
+    for kind, text in tokenize_blocks(lines):
+        kinds.append(kind)
+        texts.append(text or '')
+    return BlockTable(kinds, tuple(texts))
+
+
+def parse_markdown_to_html(md_content, cards=True):
+    """Convert markdown content to HTML (card-based layout unless cards=False)"""
+    return '\n'.join(render_blocks(tokenize_blocks(iter_lines(md_content)), cards))
+
+
+def iter_html(lines, cards=True):
+    """Yield the HTML for an iterable of markdown lines piece by piece.
+
+    Same output as parse_markdown_to_html, but nothing is held beyond the
+    current block, so a file object can be converted in constant memory.
+    """
+    separator = ''
+    for fragment in render_blocks(tokenize_blocks(lines), cards):
+        yield separator + fragment
+        separator = '\n'
+
+
+def render_table(table, cards=True):
+    """Render a parsed BlockTable to HTML (same output as parse_markdown_to_html)"""
+    return '\n'.join(render_blocks(table, cards))
+
+
+def escape_html(text):
+    """Escape &, < and > for HTML text content"""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def format_inline_markdown(text):
+    """Format code, bold, italic, links and images in a single left-to-right scan.
+
+    Everything outside the generated tags is HTML-escaped. Emphasis follows
+    CommonMark flanking rules for '*' runs (an opener must not be followed by
+    whitespace, a closer must not follow it) and nests with a delimiter stack,
+    so "**[link](url)**" and "***both***" work and "5 * 3 * 2" stays literal.
+    """
+    if _INLINE_SPECIAL.search(text) is None:
+        # Fast path: plain prose needs no lexing or escaping
+        return text
+    # &, < and > never take part in markdown syntax, so escaping the whole
+    # line up front is equivalent to escaping every text run separately
+    return _lex_inline(escape_html(text))
+
+
+def _lex_inline(text):
+    out = []
+    append = out.append
+    openers = []  # [out index, stars left, tags opened so far]
+    pos = 0
+    for m in _INLINE_TOKEN.finditer(text):
+        start, end = m.span()
+        if start > pos:
+            append(text[pos:start])
+        pos = end
+        kind = m.lastgroup
+
+        if kind == 'stars':
+            run = end - start
+            if run > 3:
+                append(m.group())
+                continue
+            if openers and start and not text[start - 1].isspace():
+                # Close as much of the run as the open delimiters allow
+                while run and openers:
+                    opener = openers[-1]
+                    use = 2 if run >= 2 and opener[1] >= 2 else 1
+                    tag = 'strong' if use == 2 else 'em'
+                    opener[1] -= use
+                    opener[2] = f'<{tag}>' + opener[2]
+                    out[opener[0]] = '*' * opener[1] + opener[2]
+                    append(f'</{tag}>')
+                    run -= use
+                    if not opener[1]:
+                        openers.pop()
+                if not run:
+                    continue
+            append('*' * run)
+            if end < len(text) and not text[end].isspace():
+                openers.append([len(out) - 1, run, ''])
+        elif kind == 'codespan':
+            code = m.group('code')
+            if len(code) > 2 and code[0] == code[-1] == ' ' and code.strip(' '):
+                code = code[1:-1]
+            append(f'<code>{code}</code>')
+        elif kind == 'esc':
+            append(m.group('esc'))
+        elif kind == 'image':
+            src = m.group('src').replace('"', '&quot;')
+            alt = _IMAGE_ALT_MARKUP.sub('', m.group('alt')).replace('"', '&quot;')
+            title = m.group('img_title')
+            title_attr = '' if title is None else ' title="{}"'.format(title.replace('"', '&quot;'))
+            append(f'<img src="{src}" alt="{alt}"{title_attr} />')
+        elif kind == 'link':
+            href = m.group('href').replace('"', '&quot;')
+            title = m.group('title')
+            title_attr = '' if title is None else ' title="{}"'.format(title.replace('"', '&quot;'))
+            append(f'<a href="{href}"{title_attr}>{_lex_inline(m.group("text"))}</a>')
+        else:
+            # Lone backticks, '[' or '!' that didn't start a code span, link or image
+            append(m.group())
+
+    if pos < len(text):
+        append(text[pos:])
+    return ''.join(out)
+
+
+def get_icon_for_section(title):
+    """Return appropriate Material Icon for section"""
+    title_lower = title.lower()
+    if 'dashboard' in title_lower or 'overview' in title_lower:
+        return 'dashboard'
+    elif 'metric' in title_lower or 'measure' in title_lower:
+        return 'analytics'
+    elif 'insight' in title_lower or 'intelligence' in title_lower:
+        return 'lightbulb'
+    elif 'feature' in title_lower:
+        return 'star'
+    elif 'implementation' in title_lower or 'timeline' in title_lower:
+        return 'rocket_launch'
+    elif 'compliance' in title_lower or 'privacy' in title_lower:
+        return 'gavel'
+    elif 'support' in title_lower or 'help' in title_lower:
+        return 'support'
+    elif 'contact' in title_lower:
+        return 'mail'
+    elif 'question' in title_lower or 'faq' in title_lower:
+        return 'help'
+    else:
+        return 'article'
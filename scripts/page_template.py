@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Precompiled page templates for the doc generators.
+
+A template is parsed once (str.format syntax, so the existing HTML_TEMPLATE
+strings with doubled {{ }} braces work unchanged) into static UTF-8 byte
+segments and named slots. Rendering only encodes the slot values and hands
+the segment list to writelines(), so the ~10 KB of static markup is never
+re-parsed or copied into a per-page string.
+"""
+
+import html
+import os
+import string
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+_TEMPLATES = {}
+
+
+class PageTemplate:
+    """A template compiled into static byte segments and named slots"""
+
+    def __init__(self, source, raw=()):
+        """raw names the slots whose values are trusted HTML; all others are escaped"""
+        self.raw = frozenset(raw)
+        self._parts = []  # bytes for static text, str for slot names
+        pending = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if literal:
+                pending.append(literal)
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                raise ValueError(f"unsupported template field: {{{field}}}")
+            if pending:
+                self._parts.append(''.join(pending).encode('utf-8'))
+                pending = []
+            self._parts.append(field)
+        if pending:
+            self._parts.append(''.join(pending).encode('utf-8'))
+        self.slots = frozenset(p for p in self._parts if isinstance(p, str))
+        unknown = self.raw - self.slots
+        if unknown:
+            raise ValueError(f"raw slots not in template: {sorted(unknown)}")
+
+    def _encode(self, name, value):
+        if name in self.raw:
+            if isinstance(value, str):
+                yield value.encode('utf-8')
+            else:
+                # Raw slots may stream an iterable of HTML fragments
+                for fragment in value:
+                    yield fragment.encode('utf-8') if isinstance(fragment, str) else fragment
+        else:
+            yield html.escape(str(value), quote=True).encode('utf-8')
+
+    def iter_chunks(self, **values):
+        """Yield the page as a sequence of byte chunks"""
+        missing = self.slots - values.keys()
+        if missing:
+            raise KeyError(f"missing template values: {sorted(missing)}")
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+            else:
+                yield from self._encode(part, values[part])
+
+    def render_to(self, f, **values):
+        """Stream the page into a binary file object"""
+        f.writelines(self.iter_chunks(**values))
+
+    def render(self, **values):
+        return b''.join(self.iter_chunks(**values)).decode('utf-8')
+
+
+def read_template_source(name):
+    """Read scripts/templates/<name>.html"""
+    with open(os.path.join(TEMPLATE_DIR, f"{name}.html"), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def register_template(name, source, raw=()):
+    """Compile and register a named template; returns the PageTemplate"""
+    template = PageTemplate(source, raw)
+    _TEMPLATES[name] = template
+    return template
+
+
+def get_template(name):
+    try:
+        return _TEMPLATES[name]
+    except KeyError:
+        raise KeyError(f"no template registered as {name!r}") from None
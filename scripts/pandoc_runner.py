@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Concurrent pandoc execution for the doc converters.
+
+Runs pandoc through asyncio subprocesses with a concurrency limit, packs
+compatible documents into a single pandoc invocation (split back out with
+marker comments), and isolates failures: a batch that errors or times out is
+retried one document at a time, so one bad file never sinks the others.
+"""
+
+import asyncio
+import os
+import re
+import secrets
+import time
+from dataclasses import dataclass
+
+from build_trace import span
+
+DEFAULT_ARGS = ['-f', 'markdown', '-t', 'html']
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_BATCH_SIZE = 8
+
+# Anything that makes a document's HTML depend on its neighbours when
+# concatenated: footnotes, reference links, title blocks, example lists and
+# raw HTML blocks (an unclosed tag would swallow the split marker).
+_UNBATCHABLE = re.compile(
+    r'\[\^|^ {0,3}\[[^\]]+\]:\s|^%|\(@|^\s*<[A-Za-z]',
+    re.MULTILINE,
+)
+_FENCE = re.compile(r'^ {0,3}(```|~~~)', re.MULTILINE)
+_ATX_HEADING = re.compile(r'^ {0,3}#{1,6}[ \t]+(.*?)[ \t#]*$', re.MULTILINE)
+# A text line underlined with = or - (a stray match only splits a batch early)
+_SETEXT_HEADING = re.compile(r'^ {0,3}(\S.*?)[ \t]*\n {0,3}(?:=+|-+)[ \t]*$', re.MULTILINE)
+_EXPLICIT_ID = re.compile(r'\{#([^}\s]+)[^}]*\}\s*$')
+
+
+@dataclass
+class PandocJob:
+    key: str
+    path: str
+    text: str = None
+
+
+@dataclass
+class PandocResult:
+    key: str
+    html: str = None
+    error: str = None
+    elapsed: float = 0.0
+    batched: bool = False
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _heading_ids(text):
+    """Approximate pandoc auto_identifiers for every ATX and setext heading in text"""
+    ids = set()
+    headings = [m.group(1) for m in _ATX_HEADING.finditer(text)] + [m.group(1) for m in _SETEXT_HEADING.finditer(text)]
+    for heading in headings:
+        explicit = _EXPLICIT_ID.search(heading)
+        if explicit:
+            ids.add(explicit.group(1))
+            continue
+        slug = re.sub(r'[*_`\[\]()]', '', heading).lower()
+        slug = re.sub(r'[^\w\s.-]', '', slug)
+        slug = re.sub(r'\s+', '-', slug.strip())
+        ids.add(re.sub(r'^[^a-z]+', '', slug) or 'section')
+    return ids
+
+
+def is_batchable(text):
+    """True if text converts identically inside a multi-document pandoc run"""
+    if _UNBATCHABLE.search(text):
+        return False
+    return len(_FENCE.findall(text)) % 2 == 0
+
+
+def plan_batches(jobs, batch_size):
+    """Group jobs into pandoc invocations; unbatchable docs run on their own.
+
+    Documents sharing a heading identifier go to different batches, since
+    pandoc would otherwise suffix the second one's id with -1.
+    """
+    batches = []
+    open_batch, open_ids = [], set()
+    for job in jobs:
+        if batch_size <= 1 or not is_batchable(job.text):
+            batches.append([job])
+            continue
+        ids = _heading_ids(job.text)
+        if len(open_batch) >= batch_size or ids & open_ids:
+            batches.append(open_batch)
+            open_batch, open_ids = [], set()
+        open_batch.append(job)
+        open_ids |= ids
+    if open_batch:
+        batches.append(open_batch)
+    return batches
+
+
+async def _pandoc(args, source, timeout):
+    proc = await asyncio.create_subprocess_exec(
+        'pandoc', *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(source.encode('utf-8')), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise RuntimeError(err.decode('utf-8', 'replace').strip() or f"pandoc exited with {proc.returncode}")
+    return out.decode('utf-8')
+
+
+async def _convert_one(job, args, timeout, limit):
+    start = time.perf_counter()
+    async with limit:
+        try:
+            with span('pandoc', lane=True, doc=os.path.basename(job.key)):
+                html = await _pandoc(args, job.text, timeout)
+            return PandocResult(job.key, html=html, elapsed=time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            error = f"timed out after {timeout:g}s"
+        except (OSError, RuntimeError, UnicodeDecodeError) as e:
+            error = str(e)
+    return PandocResult(job.key, error=error, elapsed=time.perf_counter() - start)
+
+
+async def _convert_batch(batch, args, timeout, limit):
+    if len(batch) == 1:
+        return [await _convert_one(batch[0], args, timeout, limit)]
+
+    token = secrets.token_hex(6)
+    marker = re.compile(rf'<!-- beacon-batch-split:{token}:\d+ -->\n?')
+    source = ''.join(
+        f"{job.text}\n\n<!-- beacon-batch-split:{token}:{i} -->\n\n"
+        for i, job in enumerate(batch)
+    )
+    start = time.perf_counter()
+    async with limit:
+        try:
+            with span('pandoc batch', lane=True, documents=len(batch)):
+                html = await _pandoc(args, source, timeout * len(batch))
+        except (asyncio.TimeoutError, OSError, RuntimeError, UnicodeDecodeError):
+            html = None
+    pieces = marker.split(html) if html is not None else []
+    # One trailing piece follows the last marker and should be empty
+    if len(pieces) != len(batch) + 1 or pieces[-1].strip():
+        results = await asyncio.gather(*(_convert_one(job, args, timeout, limit) for job in batch))
+        return list(results)
+
+    share = (time.perf_counter() - start) / len(batch)
+    return [
+        PandocResult(job.key, html=piece, elapsed=share, batched=True)
+        for job, piece in zip(batch, pieces)
+    ]
+
+
+async def convert_all(jobs, args=DEFAULT_ARGS, concurrency=None,
+                      timeout=DEFAULT_TIMEOUT, batch_size=DEFAULT_BATCH_SIZE):
+    """Convert every job, returning {key: PandocResult} in job order"""
+    by_key = {}
+    readable = []
+    for job in jobs:
+        if job.text is None:
+            try:
+                with open(job.path, 'r', encoding='utf-8') as f:
+                    job.text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                by_key[job.key] = PandocResult(job.key, error=str(e))
+                continue
+        readable.append(job)
+
+    limit = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+    batches = plan_batches(readable, batch_size)
+    grouped = await asyncio.gather(
+        *(_convert_batch(batch, args, timeout, limit) for batch in batches)
+    )
+    by_key.update((result.key, result) for results in grouped for result in results)
+    return {job.key: by_key[job.key] for job in jobs}
+
+
+def run_pandoc_jobs(jobs, **options):
+    """Blocking wrapper around convert_all for the converter scripts"""
+    if not jobs:
+        return {}
+    return asyncio.run(convert_all(jobs, **options))
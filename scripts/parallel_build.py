@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Process-pool helpers for the doc generators.
+
+Pages are independent, so they can be rendered on every core. Results come
+back in submission order so progress output stays deterministic, and worker
+exceptions are collected instead of aborting the run.
+"""
+
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+
+def default_jobs():
+    """Number of worker processes to use when --jobs is not given"""
+    return os.cpu_count() or 1
+
+
+@dataclass
+class TaskOutcome:
+    task: object
+    result: object = None
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _call(func, args):
+    try:
+        return func(*args), None
+    except Exception as e:
+        # Tracebacks don't pickle; ship the formatted text back instead
+        return None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+
+def run_parallel(func, tasks, jobs=None):
+    """Run func(*task) for every task, yielding TaskOutcome in task order.
+
+    With jobs <= 1 (or a single task) everything runs in-process, which keeps
+    debugging and profiling simple.
+    """
+    tasks = list(tasks)
+    jobs = min(jobs or default_jobs(), len(tasks))
+    if jobs <= 1:
+        for task in tasks:
+            result, error = _call(func, task)
+            yield TaskOutcome(task, result, error)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_call, func, task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            try:
+                result, error = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool)
+                result, error = None, f"{type(e).__name__}: {e}"
+            yield TaskOutcome(task, result, error)
+
+
+def report_errors(failures):
+    """Print collected worker failures; returns the process exit code"""
+    if not failures:
+        return 0
+    print(f"\n❌ {len(failures)} page(s) failed:")
+    for name, error in failures:
+        print(f"\n--- {name} ---\n{error.rstrip()}")
+    return 1
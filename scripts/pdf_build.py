@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+PDF build stage for the client documents.
+
+pandoc turns each document into standalone LaTeX once per content change,
+and xelatex compiles the results in parallel. Both the .tex and the PDF are
+cached by content hash under .build-cache/pdf/, so a proposal that has
+already been built for one client never goes through LaTeX again. Each
+document keeps a persistent work directory, and LaTeX passes stop as soon
+as the .aux/.toc/.out files stop changing. An unchanged TOC therefore
+costs a single pass instead of pandoc's usual two or three.
+
+Images are resolved against the source's directory and extracted by pandoc
+into a shared, content-named media directory, so xelatex finds them from
+its work directory. The digests of the images a document references are
+part of its .tex key, so replacing an image rebuilds the PDF.
+"""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+from urllib.parse import unquote
+
+from build_cache import CACHE_DIRNAME, file_digest, inputs_digest, write_if_changed
+from build_trace import span
+from pandoc_runner import DEFAULT_TIMEOUT, PandocJob, run_pandoc_jobs
+
+PDF_DIRNAME = 'pdf'
+LATEX_ENGINE = 'xelatex'
+MAX_PASSES = 3
+# Cached .tex/.pdf files kept across runs (oldest are pruned first)
+MAX_CACHED = 64
+# Files whose changes mean another LaTeX pass is needed
+_PASS_FILES = ('doc.aux', 'doc.toc', 'doc.out')
+# -file-line-error style messages: "./doc.tex:42: Undefined control sequence."
+_FILE_LINE_ERROR = re.compile(r'^\S+\.(?:tex|sty|cls):\d+: ')
+# Local files a markdown source can pull in as images: inline images, reference definitions, raw <img>
+_IMAGE_REF = re.compile(
+    r'!\[(?:[^\]\\]|\\.)*\]\(\s*<?([^)\s>]+)|^ {0,3}\[[^\]]+\]:\s*<?([^\s>]+)|<img\b[^>]*\bsrc="([^"]+)"',
+    re.MULTILINE,
+)
+_REMOTE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|#)', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class PdfSpec:
+    source: str
+    output: str
+    toc: bool = False
+    toc_depth: int = None
+    variables: dict = field(default_factory=dict)
+    # Dropped on a retry when the first compile fails (e.g. a font that isn't installed)
+    optional_variables: dict = field(default_factory=dict)
+
+    def pandoc_args(self, fallback=False):
+        args = ['-f', 'markdown', '-t', 'latex', '--standalone']
+        if self.toc:
+            args.append('--toc')
+            if self.toc_depth is not None:
+                args.append(f'--toc-depth={self.toc_depth}')
+        variables = dict(self.variables)
+        if not fallback:
+            variables.update(self.optional_variables)
+        for name, value in variables.items():
+            args.extend(('-V', f'{name}={value}'))
+        return args
+
+
+def image_digests(text, source_dir):
+    """{reference: digest, or None if missing} for every local file the markdown may use as an image"""
+    digests = {}
+    for match in _IMAGE_REF.finditer(text):
+        ref = next(group for group in match.groups() if group)
+        if _REMOTE.match(ref) or ref in digests:
+            continue
+        path = os.path.join(source_dir, unquote(ref))
+        digests[ref] = file_digest(path) if os.path.isfile(path) else None
+    return digests
+
+
+def _snapshot(directory):
+    state = {}
+    for name in _PASS_FILES:
+        try:
+            with open(os.path.join(directory, name), 'rb') as f:
+                state[name] = f.read()
+        except OSError:
+            state[name] = None
+    return state
+
+
+def _latex_error(directory):
+    """First LaTeX error from the log, or a generic message"""
+    try:
+        with open(os.path.join(directory, 'doc.log'), 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return f"{LATEX_ENGINE} failed"
+    for i, line in enumerate(lines):
+        if line.startswith('!') or _FILE_LINE_ERROR.match(line):
+            return '\n'.join(lines[i:i + 3])
+    return f"{LATEX_ENGINE} failed"
+
+
+async def _latex_pass(directory, timeout):
+    proc = await asyncio.create_subprocess_exec(
+        LATEX_ENGINE, '-interaction=nonstopmode', '-halt-on-error', '-file-line-error', 'doc.tex',
+        cwd=directory,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await asyncio.wait_for(proc.wait(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode == 0
+
+
+async def _compile(directory, tex, timeout, limit, doc=None):
+    """Compile tex in directory; returns (pdf bytes, passes) or raises RuntimeError"""
+    os.makedirs(directory, exist_ok=True)
+    write_if_changed(os.path.join(directory, 'doc.tex'), tex)
+    async with limit:
+        for passes in range(1, MAX_PASSES + 1):
+            before = _snapshot(directory)
+            try:
+                with span(LATEX_ENGINE, lane=True, doc=doc, latex_pass=passes):
+                    ok = await _latex_pass(directory, timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"{LATEX_ENGINE} timed out after {timeout:g}s") from None
+            except OSError as e:
+                raise RuntimeError(str(e)) from None
+            if not ok:
+                raise RuntimeError(_latex_error(directory))
+            # The work directory survives between runs, so when the headings
+            # are unchanged the first pass already reads the final .toc
+            if _snapshot(directory) == before:
+                break
+    with open(os.path.join(directory, 'doc.pdf'), 'rb') as f:
+        return f.read(), passes
+
+
+def _prune(directory, limit=MAX_CACHED):
+    try:
+        entries = [os.path.join(directory, name) for name in os.listdir(directory)]
+    except OSError:
+        return
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[limit:]:
+        os.unlink(path)
+
+
+class PdfBuilder:
+    """Builds PdfSpecs into output_dir through the shared .tex/.pdf cache"""
+
+    def __init__(self, root, output_dir, jobs=None, timeout=DEFAULT_TIMEOUT):
+        self.root = root
+        self.output_dir = output_dir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        cache = os.path.join(root, CACHE_DIRNAME, PDF_DIRNAME)
+        self.tex_dir = os.path.join(cache, 'tex')
+        self.pdf_dir = os.path.join(cache, 'out')
+        self.work_dir = os.path.join(cache, 'work')
+        self.media_dir = os.path.join(cache, 'media')  # images extracted by pandoc, named by content
+
+    def _media_present(self, tex):
+        """Whether every extracted image a cached .tex points at is still there"""
+        prefix = re.escape(self.media_dir)
+        return all(os.path.exists(path) for path in re.findall(prefix + r'[^}]*', tex))
+
+    def _tex(self, specs, fallback, force):
+        """Return {output: (tex, error)}, running pandoc only for uncached documents"""
+        results = {}
+        pending = {}
+        for spec in specs:
+            source_path = os.path.join(self.root, spec.source)
+            source_dir = os.path.dirname(source_path)
+            # Relative images resolve against the source, not against xelatex's work directory
+            args = spec.pandoc_args(fallback) + [f'--resource-path={source_dir}', f'--extract-media={self.media_dir}']
+            with open(source_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            key = inputs_digest(text, {'args': args, 'images': image_digests(text, source_dir)})
+            cached = os.path.join(self.tex_dir, f"{key}.tex")
+            tex = None
+            if not force and os.path.exists(cached):
+                with open(cached, 'r', encoding='utf-8') as f:
+                    tex = f.read()
+            if tex is not None and self._media_present(tex):
+                os.utime(cached)
+                results[spec.output] = (tex, None)
+            else:
+                pending.setdefault(tuple(args), []).append((spec, source_path, cached))
+
+        # One pandoc run per distinct argument list; documents in it run concurrently
+        for args, group in pending.items():
+            jobs = [PandocJob(spec.output, path) for spec, path, _ in group]
+            converted = run_pandoc_jobs(jobs, args=list(args), concurrency=self.jobs,
+                                        timeout=self.timeout, batch_size=1)
+            for spec, _, cached in group:
+                result = converted[spec.output]
+                if result.ok:
+                    write_if_changed(cached, result.html)
+                results[spec.output] = (result.html, result.error)
+        return results
+
+    async def _compile_all(self, queue):
+        limit = asyncio.Semaphore(self.jobs)
+
+        async def one(spec, tex):
+            stem = os.path.splitext(spec.output)[0]
+            try:
+                return spec, await _compile(os.path.join(self.work_dir, stem), tex, self.timeout, limit, spec.output), None
+            except RuntimeError as e:
+                return spec, None, str(e)
+
+        return await asyncio.gather(*(one(spec, tex) for spec, tex in queue))
+
+    def _build(self, specs, fallback, force):
+        """Build specs; returns [(spec, error)] for the ones that failed"""
+        failures = []
+        queue = []
+        tex_results = self._tex(specs, fallback, force)
+        for spec in specs:
+            tex, error = tex_results[spec.output]
+            if error is not None:
+                failures.append((spec, error))
+                continue
+            pdf_key = inputs_digest(tex, LATEX_ENGINE)
+            cached = os.path.join(self.pdf_dir, f"{pdf_key}.pdf")
+            if not force and os.path.exists(cached):
+                os.utime(cached)
+                with open(cached, 'rb') as f:
+                    changed = write_if_changed(os.path.join(self.output_dir, spec.output), f.read())
+                print(f"⏭️  {spec.output} from PDF cache" + ("" if changed else " (unchanged)"))
+                continue
+            queue.append((spec, tex, cached))
+
+        if queue:
+            outcomes = asyncio.run(self._compile_all([(spec, tex) for spec, tex, _ in queue]))
+            for (spec, _, cached), (_, result, error) in zip(queue, outcomes):
+                if error is not None:
+                    failures.append((spec, error))
+                    continue
+                pdf, passes = result
+                write_if_changed(cached, pdf)
+                write_if_changed(os.path.join(self.output_dir, spec.output), pdf)
+                print(f"✅ Created {spec.output} ({passes} LaTeX pass{'es' if passes > 1 else ''})")
+        return failures
+
+    def build(self, specs, force=False):
+        """Build every spec; returns [(output, error)] for failures"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        present = []
+        for spec in specs:
+            if os.path.exists(os.path.join(self.root, spec.source)):
+                print(f"📄 Converting {spec.source} -> {spec.output}...")
+                present.append(spec)
+            else:
+                print(f"⚠️  Skipping {spec.source} (not found)")
+
+        failures = []
+        retry = []
+        for spec, error in self._build(present, fallback=False, force=force):
+            if spec.optional_variables:
+                print(f"⚠️  {spec.output} failed (trying without {', '.join(spec.optional_variables)})...")
+                retry.append(spec)
+            else:
+                failures.append((spec, error))
+        failures.extend(self._build(retry, fallback=True, force=force))
+
+        for spec, error in failures:
+            print(f"❌ Error converting {spec.source}: {(error.splitlines() or [''])[0]}")
+        _prune(self.tex_dir)
+        _prune(self.pdf_dir)
+        return [(spec.output, error) for spec, error in failures]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Optional post-render stage for the generated pages (--minify, --precompress).
+
+minify_html() drops comments, collapsible whitespace and redundant
+attribute quotes. It leaves the contents of <pre>, <textarea>, <script>
+and <style> untouched, so pages render exactly as before.
+
+precompress() writes .gz and .br siblings at maximum compression for every
+text asset in the output directory. It also writes precompressed.json
+listing them. next.config.js reads that manifest and rewrites requests
+from clients that accept br or gzip to the sibling, with the matching
+Content-Encoding, so the host does no compression work per request.
+Siblings are only regenerated when their source changes.
+
+The .br files need the brotli package (pip install brotli). Without it
+only .gz files are written.
+"""
+
+import json
+import os
+import re
+import zlib
+
+from build_cache import STREAM_BLOCK_SIZE, file_digest, write_if_changed, write_stream_if_changed
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for .br siblings
+    brotli = None
+
+MANIFEST_NAME = 'precompressed.json'
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.xml')
+# Below this the headers cost more than compression saves
+MIN_SIZE = 512
+ENCODINGS = {'gzip': '.gz', 'br': '.br'}
+
+_TOKEN = re.compile(
+    r'(?P<comment><!--(?!\[).*?-->)'
+    r'|(?P<raw>(?P<open><(?P<rawname>pre|textarea|script|style)\b[^>]*>).*?</(?P=rawname)\s*>)'
+    r'|(?P<tag><[^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*>)'
+    r'|(?P<text>[^<]+)',
+    re.DOTALL | re.IGNORECASE,
+)
+_TAG = re.compile(r'<(/?)([^\s/>]+)(.*?)(/?)>$', re.DOTALL)
+_ATTR = re.compile(r'''([^\s"'=<>/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?''')
+_UNQUOTED = re.compile(r'''[^\s"'=<>`]+''')
+_SPACE = re.compile(r'\s+')
+
+# Whitespace next to these tags never renders (white-space: normal)
+BLOCK_TAGS = frozenset('''
+    html head body div p ul ol li dl dt dd h1 h2 h3 h4 h5 h6 table thead tbody tfoot tr td th caption
+    colgroup col section article header footer nav main aside blockquote pre hr br figure figcaption
+    form fieldset legend details summary
+'''.split())
+VOID_TAGS = frozenset('area base br col embed hr img input link meta source track wbr'.split())
+
+
+def _minify_tag(tag):
+    m = _TAG.match(tag)
+    if m is None or m.group(2).startswith('!'):
+        return tag
+    closing, name, body, slash = m.groups()
+    lower = name.lower()
+    if closing:
+        return f'</{name}>'
+    # Foreign (SVG) self-closing tags keep their quotes and slash
+    keep_quotes = slash and lower not in VOID_TAGS
+    parts = [name]
+    for attr in _ATTR.finditer(body):
+        attr_name, double, single, bare = attr.groups()
+        value = next((v for v in (double, single, bare) if v is not None), None)
+        if value is None or (value == '' and not keep_quotes):
+            parts.append(attr_name)
+        elif not keep_quotes and _UNQUOTED.fullmatch(value):
+            parts.append(f'{attr_name}={value}')
+        elif '"' in value:
+            parts.append(f"{attr_name}='{value}'")
+        else:
+            parts.append(f'{attr_name}="{value}"')
+    return f"<{' '.join(parts)}{' /' if keep_quotes else ''}>"
+
+
+def _tag_name(tag):
+    m = _TAG.match(tag)
+    return m.group(2).lower() if m else ''
+
+
+def minify_html(html):
+    """Minified HTML that renders the same as html"""
+    tokens = []  # (kind, text, tag name)
+    for m in _TOKEN.finditer(html):
+        kind = m.lastgroup
+        if kind == 'comment':
+            continue
+        if kind == 'text':
+            if tokens and tokens[-1][0] == 'text':
+                # Text on both sides of a dropped comment
+                tokens[-1] = ('text', tokens[-1][1] + m.group(), '')
+            else:
+                tokens.append(('text', m.group(), ''))
+        elif kind == 'raw':
+            open_tag = m.group('open')
+            tokens.append(('raw', _minify_tag(open_tag) + m.group()[len(open_tag):], m.group('rawname').lower()))
+        else:
+            tokens.append(('tag', _minify_tag(m.group()), _tag_name(m.group())))
+
+    out = []
+    in_head = False
+    for i, (kind, text, name) in enumerate(tokens):
+        if kind != 'text':
+            if name == 'head':
+                in_head = not text.startswith('</')
+            out.append(text)
+            continue
+        before = tokens[i - 1][2] if i else 'html'
+        after = tokens[i + 1][2] if i + 1 < len(tokens) else 'html'
+        text = _SPACE.sub(' ', text)
+        if before in BLOCK_TAGS or in_head:
+            text = text.lstrip(' ')
+        if after in BLOCK_TAGS or in_head:
+            text = text.rstrip(' ')
+        out.append(text)
+    return ''.join(out)
+
+
+def _gzip_blocks(path):
+    # wbits=31 writes a gzip header with no name or mtime, so output is reproducible
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31, 9)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_BLOCK_SIZE), b''):
+            yield compressor.compress(block)
+    yield compressor.flush()
+
+
+def _brotli_blocks(path):
+    compressor = brotli.Compressor(quality=11, mode=brotli.MODE_TEXT)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_BLOCK_SIZE), b''):
+            yield compressor.process(block)
+    yield compressor.finish()
+
+
+def _compressors():
+    compressors = {'gzip': _gzip_blocks}
+    if brotli is not None:
+        compressors['br'] = _brotli_blocks
+    return compressors
+
+
+def precompress(directory):
+    """Refresh .gz/.br siblings and the manifest under directory; returns files compressed"""
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    compressors = _compressors()
+    # Entries made without an encoding we now have (brotli installed since) are redone
+    previous = data.get('files', {}) if set(data.get('encodings', ())) >= compressors.keys() else {}
+
+    files = {}
+    compressed = 0
+    for dirpath, _, names in os.walk(directory):
+        for name in sorted(names):
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, directory).replace(os.sep, '/')
+            if rel == MANIFEST_NAME or not name.endswith(COMPRESSIBLE):
+                continue
+            size = os.path.getsize(path)
+            if size < MIN_SIZE:
+                continue
+            digest = file_digest(path)
+            entry = previous.get(rel)
+            if (entry and entry['sha256'] == digest
+                    and all(os.path.exists(path + ENCODINGS[e]) for e in entry['encodings'])):
+                files[rel] = entry
+                continue
+            encodings = {}
+            for encoding, blocks in compressors.items():
+                sibling = path + ENCODINGS[encoding]
+                write_stream_if_changed(sibling, blocks(path))
+                if os.path.getsize(sibling) < size:
+                    encodings[encoding] = os.path.getsize(sibling)
+                else:
+                    os.unlink(sibling)
+            files[rel] = {'sha256': digest, 'bytes': size, 'encodings': encodings}
+            compressed += 1
+
+    # Siblings whose source is gone or no longer worth compressing
+    for rel, entry in previous.items():
+        for encoding, suffix in ENCODINGS.items():
+            if encoding in entry.get('encodings', {}) and encoding not in files.get(rel, {}).get('encodings', {}):
+                sibling = os.path.join(directory, rel + suffix)
+                if os.path.exists(sibling):
+                    os.unlink(sibling)
+
+    manifest = {'version': 1, 'encodings': sorted(compressors), 'files': files}
+    write_if_changed(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return compressed
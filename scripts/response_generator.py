@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Synthetic survey responses at production scale, for load-testing the dashboards and insight rules.
+
+Employees come from a hierarchy CSV (or a generated one) through
+hierarchy_loader, so their ids match what load-hierarchy.py imports. Each
+team has a latent 0-100 score per domain: a current level, a per-period
+trend (random, or set per team) and period-to-period noise that carries
+over (AR(1)); each employee adds a fixed offset. Answers are then drawn
+for a whole block of employees at once. A 5-point answer is
+1 + Binomial(4, p) with p taken from the latent score, so a team's mean
+answer × 20 tracks its latent score. The 3-point answer is derived from it
+the way the TypeScript seeders do.
+
+Every (employee block, period) pair draws from its own generator, seeded
+with the seed, the client and the period's date. So a seed gives the same
+rows whatever the batch size or output format, and two clients or two date
+ranges never share token or response ids.
+
+Needs NumPy (pip install numpy).
+"""
+
+import uuid
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from hierarchy_loader import OPTIONAL_COLUMNS, REQUIRED_COLUMNS, TABLE_COLUMNS
+from insight_engine import DOMAIN_ALIASES, DOMAINS, ScoreMatrix
+from score_store import DEFAULT_ANCHOR, DEFAULT_PERIOD_DAYS, period_start
+
+SOURCE = 'synthetic_load_test'
+# responses_v3 column prefix of each insight_engine domain, in DOMAINS order
+SCORE_COLUMNS = ('sentiment', 'workload', 'safety', 'leadership', 'clarity')
+TOKEN_COLUMNS = ('id', 'client_id', 'employee_id', 'valid_until', 'status', 'channel', 'created_at',
+                 'consumed_at')
+RESPONSE_COLUMNS = (('id', 'token_id', 'client_id', 'employee_id')
+                    + tuple(f"{name}_{scale}" for name in SCORE_COLUMNS for scale in (5, 3))
+                    + ('submitted_at', 'source'))
+_NUMERIC = {f"{name}_{scale}" for name in SCORE_COLUMNS for scale in (5, 3)}
+
+DEFAULT_BATCH_SIZE = 5000
+# Employees drawn per generator; part of the seeding, so changing it changes the data
+BLOCK_SIZE = 65536
+TEAMS_PER_DEPARTMENT = 8
+DEPARTMENTS_PER_DIVISION = 6
+FIRST_NAMES = ('Alex', 'Casey', 'Jordan', 'Riley', 'Sam', 'Taylor', 'Morgan', 'Jamie', 'Avery', 'Quinn')
+LAST_NAMES = ('Nguyen', 'Tran', 'Smith', 'Patel', 'Brown', 'Wilson', 'Chen', 'Kelly', 'Singh', 'Martin')
+
+# Answer text by 5-point value; 3-point as mapToThree in seed-team-history.ts (1 = thriving)
+_FIVE = np.array(['', '1', '2', '3', '4', '5'])
+_THREE = np.array(['', '3', '3', '2', '1', '1'])
+_HEX = np.frombuffer(b'0123456789abcdef', dtype=np.uint8).astype(np.uint32)
+_UUID_DASHES = [8, 13, 18, 23]
+_UUID_DIGITS = [i for i in range(36) if i not in _UUID_DASHES]
+_EMPLOYEE_TEAM = TABLE_COLUMNS['public.employees'].index('team_id')
+
+
+class SyntheticDataError(Exception):
+    """The generator's settings can't be applied (unknown team or domain in a trend)"""
+
+
+@dataclass
+class Model:
+    """Latent score model, on the dashboard's 0-100 domain scale"""
+    mean: float = 72.0  # mean current team level
+    team_sd: float = 9.0  # spread of current team levels
+    drift_sd: float = 0.5  # spread of random per-period trends
+    noise_sd: float = 3.0  # period-to-period shocks
+    persistence: float = 0.6  # share of last period's shock that carries over
+    employee_sd: float = 10.0  # fixed per-employee offset
+    participation: float = 0.7  # share of employees answering each period
+
+
+@dataclass
+class Population:
+    """Teams and employees, as read from hierarchy_loader batches"""
+    team_paths: list = field(default_factory=list)  # (division, department, team) per team index
+    employee_ids: list = field(default_factory=list)
+    employee_teams: list = field(default_factory=list)  # team index per employee
+
+    def record(self, batches):
+        """Pass batches through, noting every team and employee"""
+        names = {}  # division/department id -> path
+        teams = {}  # team id -> team index
+        for batch in batches:
+            table, _, rows = batch
+            if table == 'public.employees':
+                self.employee_ids += [row[0] for row in rows]
+                self.employee_teams += [teams[row[_EMPLOYEE_TEAM]] for row in rows]
+            elif table == 'public.teams':
+                for team_id, department_id, name, _ in rows:
+                    teams[team_id] = len(self.team_paths)
+                    self.team_paths.append(names[department_id] + (name,))
+            elif table == 'public.departments':
+                for department_id, division_id, name, _ in rows:
+                    names[department_id] = names[division_id] + (name,)
+            elif table == 'public.divisions':
+                for division_id, _, name, _ in rows:
+                    names[division_id] = (name,)
+            yield batch
+
+
+def synthetic_hierarchy(teams, team_size, seed=0):
+    """Hierarchy CSV lines for `teams` teams of about `team_size` employees each"""
+    sizes = np.maximum(1, np.random.default_rng([seed, 3]).poisson(team_size, teams)).tolist()
+    yield ','.join(REQUIRED_COLUMNS + OPTIONAL_COLUMNS) + '\n'
+    n = 0
+    for t, size in enumerate(sizes):
+        department = t // TEAMS_PER_DEPARTMENT
+        prefix = f"Division {department // DEPARTMENTS_PER_DIVISION + 1},Department {department + 1},Team {t + 1},"
+        lines = []
+        for n in range(n + 1, n + size + 1):
+            first, last = FIRST_NAMES[n % 10], LAST_NAMES[n // 10 % 10]
+            lines.append(f"{prefix}SYN-{n:07d},{first},{last},{first.lower()}.{last.lower()}.{n}@example.com\n")
+        yield from lines
+
+
+def period_starts(count, end, days=DEFAULT_PERIOD_DAYS, anchor=DEFAULT_ANCHOR):
+    """Start dates of `count` back-to-back periods of `days` days, the last ending on or before `end`.
+
+    The periods sit on the ScoreStore grid for the same anchor, so each one
+    aggregates into exactly one store period instead of straddling two.
+    """
+    return period_start(end, days, anchor) - days * np.arange(count, 0, -1)
+
+
+def _domain_indices(name):
+    if name == '*':
+        return list(range(len(DOMAINS)))
+    key = DOMAIN_ALIASES.get(name.strip().lower(), name.strip().lower())
+    if key not in DOMAINS:
+        raise SyntheticDataError(f"unknown domain {name!r} in trends (use {', '.join(DOMAINS)} or '*')")
+    return [DOMAINS.index(key)]
+
+
+def trend_slopes(trends, team_paths):
+    """(teams, domains) per-period slopes from {team: {domain: slope}}, NaN where none is set.
+
+    A team key is a team name, a 'Division/Department/Team' path or '*' for
+    every team; the more specific key wins. A domain key is a DOMAINS name,
+    an alias (sentiment) or '*' for all five.
+    """
+    slopes = np.full((len(team_paths), len(DOMAINS)), np.nan)
+    index = {'*': list(range(len(team_paths)))}
+    for t, path in enumerate(team_paths):
+        index.setdefault(path[-1], []).append(t)
+        index.setdefault('/'.join(path), []).append(t)
+    for key in sorted(trends, key=lambda k: (k != '*', '/' in k)):
+        if key not in index:
+            raise SyntheticDataError(f"unknown team {key!r} in trends")
+        if not isinstance(trends[key], dict):
+            raise SyntheticDataError(f"trend for {key!r} is not a {{domain: slope}} object")
+        for domain, slope in trends[key].items():
+            if isinstance(slope, bool) or not isinstance(slope, (int, float)):
+                raise SyntheticDataError(f"trend for {key!r}/{domain} is not a number: {slope!r}")
+            slopes[np.ix_(index[key], _domain_indices(domain))] = slope
+    return slopes
+
+
+def latent_scores(teams, periods, model, rng, slopes=None):
+    """(teams, periods, domains) latent scores, clipped to the 20-100 a 5-point answer can reach"""
+    shape = (teams, len(DOMAINS))
+    level = rng.normal(model.mean, model.team_sd, shape)
+    slope = rng.normal(0, model.drift_sd, shape)
+    if slopes is not None:
+        slope = np.where(np.isnan(slopes), slope, slopes)
+    shocks = rng.normal(0, model.noise_sd, (teams, periods, len(DOMAINS)))
+    for p in range(1, periods):
+        shocks[:, p] += model.persistence * shocks[:, p - 1]
+    # level is where the team stands in the latest period; the trend says how it got there
+    steps = np.arange(periods, dtype=np.float64) - (periods - 1)
+    return np.clip(level[:, None] + slope[:, None] * steps[None, :, None] + shocks, 20, 100)
+
+
+def _uuid4(rng, count):
+    raw = np.frombuffer(rng.bytes(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80
+    # Hex digits and dashes as UCS-4 code points, viewed as one 36-character string per row
+    text = np.empty((count, 36), dtype=np.uint32)
+    text[:, _UUID_DIGITS] = _HEX[np.stack((raw >> 4, raw & 0x0F), axis=-1).reshape(count, 32)]
+    text[:, _UUID_DASHES] = ord('-')
+    return text.view('<U36').ravel().tolist()
+
+
+class ResponseGenerator:
+    """Draws tokens and responses_v3 rows for a population, block by block and period by period"""
+
+    def __init__(self, population, client_id, periods, seed=0, model=None, trends=None, period_days=DEFAULT_PERIOD_DAYS):
+        self.population = population
+        self.client_id = client_id
+        self.periods = np.asarray(periods, dtype='datetime64[D]')
+        self.seed = seed
+        self._entropy = [seed, uuid.UUID(client_id).int]
+        self.model = model or Model()
+        self.trends = trends or {}
+        self.period_days = period_days
+        self.latent = self.team_index = None
+        self.sums = self.counts = None
+        self.responses = 0
+
+    def _start(self):
+        # After the population is known, which may be while its batches are still being written
+        teams = len(self.population.team_paths)
+        slopes = trend_slopes(self.trends, self.population.team_paths) if self.trends else None
+        self.latent = latent_scores(teams, len(self.periods), self.model, np.random.default_rng(self._entropy + [0]),
+                                    slopes)
+        self.sums = np.zeros(self.latent.shape, dtype=np.float64)
+        self.counts = np.zeros(self.latent.shape[:2], dtype=np.int64)
+        self.team_index = np.asarray(self.population.employee_teams, dtype=np.intp)
+        self.responses = 0
+
+    def _sample(self, block, start, offsets, p):
+        """Employee indices, 5-point answers and submission times for one block and period"""
+        day = int(self.periods[p].astype(np.int64))
+        rng = np.random.default_rng(self._entropy + [1, block, day])
+        answered = np.flatnonzero(rng.random(len(offsets)) < self.model.participation)
+        teams = self.team_index[start + answered]
+        level = self.latent[teams, p] + offsets[answered]
+        answers = rng.binomial(4, np.clip((level - 20) / 80, 0, 1)) + 1
+        seconds = rng.integers(0, self.period_days * 86400, len(answered))
+        submitted = self.periods[p].astype('datetime64[s]') + seconds
+
+        team_count = len(self.population.team_paths)
+        self.counts[:, p] += np.bincount(teams, minlength=team_count)
+        for d in range(len(DOMAINS)):
+            self.sums[:, p, d] += np.bincount(teams, weights=answers[:, d], minlength=team_count)
+        return start + answered, answers, submitted, rng
+
+    def batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Yield (table, columns, column values) batches; each batch's tokens come before its responses.
+
+        Values are SQL-safe text (UUIDs, digits, ISO timestamps), one list per column.
+        """
+        self._start()
+        employee_ids = self.population.employee_ids
+        batch_size = max(1, batch_size)
+        for block, start in enumerate(range(0, len(employee_ids), BLOCK_SIZE)):
+            stop = min(start + BLOCK_SIZE, len(employee_ids))
+            offsets = np.random.default_rng(self._entropy + [2, block]).normal(
+                0, self.model.employee_sd, (stop - start, len(DOMAINS)))
+            for p, period in enumerate(self.periods):
+                who, answers, submitted, rng = self._sample(block, start, offsets, p)
+                count = len(who)
+                if not count:
+                    continue
+                self.responses += count
+                token_ids = _uuid4(rng, count)
+                response_ids = _uuid4(rng, count)
+                employees = [employee_ids[e] for e in who.tolist()]
+                times = np.datetime_as_string(submitted, timezone='UTC').tolist()
+                scores = []
+                for d in range(len(DOMAINS)):
+                    scores += [_FIVE[answers[:, d]].tolist(), _THREE[answers[:, d]].tolist()]
+                opened = f"{period}T00:00:00Z"
+                closes = f"{period + np.timedelta64(self.period_days, 'D')}T00:00:00Z"
+
+                for i in range(0, count, batch_size):
+                    j = min(i + batch_size, count)
+                    n = j - i
+                    client = [self.client_id] * n
+                    yield 'public.tokens', TOKEN_COLUMNS, [
+                        token_ids[i:j], client, employees[i:j], [closes] * n, ['consumed'] * n, ['web'] * n,
+                        [opened] * n, times[i:j]]
+                    yield 'public.responses_v3', RESPONSE_COLUMNS, (
+                        [response_ids[i:j], token_ids[i:j], client, employees[i:j]]
+                        + [column[i:j] for column in scores] + [times[i:j], [SOURCE] * n])
+
+    def score_matrix(self):
+        """Team × period domain scores (mean 5-point answer × 20, as the dashboard shows) of the rows drawn"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = (self.sums / self.counts[..., None] * 20).astype(np.float32)
+        paths = self.population.team_paths
+        answers = np.broadcast_to(self.counts[..., None], scores.shape).astype(np.int32)
+        return ScoreMatrix([path[-1] for path in paths], [str(period) for period in self.periods], scores,
+                           [' / '.join(path[:-1]) for path in paths], answers)
+
+
+def csv_chunks(batches):
+    """responses_v3 rows as CSV (token rows are left out)"""
+    yield ','.join(RESPONSE_COLUMNS) + '\n'
+    for table, _, values in batches:
+        if table == 'public.responses_v3':
+            yield ''.join([','.join(row) + '\n' for row in zip(*values)])
+
+
+def sql_chunks(batches):
+    """Multi-row INSERTs in one transaction, as hierarchy_loader.sql_chunks; re-runs skip existing ids"""
+    yield 'BEGIN;\n'
+    for table, columns, values in batches:
+        quoted = [column if name in _NUMERIC else ["'" + value + "'" for value in column]
+                  for name, column in zip(columns, values)]
+        rows = ',\n'.join(['(' + ', '.join(row) + ')' for row in zip(*quoted)])
+        yield f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n{rows}\nON CONFLICT (id) DO NOTHING;\n"
+    yield 'COMMIT;\n'
+
+
+def copy_chunks(batches):
+    """psql COPY ... FROM stdin blocks, as hierarchy_loader.copy_chunks"""
+    yield 'BEGIN;\n'
+    for table, columns, values in batches:
+        lines = ''.join(['\t'.join(row) + '\n' for row in zip(*values)])
+        yield f"COPY {table} ({', '.join(columns)}) FROM stdin;\n{lines}\\.\n"
+    yield 'COMMIT;\n'
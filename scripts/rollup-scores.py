@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Rolled-up Beacon Index scores for divisions, departments or any set of teams.
+
+Reads the rollup index written by aggregate-responses.py --rollup (see
+rollup_index.py), so every query is a lookup rather than a walk over the
+hierarchy. Scores are answer-weighted means over each subtree's teams
+(the store's rolling window by default).
+
+Usage:
+  python3 scripts/rollup-scores.py rollup.npz                                # every division
+  python3 scripts/rollup-scores.py rollup.npz --level department
+  python3 scripts/rollup-scores.py rollup.npz "Regional" "Sydney Metro/Education"
+  python3 scripts/rollup-scores.py rollup.npz "Regional/Health/Team C" "QLD" --combined
+  python3 scripts/rollup-scores.py rollup.npz --move "Regional/Health/Team C" "QLD/Residential" --save
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from insight_engine import BANDS, DOMAINS, NO_BAND, display_score, evaluate
+from rollup_index import LEVELS, STORE_COLUMNS, RollupError, RollupIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('index', help="rollup index .npz from aggregate-responses.py --rollup")
+    parser.add_argument('nodes', nargs='*', help="'Division', 'Division/Department' or 'Division/Department/Team'")
+    parser.add_argument('--level', choices=LEVELS, default='division', help="level to list when no nodes are given")
+    parser.add_argument('--combined', action='store_true', help="one score for all the given nodes together")
+    parser.add_argument('--move', nargs=2, action='append', default=[], metavar=('TEAM', 'DEPARTMENT'),
+                        help="move a team under another department first (repeatable)")
+    parser.add_argument('--save', action='store_true', help="write the index back after --move")
+    args = parser.parse_args()
+
+    try:
+        index = RollupIndex.load(args.index)
+        if index.columns != STORE_COLUMNS:
+            raise RollupError(f"{args.index}: not built from a score store")
+        for team, department in args.move:
+            index.move(team, department)
+            print(f"↪️  Moved {team} under {department}")
+        if args.nodes and args.combined:
+            names, totals = [' + '.join(args.nodes)], index.total_of(args.nodes)[None, :]
+        elif args.nodes:
+            names, totals = args.nodes, np.array([index.total(node) for node in args.nodes])
+        else:
+            paths, totals = index.level(LEVELS.index(args.level) + 1)
+            names = ['/'.join(path) for path in paths]
+    except (OSError, RollupError) as e:
+        print(f"❌ {e}")
+        return 2
+    if args.save and args.move:
+        index.save(args.index)
+        print(f"💾 Saved {args.index}")
+
+    insights = evaluate(index.score_matrix(totals, names))
+    teams, responses = totals[:, STORE_COLUMNS.index('teams')], totals[:, STORE_COLUMNS.index('responses')]
+    print(f"\n{'node':<40} {'teams':>6} {'responses':>9} {'index':>6}  {'band':<17} "
+          + ' '.join(f"{domain:>10}" for domain in DOMAINS))
+    for n, name in enumerate(insights.matrix.teams):
+        band = insights.bands[n, 0]
+        composite = f"{display_score(insights.composite[n, 0]):.1f}" if band != NO_BAND else '–'
+        scores = ' '.join(f"{display_score(s):>10.1f}" if s == s else f"{'–':>10}"
+                          for s in insights.matrix.scores[n, 0].tolist())
+        label = name if len(name) <= 40 else '…' + name[-39:]
+        print(f"{label:<40} {teams[n]:>6.0f} {responses[n]:>9.0f} {composite:>6}  "
+              f"{BANDS[band] if band != NO_BAND else '–':<17} {scores}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
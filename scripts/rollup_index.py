@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Precomputed division → department → team rollups: any subtree total in O(1).
+
+The tree is laid out once in pre-order (an Euler tour): every node takes
+one slot, followed by the slots of its subtree, so a node covers the
+contiguous run [start, stop). Team values (answer sums and counts, team
+and response counts) sit in the team slots and are prefix-summed in tour
+order. A node's total is then prefix[stop] - prefix[start] whatever its
+size. A set of teams costs one subtraction per contiguous run. A whole
+level (every department) is one vectorized subtraction.
+
+Moving a team shifts the teams between its old and new position by one
+slot and patches their prefix rows and the node boundaries with array
+slices. Changing a team's values re-sums the prefix from that team on. In
+both cases there is no tree walk and no rebuild.
+
+Needs NumPy (pip install numpy).
+"""
+
+import io
+
+import numpy as np
+
+from build_cache import write_if_changed
+from insight_engine import DOMAINS, ScoreMatrix
+
+INDEX_VERSION = 1
+_KEY_SEP = '\x1f'
+# Value columns built from a ScoreStore: answer sums and counts per domain, then teams and responses
+STORE_COLUMNS = (tuple(f"{domain}_sum" for domain in DOMAINS) + tuple(f"{domain}_count" for domain in DOMAINS)
+                 + ('teams', 'responses'))
+LEVELS = ('division', 'department', 'team')
+
+
+class RollupError(Exception):
+    """A node can't be found, or a move would break the tree"""
+
+
+class RollupIndex:
+    """Pre-order (Euler tour) node ranges, with team values prefix-summed in tour order"""
+
+    def __init__(self, team_paths, values, columns):
+        """team_paths: (division, department, team) per row of values (teams, columns)"""
+        values = np.asarray(values, dtype=np.float64).reshape(len(team_paths), len(columns))
+        self.columns = tuple(columns)
+        self.paths = [()]  # node id -> path; () is the whole client
+        self.parents = [-1]
+        self.nodes = {(): 0}
+        # Every node takes a slot in the tour, so an empty department still has a place
+        starts, stops = [0], [1]
+        slot_values = [np.zeros(len(self.columns))]
+        for t in sorted(range(len(team_paths)), key=lambda t: team_paths[t]):
+            path = tuple(team_paths[t])
+            if path in self.nodes:
+                raise RollupError(f"team {'/'.join(path)} appears twice")
+            for depth in range(1, len(path) + 1):
+                if path[:depth] not in self.nodes:
+                    self.nodes[path[:depth]] = len(self.paths)
+                    self.paths.append(path[:depth])
+                    self.parents.append(self.nodes[path[:depth - 1]])
+                    starts.append(len(slot_values))
+                    stops.append(0)
+                    slot_values.append(values[t] if depth == len(path) else np.zeros(len(self.columns)))
+            for depth in range(len(path) + 1):
+                stops[self.nodes[path[:depth]]] = len(slot_values)
+        self.start = np.asarray(starts, dtype=np.int64)  # slot of each node
+        self.stop = np.asarray(stops, dtype=np.int64)  # slot after its last descendant
+        self.team_depth = max(map(len, self.paths))
+        self.values = np.asarray(slot_values, dtype=np.float64)  # team values by slot; zero for other nodes
+        self.prefix = np.zeros((len(self.values) + 1, len(self.columns)), dtype=np.float64)
+        np.cumsum(self.values, axis=0, out=self.prefix[1:])
+
+    @classmethod
+    def from_store(cls, store, windowed=True):
+        """Index a ScoreStore's windowed (or all-time) team totals"""
+        running = store.windowed if windowed else store.totals
+        teams = len(store.teams)
+        counts = running['counts'][:teams]
+        values = np.concatenate([running['sums'][:teams], counts, np.ones((teams, 1)),
+                                 counts.max(axis=1, keepdims=True)], axis=1)
+        return cls(store.teams, values, STORE_COLUMNS)
+
+    def _node(self, path):
+        key = tuple(path.split('/')) if isinstance(path, str) else tuple(path)
+        if key == ('',):
+            key = ()
+        node = self.nodes.get(key)
+        if node is None:
+            raise RollupError(f"no division, department or team {'/'.join(key)!r}")
+        return node
+
+    def total(self, path):
+        """Summed values of every team under a node ('Division', 'Division/Department', a team path or '')"""
+        node = self._node(path)
+        return self.prefix[self.stop[node]] - self.prefix[self.start[node]]
+
+    def total_of(self, paths):
+        """Summed values of a set of nodes; teams under two of them count once"""
+        bounds = sorted((int(self.start[n]), int(self.stop[n])) for n in map(self._node, paths))
+        total = np.zeros(len(self.columns), dtype=np.float64)
+        run_start = run_stop = None
+        for start, stop in bounds + [(None, None)]:
+            if start is not None and run_stop is not None and start <= run_stop:
+                run_stop = max(run_stop, stop)
+                continue
+            if run_stop is not None:
+                total += self.prefix[run_stop] - self.prefix[run_start]
+            run_start, run_stop = start, stop
+        return total
+
+    def level(self, depth):
+        """(node paths, (nodes, columns) totals) for every node at a depth (1 = divisions)"""
+        nodes = [n for n, path in enumerate(self.paths) if len(path) == depth]
+        return [self.paths[n] for n in nodes], self.prefix[self.stop[nodes]] - self.prefix[self.start[nodes]]
+
+    def _ancestors(self, node):
+        chain = []
+        while node >= 0:
+            chain.append(node)
+            node = self.parents[node]
+        return chain
+
+    def update(self, path, values):
+        """Replace one team's values; the prefix is re-summed from that team on"""
+        node = self._node(path)
+        position = int(self.start[node])
+        if len(self.paths[node]) != self.team_depth:
+            raise RollupError(f"{'/'.join(self.paths[node])} is not a team")
+        self.values[position] = values
+        np.cumsum(self.values[position:], axis=0, out=self.prefix[position + 1:])
+        self.prefix[position + 1:] += self.prefix[position]
+
+    def move(self, team, parent):
+        """Move a team under another parent (a department path), keeping every range and prefix row exact"""
+        node, target = self._node(team), self._node(parent)
+        path = self.paths[node]
+        new_path = self.paths[target] + path[-1:]
+        if len(path) != self.team_depth or len(new_path) != len(path):
+            raise RollupError(f"can only move a team under a department, not {'/'.join(path)} → "
+                              f"{'/'.join(self.paths[target]) or '(client)'}")
+        if self.parents[node] == target:
+            return
+        if new_path in self.nodes:
+            raise RollupError(f"{'/'.join(new_path)} already exists")
+
+        i = int(self.start[node])
+        v = self.values[i].copy()
+        others = np.ones(len(self.paths), dtype=bool)
+        others[node] = False
+        # Take the team's slot out: every later boundary moves one slot left
+        self.start[others & (self.start > i)] -= 1
+        self.stop[others & (self.stop > i)] -= 1
+        # Put it back in as the target's last slot: later boundaries move right, and so do the ends of the
+        # target and its ancestors (but not of the target's last descendant, which also ends at q)
+        q = int(self.stop[target])
+        chain = np.zeros(len(self.paths), dtype=bool)
+        chain[self._ancestors(target)] = True
+        self.start[others & (self.start >= q)] += 1
+        self.stop[others & ((self.stop > q) | ((self.stop == q) & chain))] += 1
+        self.start[node], self.stop[node] = q, q + 1
+
+        if q > i:
+            self.values[i:q] = self.values[i + 1:q + 1]
+            self.prefix[i + 1:q + 1] = self.prefix[i + 2:q + 2] - v
+        elif q < i:
+            self.values[q + 1:i + 1] = self.values[q:i]
+            self.prefix[q + 1:i + 1] = self.prefix[q:i] + v
+        self.values[q] = v
+
+        del self.nodes[path]
+        self.nodes[new_path] = node
+        self.paths[node] = new_path
+        self.parents[node] = target
+
+    def score_matrix(self, totals, names, period='rollup'):
+        """One-period ScoreMatrix of rolled-up domain scores (answer-weighted mean × 20), for evaluate().
+
+        totals are rows of STORE_COLUMNS values, e.g. from total() or level().
+        """
+        sums = totals[:, :len(DOMAINS)]
+        counts = totals[:, len(DOMAINS):2 * len(DOMAINS)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = (sums * 20 / counts).astype(np.float32)
+        return ScoreMatrix([name or '(client)' for name in names], [period], scores[:, None, :],
+                           answers=counts.astype(np.int32)[:, None, :])
+
+    def save(self, path):
+        """Write the index to an .npz that load() reads back without rebuilding; returns True if it changed"""
+        buffer = io.BytesIO()
+        np.savez(buffer, version=INDEX_VERSION, columns=np.array(self.columns, dtype=str),
+                 paths=np.array([_KEY_SEP.join(p) for p in self.paths], dtype=str),
+                 parents=np.asarray(self.parents, dtype=np.int64), start=self.start, stop=self.stop,
+                 values=self.values, prefix=self.prefix)
+        return write_if_changed(path, buffer.getvalue())
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != INDEX_VERSION:
+                    raise RollupError(f"{path}: index version {int(data['version'])}, expected {INDEX_VERSION}")
+                index = cls.__new__(cls)
+                index.columns = tuple(data['columns'].tolist())
+                index.paths = [tuple(key.split(_KEY_SEP)) if key else () for key in data['paths'].tolist()]
+                index.nodes = {p: n for n, p in enumerate(index.paths)}
+                index.parents = data['parents'].tolist()
+                index.team_depth = max(map(len, index.paths))
+                index.start, index.stop = data['start'], data['stop']
+                index.values, index.prefix = data['values'], data['prefix']
+        except KeyError as e:
+            raise RollupError(f"{path}: not a rollup index (missing {e})") from None
+        return index
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Incremental team domain-score aggregates, kept between runs instead of recomputed from every response.
+
+For every team, period and domain the store holds the sum of the 5-point
+answers, the sum of their squares and the answer count. It also keeps the
+same three per team and domain in two running forms: all-time totals, and
+totals over the latest `window` periods (the last four pulses by default).
+All of them live in NumPy arrays preallocated with room to grow.
+
+Adding a batch touches only the team × period cells it lands in. When a
+new period pushes the oldest one out of the window, that period's column
+is subtracted, so nothing is ever rescanned. A snapshot is one .npz
+written with write_if_changed, which the next run loads and extends.
+Files already added are remembered by digest and skipped.
+
+Needs NumPy (pip install numpy).
+"""
+
+import csv
+import io
+
+import numpy as np
+
+from build_cache import write_if_changed
+from insight_engine import DOMAINS, ScoreMatrix
+
+STORE_VERSION = 1
+DEFAULT_WINDOW = 4
+DEFAULT_PERIOD_DAYS = 7
+# Periods start on this date and every period_days after it (a Monday, so weekly periods are ISO weeks)
+DEFAULT_ANCHOR = '2024-01-01'
+# responses_v3 answer columns, in DOMAINS order
+ANSWER_COLUMNS = ('sentiment_5', 'workload_5', 'safety_5', 'leadership_5', 'clarity_5')
+READ_CHUNK_ROWS = 100_000
+_KEY_SEP = '\x1f'
+_CELLS = ('sums', 'squares', 'counts')
+
+
+def period_start(dates, period_days=DEFAULT_PERIOD_DAYS, anchor=DEFAULT_ANCHOR):
+    """Start (datetime64[D]) of the period each date falls in, on the grid a store with this anchor uses"""
+    days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+    anchor = int(np.datetime64(anchor, 'D').astype(np.int64))
+    return (anchor + (days - anchor) // period_days * period_days).astype('datetime64[D]')
+
+
+class StoreError(Exception):
+    """A snapshot or response file can't be used with this store"""
+
+
+def _grow(array, shape):
+    """array copied into zeros of at least `shape`, doubling each axis that has to grow"""
+    if all(n <= old for n, old in zip(shape, array.shape)):
+        return array
+    grown = np.zeros(tuple(max(n, 2 * old) if n > old else old for n, old in zip(shape, array.shape)),
+                     dtype=array.dtype)
+    grown[tuple(slice(0, n) for n in array.shape)] = array
+    return grown
+
+
+class ScoreStore:
+    """Team × period × domain answer aggregates, with all-time and windowed totals per team"""
+
+    def __init__(self, window=DEFAULT_WINDOW, period_days=DEFAULT_PERIOD_DAYS, anchor=DEFAULT_ANCHOR):
+        if window < 1 or period_days < 1:
+            raise StoreError("window and period length must be at least 1")
+        self.window = window
+        self.period_days = period_days
+        self.anchor = np.datetime64(anchor, 'D')
+        self.teams = []  # (division, department, team) per team index
+        self.periods = []  # start date (datetime64[D]) per period index, in the order first seen
+        self.sources = set()  # digests of the files already added
+        self._team_index = {}
+        self._period_index = {}
+        self._window = set()  # period indices in the window
+        # Cells: (teams, periods, domains); int32 holds hundreds of millions of answers per cell
+        self.sums = np.zeros((0, 0, len(DOMAINS)), dtype=np.int32)
+        self.squares = np.zeros_like(self.sums)
+        self.counts = np.zeros_like(self.sums)
+        # Running totals: (teams, domains) all-time and over the window
+        self.totals = {name: np.zeros((0, len(DOMAINS)), dtype=np.int64) for name in _CELLS}
+        self.windowed = {name: np.zeros((0, len(DOMAINS)), dtype=np.int64) for name in _CELLS}
+
+    def _cells(self):
+        return {'sums': self.sums, 'squares': self.squares, 'counts': self.counts}
+
+    def _reserve(self):
+        shape = (len(self.teams), len(self.periods), len(DOMAINS))
+        self.sums, self.squares, self.counts = (_grow(a, shape) for a in (self.sums, self.squares, self.counts))
+        for running in (self.totals, self.windowed):
+            for name, array in running.items():
+                running[name] = _grow(array, shape[::2])
+
+    def team_indices(self, paths):
+        """Store index of each (division, department, team) path, adding teams not seen before"""
+        indices = np.empty(len(paths), dtype=np.intp)
+        for i, path in enumerate(paths):
+            t = self._team_index.get(path)
+            if t is None:
+                t = self._team_index[path] = len(self.teams)
+                self.teams.append(tuple(path))
+            indices[i] = t
+        self._reserve()
+        return indices
+
+    def period_indices(self, dates):
+        """Store index of the period each date (datetime64[D]) falls in, adding new periods"""
+        starts, inverse = np.unique(period_start(dates, self.period_days, self.anchor).astype(np.int64),
+                                    return_inverse=True)
+        indices = np.empty(len(starts), dtype=np.intp)
+        added = False
+        for i, start in enumerate(starts.tolist()):
+            p = self._period_index.get(start)
+            if p is None:
+                p = self._period_index[start] = len(self.periods)
+                self.periods.append(np.datetime64(start, 'D'))
+                added = True
+            indices[i] = p
+        if added:
+            self._reserve()
+            self._slide()
+        return indices[inverse]
+
+    def _slide(self):
+        """Move the window to the latest periods, subtracting and adding whole period columns"""
+        window = set(self._order()[-self.window:])
+        teams = len(self.teams)
+        for p, sign in [(p, -1) for p in self._window - window] + [(p, 1) for p in window - self._window]:
+            for name, cells in self._cells().items():
+                self.windowed[name][:teams] += sign * cells[:teams, p].astype(np.int64)
+        self._window = window
+
+    def add(self, teams, periods, answers):
+        """Add responses given as store team and period indices and (rows, domains) answers 1-5 (0: none).
+
+        Only the cells and teams the batch lands in are touched; returns the
+        indices of those teams.
+        """
+        answers = np.asarray(answers, dtype=np.int64).reshape(-1, len(DOMAINS))
+        if not len(answers):
+            return np.empty(0, dtype=np.intp)
+        if answers.min() < 0 or answers.max() > 5:
+            raise StoreError("answers must be 1-5 (0 for unanswered)")
+        stride = len(self.periods)
+        cells, inverse = np.unique(np.asarray(teams) * stride + np.asarray(periods), return_inverse=True)
+        cell_teams, cell_periods = np.divmod(cells, stride)
+        batch = {name: np.zeros((len(cells), len(DOMAINS)), dtype=np.int64) for name in _CELLS}
+        np.add.at(batch['sums'], inverse, answers)
+        np.add.at(batch['squares'], inverse, answers * answers)
+        np.add.at(batch['counts'], inverse, answers > 0)
+
+        in_window = np.isin(cell_periods, list(self._window))
+        for name, cells_array in self._cells().items():
+            cells_array[cell_teams, cell_periods] += batch[name].astype(cells_array.dtype)
+            np.add.at(self.totals[name], cell_teams, batch[name])
+            np.add.at(self.windowed[name], cell_teams[in_window], batch[name][in_window])
+        return np.unique(cell_teams)
+
+    def _order(self):
+        return sorted(range(len(self.periods)), key=self.periods.__getitem__)
+
+    def score_matrix(self):
+        """Team × period domain scores (mean answer × 20, as on the dashboard); NaN where nobody answered"""
+        teams, order = len(self.teams), self._order()
+        sums = self.sums[:teams][:, order]
+        counts = self.counts[:teams][:, order]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = (sums * 20.0 / counts).astype(np.float32)
+        return ScoreMatrix([path[-1] for path in self.teams], [str(self.periods[p]) for p in order], scores,
+                           [' / '.join(path[:-1]) for path in self.teams], counts.astype(np.int32))
+
+    def summary(self, windowed=True):
+        """(mean, standard deviation, count) per team and domain over the window (or all time); scores × 20"""
+        running = self.windowed if windowed else self.totals
+        teams = len(self.teams)
+        sums, squares, counts = (running[name][:teams].astype(np.float64) for name in _CELLS)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = sums / counts
+            spread = np.sqrt(np.maximum(squares / counts - mean * mean, 0))
+        return mean * 20, spread * 20, running['counts'][:teams].copy()
+
+    def save(self, path):
+        """Snapshot the store (arrays trimmed to size) to an .npz; returns True if the file changed"""
+        teams, periods = len(self.teams), len(self.periods)
+        data = {name: cells[:teams, :periods] for name, cells in self._cells().items()}
+        data.update({f"total_{name}": array[:teams] for name, array in self.totals.items()})
+        data.update({f"window_{name}": array[:teams] for name, array in self.windowed.items()})
+        buffer = io.BytesIO()
+        np.savez(
+            buffer, version=STORE_VERSION, window=self.window, period_days=self.period_days,
+            anchor=self.anchor, teams=np.array([_KEY_SEP.join(path) for path in self.teams], dtype=str),
+            periods=np.array(self.periods, dtype='datetime64[D]'),
+            sources=np.array(sorted(self.sources), dtype=str), **data)
+        return write_if_changed(path, buffer.getvalue())
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot written by save()"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != STORE_VERSION:
+                    raise StoreError(f"{path}: store version {int(data['version'])}, expected {STORE_VERSION}")
+                store = cls(int(data['window']), int(data['period_days']), data['anchor'])
+                store.teams = [tuple(key.split(_KEY_SEP)) for key in data['teams'].tolist()]
+                store._team_index = {path: t for t, path in enumerate(store.teams)}
+                store.periods = list(data['periods'])
+                store._period_index = {int(p.astype(np.int64)): i for i, p in enumerate(store.periods)}
+                store.sources = set(data['sources'].tolist())
+                store.sums, store.squares, store.counts = (data[name] for name in _CELLS)
+                store.totals = {name: data[f"total_{name}"] for name in _CELLS}
+                store.windowed = {name: data[f"window_{name}"] for name in _CELLS}
+        except KeyError as e:
+            raise StoreError(f"{path}: not a score store snapshot (missing {e})") from None
+        store._window = set(store._order()[-store.window:])
+        return store
+
+
+def read_responses(f, chunk_rows=READ_CHUNK_ROWS):
+    """Yield (employee ids, submission dates, (rows, domains) answers) chunks of a responses_v3 CSV"""
+    reader = csv.reader(f)
+    header = [name.strip().lower() for name in next(reader, [])]
+    missing = [name for name in ('employee_id', 'submitted_at') + ANSWER_COLUMNS if name not in header]
+    if missing:
+        raise StoreError(f"responses CSV is missing column(s): {', '.join(missing)}")
+    employee_col, date_col = header.index('employee_id'), header.index('submitted_at')
+    answer_cols = [header.index(name) for name in ANSWER_COLUMNS]
+    while True:
+        rows = [row for _, row in zip(range(chunk_rows), reader) if row]
+        if not rows:
+            return
+        try:
+            answers = np.empty((len(rows), len(DOMAINS)), dtype=np.int8)
+            for d, i in enumerate(answer_cols):
+                column = [row[i] for row in rows]
+                try:
+                    answers[:, d] = np.array(column, dtype=np.int8)
+                except ValueError:
+                    # Unanswered domains are blank
+                    answers[:, d] = np.array([v or '0' for v in column], dtype=np.int8)
+            dates = np.array([row[date_col][:10] for row in rows], dtype='datetime64[D]')
+        except (IndexError, ValueError) as e:
+            raise StoreError(f"responses CSV near line {reader.line_num}: {e}") from None
+        yield [row[employee_col] for row in rows], dates, answers
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build-time full-text search for the generated pages.
+
+Headings, paragraphs and list items are tokenized per section (the text
+under one heading, addressed by its anchor) into an inverted index. Terms
+are sorted, split into fixed-size shards and front-coded (each term stores
+only the suffix after the prefix it shares with the previous term), so the
+browser fetches a tiny root file plus just the shards a query touches.
+A page that can't fetch (e.g. opened from disk) carries the whole index
+inline instead.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from build_cache import write_if_changed
+from marketing_markdown import H1, H2, H3, H4, H5, H6, ITEM, PARA, TABLE_HEAD, TABLE_ROW, HeadingSlugs
+
+INDEX_VERSION = 1
+SEARCH_DIRNAME = 'search'
+ROOT_FILENAME = 'search-index.json'
+SCRIPT_FILENAME = 'beacon-search.js'
+STYLE_FILENAME = 'beacon-search.css'
+DATA_ELEMENT_ID = 'beacon-search-data'
+SHARD_TERMS = 512
+HEADING_WEIGHT = 5
+
+_MARKUP = re.compile(r'\]\([^)]*\)|`+|\*+|\\')
+_WORD = re.compile(r'[^\W_]+')
+STOP_WORDS = frozenset(
+    'a an and are as at be but by for from has have if in into is it its of on or '
+    'so that the their there these this to was we were will with you your'.split()
+)
+
+CLIENT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', SCRIPT_FILENAME)
+# The one copy of the search box styles; pages inline it next to the box
+CLIENT_STYLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', STYLE_FILENAME)
+SEARCH_BOX = '''<div class="search">
+  <input type="search" id="beacon-search" placeholder="Search Beacon docs…" aria-label="Search Beacon docs" autocomplete="off">
+  <ul class="search-results" id="beacon-search-results" hidden></ul>
+</div>
+'''
+
+
+def search_style():
+    """<style> block for the search box"""
+    with open(CLIENT_STYLE, 'r', encoding='utf-8') as f:
+        return f'<style>\n{f.read()}</style>\n'
+
+
+def search_box(script_src=f'{SEARCH_DIRNAME}/{SCRIPT_FILENAME}'):
+    """Markup for a page template's {search} slot: styles, the box and the deferred client script"""
+    return f'{search_style()}{SEARCH_BOX}<script src="{script_src}" defer></script>'
+
+
+def tokenize(text):
+    """Lowercase search terms in text, without markdown syntax or stop words"""
+    words = _WORD.findall(_MARKUP.sub(' ', text).lower())
+    return [w for w in words if len(w) > 1 and w not in STOP_WORDS]
+
+
+def front_code(terms):
+    """Encode sorted terms as [shared prefix length, suffix] pairs"""
+    coded = []
+    previous = ''
+    for term in terms:
+        shared = 0
+        limit = min(len(term), len(previous))
+        while shared < limit and term[shared] == previous[shared]:
+            shared += 1
+        coded.append([shared, term[shared:]])
+        previous = term
+    return coded
+
+
+class SearchIndex:
+    """Inverted index of page sections, written as lazily loaded JSON shards"""
+
+    def __init__(self):
+        self.sections = []  # [page url, anchor, section title, page title]
+        self.postings = {}  # term -> {section id: weight}
+
+    def _add_terms(self, section, text, weight):
+        for term in tokenize(text):
+            docs = self.postings.setdefault(term, {})
+            docs[section] = docs.get(section, 0) + weight
+
+    def add_page(self, url, page_title, table, anchor='', anchors=None):
+        """Index a parsed page (a BlockTable, or (kind, text) pairs); each heading starts a new section.
+
+        url is relative to the directory above the search files, and anchor
+        is where the page itself starts. anchors gives the ids of the
+        page's headings in order when they are already known (e.g. from
+        rendered HTML); otherwise they are derived as pandoc does.
+        """
+        slugs = HeadingSlugs() if anchors is None else (lambda text, ids=iter(anchors): next(ids, ''))
+        section = len(self.sections)
+        self.sections.append([url, anchor, page_title, page_title])
+        self._add_terms(section, page_title, HEADING_WEIGHT)
+        for kind, text in table:
+            if kind in (H2, H3, H4):
+                section = len(self.sections)
+                self.sections.append([url, slugs(text), _MARKUP.sub('', text).strip(), page_title])
+                self._add_terms(section, text, HEADING_WEIGHT)
+            elif kind in (H1, H5, H6):
+                slugs(text)
+                self._add_terms(section, text, HEADING_WEIGHT)
+            elif kind in (PARA, ITEM, TABLE_HEAD, TABLE_ROW):
+                self._add_terms(section, text, 1)
+
+    def shards(self):
+        """Yield (first term, shard payload) for every SHARD_TERMS block of terms"""
+        terms = sorted(self.postings)
+        for start in range(0, len(terms), SHARD_TERMS):
+            block = terms[start:start + SHARD_TERMS]
+            postings = []
+            for term in block:
+                # Section ids are delta-encoded: [gap, weight, gap, weight, ...]
+                flat, last = [], 0
+                for section, weight in sorted(self.postings[term].items()):
+                    flat.extend((section - last, weight))
+                    last = section
+                postings.append(flat)
+            yield block[0], {'terms': front_code(block), 'postings': postings}
+
+    def _shard_files(self):
+        """Yield (first term, file name, JSON text) per shard"""
+        for first, payload in self.shards():
+            data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+            yield first, f"terms.{hashlib.sha256(data.encode('utf-8')).hexdigest()[:10]}.json", data
+
+    def inline_script(self):
+        """The root and every shard as one JSON <script> element, for pages that can't fetch the shards"""
+        shard_list, shards = [], []
+        for first, name, data in self._shard_files():
+            shard_list.append([first, name])
+            shards.append(f'{json.dumps(name)}:{data}')
+        root = json.dumps({'version': INDEX_VERSION, 'sections': self.sections, 'shards': shard_list},
+                          separators=(',', ':'), ensure_ascii=False)
+        # '<' is escaped so nothing in the index can close the element
+        data = (root[:-1] + ',"inline":{' + ','.join(shards) + '}}').replace('<', '\\u003c')
+        return f'<script type="application/json" id="{DATA_ELEMENT_ID}">{data}</script>\n'
+
+    def write(self, output_dir):
+        """Write the root file, shards and client script; returns files written"""
+        directory = os.path.join(output_dir, SEARCH_DIRNAME)
+        written = []
+        keep = {ROOT_FILENAME, SCRIPT_FILENAME}
+
+        def emit(name, payload):
+            if write_if_changed(os.path.join(directory, name), payload):
+                written.append(name)
+
+        shard_list = []
+        for first, name, data in self._shard_files():
+            emit(name, data)
+            keep.add(name)
+            shard_list.append([first, name])
+
+        root = {'version': INDEX_VERSION, 'sections': self.sections, 'shards': shard_list}
+        emit(ROOT_FILENAME, json.dumps(root, separators=(',', ':'), ensure_ascii=False))
+        with open(CLIENT_SCRIPT, 'rb') as f:
+            emit(SCRIPT_FILENAME, f.read())
+
+        for name in os.listdir(directory):
+            if name.startswith('terms.') and name not in keep:
+                os.unlink(os.path.join(directory, name))
+        return written
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Batch leadership-pack reports: one branded HTML page per team and department.
+
+insight_engine results are cut into chunks of teams and rendered on the
+worker pool. Each worker compiles the marketing page template once, so a
+report costs one markdown render and one write of the template's byte
+segments. Pages whose bytes haven't changed are not rewritten, so a
+re-run only touches the reports whose numbers moved. The template's
+styles go into one shared hashed stylesheet instead of being inlined into
+thousands of pages.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from build_cache import write_if_changed
+from css_assets import externalize_styles
+from insight_engine import BANDS, DOMAIN_LABELS, NO_BAND, band_index, display_score, evaluate, team_markdown
+from marketing_markdown import escape_html, iter_html, iter_lines
+from page_template import PageTemplate, read_template_source
+from parallel_build import run_parallel
+
+TEMPLATE_NAME = 'marketing-page'
+STYLESHEET_NAME = 'marketing'
+INDEX_NAME = 'index.html'
+# Teams per worker task: large enough to amortize pickling, small enough to balance
+CHUNK_SIZE = 200
+HISTORY_PERIODS = 8
+_REPORT_FILE = re.compile(r'^(team|department)-.+\.html$')
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+_templates = {}  # per process: template source -> PageTemplate
+
+
+def _template(source):
+    template = _templates.get(source)
+    if template is None:
+        template = _templates[source] = PageTemplate(source, raw={'content', 'live_reload', 'search'})
+    return template
+
+
+def report_filename(kind, name, department=None):
+    """Stable file name for a team or department report"""
+    key = name if department is None else f"{department}/{name}"
+    slug = _SLUG.sub('-', key.lower()).strip('-')[:60] or kind
+    # The hash keeps 'Team A' and 'Team-A' (or the same team name in two departments) apart
+    return f"{kind}-{slug}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:6]}.html"
+
+
+def _cell(text):
+    return str(text).replace('|', '\\|')
+
+
+def report_markdown(insights, t, p, members=()):
+    """Markdown for one team (or department, with its member team rows) at period p"""
+    matrix = insights.matrix
+    scores = matrix.scores[t]
+    lines = ['## Overview', '',
+             f"**Beacon Index**: {display_score(insights.composite[t, p]):.1f} "
+             f"({BANDS[insights.bands[t, p]]}) for {matrix.periods[p]}", '',
+             '| Domain | Score | Band | Change |', '|--------|------:|------|-------:|']
+    previous = p - 1
+    while previous >= 0 and np.isnan(insights.composite[t, previous]):
+        previous -= 1
+    domain_bands = band_index(scores[p])
+    for d, label in enumerate(DOMAIN_LABELS):
+        score = scores[p, d]
+        if np.isnan(score):
+            lines.append(f"| {label} | – | – | – |")
+            continue
+        change = '–'
+        if previous >= 0 and not np.isnan(scores[previous, d]):
+            change = f"{score - scores[previous, d]:+.1f}"
+        band = BANDS[domain_bands[d]] if domain_bands[d] != NO_BAND else '–'
+        lines.append(f"| {label} | {display_score(score):.1f} | {band} | {change} |")
+    lines.append('')
+
+    lines += ['## Insights', '']
+    lines += team_markdown(insights, t, p, heading=False)
+
+    if members:
+        lines += ['## Team Overview', '', '| Team | Beacon Index | Band | Signals |', '|------|------:|------|---------|']
+        for row in sorted(members, key=lambda r: r['composite']):
+            lines.append(f"| {_cell(row['team'])} | {row['composite']:.1f} | {row['band']} | "
+                         f"{', '.join(row['signals']) or '–'} |")
+        lines.append('')
+
+    history = [q for q in range(p, -1, -1) if not np.isnan(insights.composite[t, q])][:HISTORY_PERIODS]
+    if len(history) > 1:
+        lines += ['## Trend Timeline', '', '| Period | Beacon Index | Band | Signals |',
+                  '|--------|------:|------|---------|']
+        for q in reversed(history):
+            lines.append(f"| {matrix.periods[q]} | {display_score(insights.composite[t, q]):.1f} | "
+                         f"{BANDS[insights.bands[t, q]]} | {', '.join(insights.codes(t, q)) or '–'} |")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def render_reports(kind, insights, members, template_source, output_dir):
+    """Write the reports of one chunk; returns [(file name, label, composite, band, written)]"""
+    template = _template(template_source)
+    matrix = insights.matrix
+    results = []
+    for t, p in enumerate(insights.latest_periods()):
+        if p < 0:
+            continue
+        name = matrix.teams[t]
+        department = matrix.departments[t] if matrix.departments is not None else None
+        filename = report_filename(kind, name, department)
+        markdown = report_markdown(insights, t, p, members.get(name, ()))
+        if kind == 'team':
+            subtitle = f"{department} · {matrix.periods[p]}" if department else f"Team report · {matrix.periods[p]}"
+        else:
+            subtitle = f"Department report · {matrix.periods[p]}"
+        chunks = template.iter_chunks(title=f"{name} | Beacon Index", hero_title=name, hero_subtitle=subtitle,
+                                      content=iter_html(iter_lines(markdown)), live_reload='', search='')
+        written = write_if_changed(os.path.join(output_dir, filename), chunks)
+        results.append((filename, name if department is None else f"{department} / {name}",
+                        display_score(insights.composite[t, p]), BANDS[insights.bands[t, p]], written))
+    return results
+
+
+def _chunks(count, size):
+    return [list(range(start, min(start + size, count))) for start in range(0, count, size)]
+
+
+def _index_html(template, entries):
+    rows = ''.join(
+        f'<tr><td><a href="{filename}">{escape_html(label)}</a></td><td>{kind}</td>'
+        f'<td>{composite:.1f}</td><td>{band}</td></tr>\n'
+        for kind, (filename, label, composite, band, _) in entries)
+    content = ('<h2 id="reports">Reports</h2>\n<table>\n<thead>\n<tr><th>Report</th><th>Level</th>'
+               f'<th>Beacon Index</th><th>Band</th></tr>\n</thead>\n<tbody>\n{rows}</tbody>\n</table>')
+    return template.iter_chunks(title='Leadership Packs | Beacon Index', hero_title='Leadership Packs',
+                                hero_subtitle=f"{len(entries)} team and department reports", content=content,
+                                live_reload='', search='')
+
+
+def build_reports(insights, output_dir, jobs=None, chunk_size=CHUNK_SIZE):
+    """Render every team (and, with departments, department) report into output_dir.
+
+    Returns (written, unchanged, failures) where failures is [(chunk, error)].
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    page_source, stylesheet = externalize_styles(read_template_source(TEMPLATE_NAME), STYLESHEET_NAME)
+    stylesheet.write(output_dir)
+
+    matrix = insights.matrix
+    tasks = [('team', insights.subset(chunk), {}, page_source, output_dir)
+             for chunk in _chunks(len(matrix.teams), chunk_size)]
+    if matrix.departments is not None:
+        departments = evaluate(matrix.rollup())
+        members = {}
+        for row in insights.rows():
+            members.setdefault(row['department'], []).append(row)
+        tasks += [('department', departments.subset(chunk),
+                   {departments.matrix.teams[t]: members.get(departments.matrix.teams[t], ()) for t in chunk},
+                   page_source, output_dir)
+                  for chunk in _chunks(len(departments.matrix.teams), chunk_size)]
+
+    entries = []
+    failures = []
+    for outcome in run_parallel(render_reports, tasks, jobs):
+        if outcome.ok:
+            entries += [(outcome.task[0], entry) for entry in outcome.result]
+        else:
+            failures.append((outcome.task[0], outcome.error))
+
+    # Departments first, then teams; lowest scores first within each
+    entries.sort(key=lambda e: (e[0] != 'department', e[1][2]))
+    write_if_changed(os.path.join(output_dir, INDEX_NAME), _index_html(_template(page_source), entries))
+    if not failures:
+        # Reports of teams that no longer exist (only when every chunk rendered)
+        current = {filename for _, (filename, *_) in entries}
+        for name in os.listdir(output_dir):
+            if _REPORT_FILE.match(name) and name not in current:
+                os.unlink(os.path.join(output_dir, name))
+    written = sum(1 for _, entry in entries if entry[-1])
+    return written, len(entries) - written, failures
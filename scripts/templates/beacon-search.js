@@ -0,0 +1,122 @@
+// Beacon page search: loads search-index.json (next to this script) on first
+// use, then only the term shards a query needs. A page with the index inline
+// (#beacon-search-data) fetches nothing. Built by scripts/search_index.py.
+(function () {
+  var input = document.getElementById('beacon-search');
+  var list = document.getElementById('beacon-search-results');
+  if (!input || !list) return;
+
+  var STOP = ' a an and are as at be but by for from has have if in into is it its of on or ' +
+    'so that the their there these this to was we were will with you your ';
+  var inline = document.getElementById('beacon-search-data');
+  // Shards sit next to this script; section urls are relative to the directory above it,
+  // or to this page when the index is inline
+  var base = document.currentScript && document.currentScript.src ?
+    document.currentScript.src.replace(/[^\/]*$/, '') : 'search/';
+  var pages = inline ? new URL(location.href) : new URL('../', new URL(base, location.href));
+  var root = inline ? JSON.parse(inline.textContent) : null;
+  var shards = {};
+
+  function load(url) {
+    if (root && root.inline) return Promise.resolve(root.inline[url]);
+    return fetch(base + url).then(function (r) {
+      if (!r.ok) throw new Error(r.status + ' ' + url);
+      return r.json();
+    });
+  }
+
+  function tokenize(text) {
+    return (text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || []).filter(function (w) {
+      return w.length > 1 && STOP.indexOf(' ' + w + ' ') < 0;
+    });
+  }
+
+  function shard(name) {
+    if (!shards[name]) {
+      shards[name] = load(name).then(function (data) {
+        // Undo front coding once per shard
+        var terms = [], prev = '';
+        data.terms.forEach(function (t) { prev = prev.slice(0, t[0]) + t[1]; terms.push(prev); });
+        return { terms: terms, postings: data.postings };
+      });
+    }
+    return shards[name];
+  }
+
+  // Shards that can hold term (or, for a prefix, any term starting with it)
+  function shardsFor(term, prefix) {
+    var s = root.shards, lo = 0, hi = s.length - 1, i = 0;
+    while (lo <= hi) {
+      var mid = (lo + hi) >> 1;
+      if (s[mid][0] <= term) { i = mid; lo = mid + 1; } else { hi = mid - 1; }
+    }
+    var names = [s[i][1]];
+    while (prefix && ++i < s.length && s[i][0].indexOf(term) === 0) names.push(s[i][1]);
+    return names;
+  }
+
+  function lookup(term, prefix) {
+    return Promise.all(shardsFor(term, prefix).map(shard)).then(function (loaded) {
+      var scores = {};
+      loaded.forEach(function (sh) {
+        sh.terms.forEach(function (t, k) {
+          if (t !== term && !(prefix && t.indexOf(term) === 0)) return;
+          var p = sh.postings[k], id = 0;
+          for (var j = 0; j < p.length; j += 2) {
+            id += p[j];
+            scores[id] = (scores[id] || 0) + p[j + 1];
+          }
+        });
+      });
+      return scores;
+    });
+  }
+
+  function search(query) {
+    var terms = tokenize(query);
+    if (!terms.length) return Promise.resolve([]);
+    var open = !/\s$/.test(query);
+    return Promise.all(terms.map(function (t, n) {
+      return lookup(t, open && n === terms.length - 1);
+    })).then(function (maps) {
+      var hits = [];
+      Object.keys(maps[0]).forEach(function (id) {
+        var score = 0;
+        for (var m = 0; m < maps.length; m++) {
+          if (!maps[m][id]) return;
+          score += maps[m][id];
+        }
+        hits.push([score, root.sections[id]]);
+      });
+      return hits.sort(function (a, b) { return b[0] - a[0]; }).slice(0, 8);
+    });
+  }
+
+  function show(hits) {
+    list.innerHTML = '';
+    hits.forEach(function (hit) {
+      var s = hit[1], a = document.createElement('a');
+      a.href = new URL(s[0], pages).href + (s[1] ? '#' + s[1] : '');
+      a.textContent = s[2] === s[3] ? s[2] : s[2] + ' — ' + s[3];
+      var li = document.createElement('li');
+      li.appendChild(a);
+      list.appendChild(li);
+    });
+    list.hidden = !hits.length;
+  }
+
+  var pending = 0;
+  var ready = null;
+  input.addEventListener('input', function () {
+    var query = input.value, ticket = ++pending;
+    if (!ready) {
+      ready = root ? Promise.resolve() : load('search-index.json').then(function (r) { root = r; });
+      // No index to search (e.g. a page opened from disk can't fetch it): take the box away
+      ready.catch(function () { input.parentNode.hidden = true; });
+    }
+    ready
+      .then(function () { return search(query); })
+      .then(function (hits) { if (ticket === pending) show(hits); })
+      .catch(function () { list.hidden = true; });
+  });
+})();
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the doc generators.
+
+Polls source files with os.stat (stdlib only, works on macOS and Linux),
+hands the changed paths to a rebuild callback, and tells open pages to
+reload through a tiny Server-Sent Events endpoint.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 35729
+POLL_INTERVAL = 0.05
+
+# Injected before </body> in watch builds only; reloads when its page (or '*') changes
+_SNIPPET = (
+    '<script>new EventSource("http://localhost:{port}/events").onmessage=function(e){{'
+    'if(e.data==="*"||location.pathname.split("/").pop()===e.data)location.reload()}};</script>'
+)
+
+
+def live_reload_snippet(port=DEFAULT_PORT):
+    return _SNIPPET.format(port=port)
+
+
+class LiveReloadServer:
+    """Broadcasts changed page names to connected browsers over SSE"""
+
+    def __init__(self, port=DEFAULT_PORT):
+        self.port = port
+        self._clients = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/events':
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(b': connected\n\n')
+                self.wfile.flush()
+                wakeup = threading.Event()
+                queue = []
+                with server._lock:
+                    server._clients.append((wakeup, queue))
+                try:
+                    while True:
+                        # Heartbeat every 15s keeps proxies from closing the stream
+                        wakeup.wait(15)
+                        wakeup.clear()
+                        with server._lock:
+                            messages, queue[:] = list(queue), []
+                        payload = ''.join(f'data: {m}\n\n' for m in messages) or ': ping\n\n'
+                        self.wfile.write(payload.encode('utf-8'))
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    with server._lock:
+                        server._clients.remove((wakeup, queue))
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._httpd.daemon_threads = True
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def notify(self, page_names):
+        """Ask browsers showing any of page_names to reload"""
+        with self._lock:
+            for wakeup, queue in self._clients:
+                queue.extend(page_names)
+                wakeup.set()
+
+    def close(self):
+        self._httpd.shutdown()
+
+
+def _snapshot(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+def watch_files(paths, rebuild, interval=POLL_INTERVAL):
+    """Call rebuild(changed_paths) whenever any of paths changes; runs until Ctrl+C.
+
+    Files that don't exist yet are watched too, so creating a source picks it up.
+    """
+    paths = list(paths)
+    stamps = _snapshot(paths)
+    print(f"👀 Watching {len(paths)} file(s) for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(paths)
+            changed = [p for p in paths if current[p] != stamps[p] and current[p] is not None]
+            stamps = current
+            if changed:
+                start = time.perf_counter()
+                rebuild(changed)
+                print(f"🔁 Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")